@@ -7,11 +7,12 @@ from fastapi import Depends, HTTPException, status, Query, Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.core.config import settings
 from app.core import security
 from app.db.session import SessionLocal
 from app.schemas.review import ReviewParams
+from app.utils.loader import EntityLoader, get_loader
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/local")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/local", auto_error=False)
@@ -40,9 +41,17 @@ def get_db() -> Generator:
         db.close()
 
 
+def get_entity_loader(db: Session = Depends(get_db)) -> EntityLoader:
+    # 요청 단위 (모델, id) 로더, 같은 요청의 get_db 세션에 붙어 있어 crud 에서 get_loader(db) 로 쓰는 로더와 같다.
+    return get_loader(db)
+
+
 def get_current_user(
         db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+) -> schemas.CurrentUser:
+    """
+    인증된 회원의 스냅샷(schemas.CurrentUser)을 반환함, ORM 객체가 필요하면 crud.user.get 으로 불러와야 함
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -54,7 +63,7 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"유효하지 않은 토큰 입니다. 상세 : {e}"
         )
-    user = crud.user.get(db, id=token_data.sub)
+    user = get_principal(db, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="없는 회원입니다.")
     return user
@@ -62,7 +71,7 @@ def get_current_user(
 
 def get_current_user_optional(
         db: Session = Depends(get_db), token: Optional[str] = Depends(oauth2_scheme_optional)
-) -> Union[models.User, None]:
+) -> Union[schemas.CurrentUser, None]:
     """
     Access Token 없으면 Current User를 None 으로 반환함
     """
@@ -76,11 +85,21 @@ def get_current_user_optional(
     except (jwt.JWTError, ValidationError) as e:
         return None
 
-    user = crud.user.get(db, id=token_data.sub)
+    user = get_principal(db, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="없는 회원입니다.")
     return user
 
 
-def get_page_request(page: int = 1):
-    return {"page": page, "size": 20}
+def get_principal(db: Session, sub: Optional[str]) -> Optional[schemas.CurrentUser]:
+    # 토큰의 sub 는 문자열이므로 user_id 로 바꿔서 캐시 키로 쓴다.
+    try:
+        user_id = int(sub)
+    except (TypeError, ValueError):
+        return None
+    return crud.user.get_principal(db, user_id=user_id)
+
+
+def get_page_request(page: int = 1,
+                     cursor: Optional[str] = Query(None, description="커서 페이지네이션용 커서, 이전 응답의 page_meta > next_cursor 값 (첫 페이지는 빈 값)")):
+    return {"page": page, "size": 20, "cursor": cursor}
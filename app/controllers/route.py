@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 
 from app.controllers import deps
 from app.controllers.v1 import (
-    user, review, auth, comment, qna
+    user, review, auth, comment, qna, admin, stats
 )
 
 api_router = APIRouter()
@@ -11,4 +11,6 @@ api_router.include_router(user.router, prefix="/user", tags=["user"])
 # api_router.include_router(user.router, prefix="/user", tags=["user"], dependencies=[Depends(deps.get_current_user)])
 api_router.include_router(review.router, prefix="/review", tags=["review"])
 api_router.include_router(comment.router, prefix="/comment", tags=["comment"])
-api_router.include_router(qna.router, prefix="/qna", tags=["qna"])
\ No newline at end of file
+api_router.include_router(qna.router, prefix="/qna", tags=["qna"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
\ No newline at end of file
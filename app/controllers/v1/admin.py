@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app import crud, schemas
+from app.controllers import deps
+from app.db.session import SessionLocal
+from app.utils.export import ExportFormat, iter_csv, iter_ndjson
+
+router = APIRouter()
+
+
+def stream_review_export(export_format: ExportFormat, since: Optional[datetime], until: Optional[datetime]) -> Iterator[str]:
+    # 응답을 모두 보낼 때까지 커서를 열어두어야 하므로, 요청 세션(deps.get_db)과 별도로 세션을 열고 닫는다.
+    db = SessionLocal()
+    try:
+        rows = crud.review.iter_export_rows(db, since=since, until=until)
+        if export_format == ExportFormat.CSV:
+            yield from iter_csv(rows)
+        else:
+            yield from iter_ndjson(rows)
+    finally:
+        db.close()
+
+
+@router.get("/export/reviews", name="리뷰/설문 데이터 추출 (어드민용)")
+async def export_reviews(
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="\"ndjson\", \"csv\""),
+        since: Optional[datetime] = Query(None, description="작성 시각 하한 (포함), ex) 2021-12-01T00:00:00"),
+        until: Optional[datetime] = Query(None, description="작성 시각 상한 (미포함), ex) 2022-01-01T00:00:00"),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
+) -> StreamingResponse:
+    """
+    <h1> 리뷰와 설문 응답, 작성자의 성별/출생연도를 파일로 내려받습니다. 어드민만 사용할 수 있습니다. </h1> </br>
+    분석용으로 운영 DB 를 직접 조회하는 대신 사용합니다. 결과는 서버 사이드 커서로 읽으면서 바로 응답으로 흘려보내므로
+    기간이 길어도 서버 메모리를 일정하게 사용합니다. </br>
+    삭제된 리뷰와 탈퇴한 회원의 리뷰는 포함되지 않으며, 리뷰 id 순으로 내려옵니다. </br>
+    |파라미터|내용|
+    |------|--|
+    |format|"ndjson" (한 줄에 리뷰 하나, 기본값) 또는 "csv" (survey_data 칸에 설문 응답 json)|
+    |since / until|리뷰 작성 시각 기준 기간, 둘 다 생략하면 전체|
+    """
+    if current_user.is_super is False:
+        raise HTTPException(400, "관리자만 이 요청을 처리할 수 있습니다.")
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(400, "since 는 until 보다 이전이어야 합니다.")
+
+    media_type = "text/csv; charset=utf-8" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"reviews_{datetime.now().strftime('%Y%m%d%H%M%S')}.{export_format.value}"
+    return StreamingResponse(
+        stream_review_export(export_format, since, until),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
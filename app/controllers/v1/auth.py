@@ -73,20 +73,21 @@ async def login_sns(
 @router.delete("/deactive", name="회원탈퇴", response_model=BaseResponse)
 async def delete_user(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ):
     """
     <h1> 회원의 상태를 비활성화 상태로 변경합니다.</h1>
     헤더에 로그인 토큰을 요청하면 해당하는 회원을 비활성화 상태로 변경합니다.
     """
-    sns_deactive = unlink_sns(sns_provider=current_user.sns_provider, user_cid=current_user.sns_id)
+    user = crud.user.get(db=db, id=current_user.id)
+    sns_deactive = unlink_sns(sns_provider=user.sns_provider, user_cid=user.sns_id)
     return crud.user.soft_delete_by_user_id(db=db, user_id=current_user.id)
 
 
 @router.post("/logout", name="로그아웃", response_model=BaseResponse)
 async def logout(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> BaseResponse :
     """
     <h1> 회원을 로그아웃상태로 만들어 기존에 등록된 fcm_token을 제거합니다. </h1>
@@ -1,9 +1,8 @@
-from typing import Union, List
+from typing import Union, List, Optional
 
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, Request, Response
 
 from app import crud, schemas, models
 from app.core.config import settings
@@ -11,11 +10,17 @@ from app.controllers import deps
 from app.schemas.comment import Comment, CommentListResponse
 from app.utils.report import get_report_reason
 from app.utils.smpt import email_sender
-from app.utils.comment import comment_model_to_dto
+from app.utils.comment import build_comment_tree
+from app.utils.etag import make_etag, etag_matches, not_modified, comment_list_versions
+from app.utils.loader import EntityLoader
 from app.worker import celery
 
 router = APIRouter()
 
+# [GET] /v1/comment/{review_id} 의 한 페이지 최대 최상위 댓글 수 / 댓글마다 미리 보여줄 최대 대댓글 수
+MAX_COMMENT_PAGE_SIZE = 100
+MAX_REPLY_PREVIEW_SIZE = 20
+
 
 @router.get("/{review_id}",
             name="리뷰에 속한 댓글 리스트 가져오기",
@@ -23,52 +28,95 @@ router = APIRouter()
             response_model_exclude=["is_delete", "user_is_active"])
 async def get_comment_list(
         review_id: int,
+        request: Request,
+        response: Response,
+        cursor: Optional[int] = Query(None, description="이전 응답의 next_cursor, 첫 페이지는 생략"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_COMMENT_PAGE_SIZE,
+                                     description=f"가져올 최상위 댓글 수 (최대 {MAX_COMMENT_PAGE_SIZE}개), 생략하면 전체"),
+        replies: Optional[int] = Query(None, ge=0, le=MAX_REPLY_PREVIEW_SIZE,
+                                       description=f"댓글마다 미리 보여줄 대댓글 수 (최대 {MAX_REPLY_PREVIEW_SIZE}개), 생략하면 전체"),
         db: Session = Depends(deps.get_db),
-        current_user: Union[models.User, None] = Depends(deps.get_current_user_optional)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
 ) -> CommentListResponse:
     """
-    <h1> 리뷰 ID로 해당하는 모든 댓글을 가져옵니다. </h1>
+    <h1> 리뷰 ID로 해당하는 모든 댓글을 가져옵니다. </h1> </br>
+    응답 헤더의 ETag 값을 다음 요청의 If-None-Match 헤더로 보내면, 그 사이 댓글이 바뀌지 않은 경우 본문 없이 304 를 반환합니다. </br>
+    </br>
+    __*페이지 나누기__ </br>
+    limit 을 보내면 최상위 댓글을 작성 순으로 limit 개씩 내려주고, 더 있으면 "next_cursor" 에 다음 요청의 cursor 값이 내려옵니다. </br>
+    replies 를 보내면 댓글마다 대댓글을 앞에서부터 그 수만큼만 내려주고, 나머지는 [GET] /v1/comment/{comment_id}/tree 로 불러옵니다.
+    삭제되지 않은 대댓글 수는 "nested_comment_count" 입니다. </br>
+    파라미터를 모두 생략하면 기존처럼 전체 댓글을 내려줍니다. "comment_count"는 페이지와 상관없이 리뷰의 삭제되지 않은 전체 댓글 수입니다.
     """
     if current_user is None:
         current_user = models.User(id=0)
-    comments = crud.comment.get_comments_by_review_id(db=db, review_id=review_id)
-    comment_count = len(comments)
 
-    comment_ids_like_by_user = [
-        jsonable_encoder(comment_id).get("comment_id")
-        for comment_id in crud.user_comment_like.get_comment_id_by_user_id(db=db, user_id=current_user.id)
-    ]
+    # 댓글 작성/수정/삭제/좋아요 때마다 올라가는 리뷰별 버전 + 요청한 회원 (작성자 여부/좋아요 여부가 회원마다 다름) + 페이지
+    etag = make_etag("comments", review_id, comment_list_versions.get(review_id), current_user.id, cursor, limit, replies)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    # 다음 페이지가 있는지 알기 위해 하나 더 가져온다.
+    comments = crud.comment.get_top_level_comments_by_review_id(
+        db=db, review_id=review_id, cursor=cursor, limit=limit + 1 if limit is not None else None
+    )
+    next_cursor = None
+    if limit is not None and len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = comments[-1].id
+    parent_ids = [comment.id for comment in comments]
+    if replies is None:
+        nested_comments = crud.comment.get_comments_by_parent_ids(db=db, parent_ids=parent_ids)
+    else:
+        nested_comments = crud.comment.get_reply_previews(db, review_id=review_id, parent_ids=parent_ids, reply_limit=replies)
+    # 페이지/미리보기 여부와 상관없이 같은 값이 내려가도록 항상 리뷰의 (삭제되지 않은) 댓글 수를 쓴다.
+    comment_count = crud.review.get_comment_count(db, review_id=review_id)
+
+    comments += nested_comments
+    comment_ids_like_by_user = crud.user_comment_like.get_liked_comment_ids(
+        db, user_id=current_user.id, comment_ids=[comment.id for comment in comments]
+    )
 
-    comment_list = comment_model_to_dto(comments, comment_ids_like_by_user, current_user.id)
-    return CommentListResponse(comment_count=comment_count, comment_list=comment_list)
+    comment_list = build_comment_tree(comments, comment_ids_like_by_user, current_user.id,
+                                      reply_limit=replies, loader=loader)
+    return CommentListResponse(comment_count=comment_count, comment_list=comment_list, next_cursor=next_cursor)
 
 
 @router.get("/{comment_id}/tree", name="부모 댓글 ID로 자식 댓글 모두 가져오기", response_model=Comment)
 async def get_parent_comment_with_tree(
         comment_id: int,
+        cursor: Optional[int] = Query(None, description="이미 받은 마지막 대댓글 id, 이후의 대댓글부터 내려옴"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_COMMENT_PAGE_SIZE,
+                                     description=f"가져올 대댓글 수 (최대 {MAX_COMMENT_PAGE_SIZE}개), 생략하면 전체"),
         db: Session = Depends(deps.get_db),
-        current_user: Union[models.User, None] = Depends(deps.get_current_user_optional)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
 ) -> Comment:
     """
-    <h1> 댓글 ID로 모든 대댓글을 가져옵니다. </h1>
+    <h1> 댓글 ID로 모든 대댓글을 가져옵니다. </h1> </br>
+    댓글 목록에서 미리보기로 받은 대댓글 이후를 불러올 때는 마지막 대댓글 id 를 cursor 로 보냅니다.
     """
     if current_user is None:
         current_user = models.User(id=0)
     parent = crud.comment.get_comment(db=db, id=comment_id)
-    childs = crud.comment.get_comments_by_parent_id(db=db, parent_id=comment_id)
-    comment_ids_like_by_user = [
-        jsonable_encoder(comment_id).get("comment_id")
-        for comment_id in crud.user_comment_like.get_comment_id_by_user_id(db=db, user_id=current_user.id)
-    ]
-    childs.append(parent)
-    return comment_model_to_dto(childs, comment_ids_like_by_user, current_user.id)[0]
+    if parent is None:
+        raise HTTPException(404, "댓글을 찾을 수 없습니다.")
+    childs = crud.comment.get_comments_by_parent_id(db=db, parent_id=comment_id, review_id=parent.review_id,
+                                                    cursor=cursor, limit=limit)
+    comments = [parent] + childs
+    comment_ids_like_by_user = crud.user_comment_like.get_liked_comment_ids(
+        db, user_id=current_user.id, comment_ids=[comment.id for comment in comments]
+    )
+    # 부모 댓글의 작성자는 get_comment 에서 이미 불러왔으므로 대댓글 작성자만 조회된다.
+    return build_comment_tree(comments, comment_ids_like_by_user, current_user.id, loader=loader)[0]
 
 
 @router.get("/{comment_id}/content", name="댓글(대댓글) 내용 가져오기", response_model=schemas.CommentBase)
 async def get_comment_content(
         comment_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user_optional)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user_optional)
 ) -> schemas.CommentBase:
     """
     <h1> 댓글(대댓글) ID로 댓글(대댓글)의 내용을 가져옵니다. </h1>
@@ -85,7 +133,7 @@ async def create_nested_comment(
         comment_id: int,
         comment_in: schemas.CommentCreate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 코멘트에 코멘트를 추가합니다. (대댓글) </h1> </br>
@@ -110,7 +158,7 @@ async def edit_comment(
         comment_id: int,
         obj_in: schemas.CommentUpdate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 댓글 혹은 대댓글을 수정합니다. (댓글과 대댓글 모두 comment_id를 갖고있습니다.) </h1> </br>
@@ -132,7 +180,7 @@ async def edit_comment(
 async def delete_comment(
         comment_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 코멘트를 삭제합니다. </h1> </br>
@@ -160,7 +208,7 @@ async def report_comment(
         reason: schemas.ReportReason,
         background_task: BackgroundTasks,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 댓글을 신고합니다. </h1> </br>
@@ -197,7 +245,7 @@ async def report_comment(
 async def change_comment_like_status(
         comment_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 댓글에 대한 좋아요 상태를 변경합니다. </h1> </br>
@@ -212,7 +260,7 @@ async def change_comment_like_status(
 
 
 @router.post("/", deprecated=True)
-async def test123(db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_user_optional)):
+async def test123(db: Session = Depends(deps.get_db), current_user: schemas.CurrentUser = Depends(deps.get_current_user_optional)):
     """
     푸시 테스트용 api
     """
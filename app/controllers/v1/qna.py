@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app import schemas, models, crud
 from app.controllers import deps
+from app.schemas.page_response import CountMode
 
 
 router = APIRouter()
@@ -14,7 +15,7 @@ router = APIRouter()
 async def create_qna(
         obj_in: schemas.QnaCreate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user),
 ) -> schemas.BaseResponse:
     """
     <h1> 문의를 등록합니다. </h1> </br>
@@ -36,7 +37,7 @@ async def create_qna(
 async def process_qna(
         qna_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user),
 ) -> schemas.BaseResponse:
     """
     <h1> 문의의 처리상태를 처리됨으로 변경합니다. 어드민만 사용할 수 있습니다.</h1> </br>
@@ -56,12 +57,13 @@ async def process_qna(
 async def get_qna_list(
         page_request: dict = Depends(deps.get_page_request),
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user),
 ) -> List[schemas.Qna]:
     """
     <h1> 등록된 문의 리스트를 확인합니다. 어드민만 사용할 수 있습니다. </h1> </br>
     pagination이 구현되어있어, "page_meta"에 페이지네이션에 대한 정보가 기록되어 옵니다.</br>
+    전체 갯수는 계산하지 않기 때문에 "total"은 null 이며, 다음 페이지 여부는 "has_next"로 확인합니다.</br>
     """
     if current_user.is_super is False:
         raise HTTPException(400, "관리자만 이 요청을 처리할 수 있습니다.")
-    return crud.qna.get_list_pagenated(db=db, page_request=page_request)
+    return crud.qna.get_list_pagenated(db=db, page_request=page_request, count_mode=CountMode.NONE)
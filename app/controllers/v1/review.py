@@ -1,33 +1,45 @@
 import os
+import json
 from typing import Union, List
 import uuid
 import logging
 
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, BackgroundTasks, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, BackgroundTasks, File, UploadFile, HTTPException, Query, Request
+from fastapi.responses import Response, JSONResponse
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
 
 from app.core.config import settings
 from app.controllers import deps
 from app.utils.smpt import email_sender
-from app.utils.review import symtom_randomizer, check_is_deleted
+from app.crud.review import review_detail_cache
+from app.crud.review_feed import review_page_cache, review_page_cache_key
+from app.schemas.page_response import CountMode
+from app.utils.etag import make_etag, etag_matches, not_modified, review_versions
+from app.utils.review import symptom_sampler, check_is_deleted, review_model_to_dto
 from app.utils.storage import s3_client
+from app.utils.view_counter import review_view_counter, get_client_ip
 from app.utils.report import get_report_reason
-from app.utils.user import calculate_birth_year_from_age, get_age_group
 from app.worker import celery
 from app import crud, schemas, models
 
 router = APIRouter()
 logger = logging.getLogger('ddakkm_logger')
 
+# [GET] /v1/review/batch 로 한번에 가져올 수 있는 리뷰 수
+MAX_BATCH_REVIEW_IDS = 50
+
+# [GET] /v1/review/trending 으로 가져올 수 있는 최대 리뷰 수
+MAX_TRENDING_REVIEWS = 50
+
 
 @router.post("", name="리뷰 생성", response_model=schemas.BaseResponse)
 async def create_review(
         *,
         db: Session = Depends(deps.get_db),
         review_in: schemas.ReviewCreate,
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 리뷰를 생성합니다. </h1> </br>
@@ -67,51 +79,175 @@ async def get_reviews(
         db: Session = Depends(deps.get_db),
         page_request: dict = Depends(deps.get_page_request),
         filters: dict = Depends(deps.review_params),
-        current_user: Union[models.User, None] = Depends(deps.get_current_user_optional)
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
 ) -> schemas.PageResponseReviews:
     """
     <h1> 메인 페이지를 위해 리뷰 리스트를 불러옵니다. </h1> </br>
     __로그인 액세스 토큰 없이(비회원도) 접근 가능한 API 입니다.__ </br> </br>
     pagination이 구현되어있어, "page_meta"에 페이지네이션에 대한 정보가 기록되어 옵니다.  </br>
+    무한 스크롤에는 page 대신 cursor 를 사용해주세요. 첫 요청은 "cursor=" (빈 값)으로 보내고,
+    이후에는 직전 응답의 "page_meta" > "next_cursor" 값을 그대로 보내면 됩니다. (cursor 방식에서 "page"는 null) </br>
+    "next_cursor"가 null 이면 마지막 페이지입니다. page 방식으로 요청해도 "next_cursor"가 함께 내려옵니다. </br>
+    "page_meta" > "total"은 필터 조합별로 캐싱된 값으로 실제 갯수와 잠시 다를 수 있습니다. 다음 페이지 여부는 "has_next"로 판단해주세요. </br>
+    "content"는 본문 앞 300자까지의 미리보기입니다. 전체 본문은 리뷰 상세보기 API로 받아주세요. </br>
+    같은 필터/페이지 요청의 응답은 최대 1분간 캐싱되며, 리뷰 작성/수정/삭제, 좋아요, 댓글이 발생하면 바로 갱신됩니다. </br>
     필터를 적용하였으며, 각 필터값에 해당하는 Query parameter를 안보내면 기본적으로 전체값을 리턴합니다. </br>
     로그인 한 유저 (Reqeust Header > Authorization에 Access Token을 넣어 요청하는 경우)는 "user_is_like"
     파라미터를 통해 내가 좋아요 한 리뷰인지의 여부를 알 수 있습니다. </br>
     </br>
     __*예시__ </br>
     /v1/review -> 검색이나 필터링 없이 전체 리뷰 반환 </br>
-    /v1/review?q=아파요 -> "아파요" 라는 본문 내용을 포함하는 전체 리뷰 반환 </br>
-    /v1/review?q=아파요&is_crossed=false -> "아파요" 라는 본문 내용을 포함하며 교차접종이 아닌 전체 리뷰 반환
+    /v1/review?q=아파요 -> "아파요" 와 관련된 본문을 가진 전체 리뷰를 관련도 순으로 반환 (2글자 이상 검색어) </br>
+    /v1/review?q=아파요&is_crossed=false -> "아파요" 와 관련된 본문을 가진 리뷰 중 교차접종이 아닌 리뷰를 관련도 순으로 반환 </br>
+    /v1/review?cursor=&is_crossed=false -> 교차접종이 아닌 리뷰의 첫 페이지 (cursor 방식) </br>
+    /v1/review?cursor=WzEyM10&is_crossed=false -> 위 응답의 next_cursor 로 다음 페이지 요청
+    """
+    # 비회원 기준 응답(user_is_like 는 모두 false)을 캐싱해두고, 로그인 유저에게는 좋아요 여부만 덧씌워서 내려준다.
+    cache_key = review_page_cache_key(page_request, filters)
+    cached_page = review_page_cache.get(cache_key)
+    if cached_page is None:
+        query = crud.review_feed.get_list_paginated(db, page_request, filters, count_mode=CountMode.ESTIMATED)
+        review_list = [schemas.ReviewResponse(
+            id=feed.review_id,
+            user_id=feed.user_id,
+            nickname=feed.nickname,
+            vaccine_round=feed.vaccine_round,
+            vaccine_type=feed.vaccine_type,
+            is_crossed=feed.is_crossed,
+            symptom=symptom_sampler(feed.symptom_candidates, feed.review_id),
+            content=feed.content_preview,
+            like_count=feed.like_count,
+            comment_count=feed.comment_count,
+            user_is_like=False
+        ) for feed in query.get("contents")]
+        cached_page = schemas.PageResponseReviews(
+            page_meta=query.get("page_meta"),
+            contents=review_list
+        ).json().encode()
+        review_page_cache.set(cache_key, cached_page)
+
+    if current_user is None:
+        return Response(content=cached_page, media_type="application/json")
+
+    # 로그인 상태면 현재 페이지의 리뷰들에 대한 좋아요 기록만 반영
+    page = json.loads(cached_page)
+    liked_review_ids = crud.user_like.get_liked_review_ids(
+        db, user_id=current_user.id, review_ids=[review.get("id") for review in page.get("contents")]
+    )
+    for review in page.get("contents"):
+        review["user_is_like"] = review.get("id") in liked_review_ids
+    return JSONResponse(content=page)
+
+
+@router.get("/facets", response_model=schemas.ReviewFacets, name="리뷰 필터 항목별 리뷰 수 가져오기")
+async def get_review_facets(
+        *,
+        db: Session = Depends(deps.get_db),
+        filters: dict = Depends(deps.review_params)
+) -> schemas.ReviewFacets:
+    """
+    <h1> 필터 화면에서 선택지별 리뷰 수를 보여주기 위해 필터 항목별 리뷰 수를 불러옵니다. </h1> </br>
+    __로그인 액세스 토큰 없이(비회원도) 접근 가능한 API 입니다.__ </br> </br>
+    리뷰 목록 API ([GET] /v1/review)와 같은 필터 파라미터를 받습니다. </br>
+    각 항목의 수는 __그 항목을 제외한 나머지 필터__를 적용한 결과입니다. </br>
+    ex) ?vaccine_type=PFIZER&is_crossed=false 로 요청하면 "vaccine_type"에는 교차접종이 아닌 리뷰의 백신 종류별 수가,
+    "is_crossed"에는 화이자 리뷰의 교차접종 여부별 수가 내려옵니다. "total"은 모든 필터를 적용한 리뷰 수입니다. </br>
+    "age_group"의 키는 "0019", "2029", "3039", "4049", "5059", "6099" 입니다. </br>
+    true/false 항목의 키는 "true", "false" 문자열입니다.
+    """
+    return schemas.ReviewFacets(**crud.review_feed.get_facet_counts(db, filters))
+
+
+@router.get("/batch", response_model=List[schemas.Review], name="여러 리뷰의 상세 정보 한번에 가져오기")
+async def get_review_details_batch(
+        ids: str = Query(..., description="리뷰 id 목록, 콤마로 구분 (최대 50개) ex) 1,2,3"),
+        db: Session = Depends(deps.get_db),
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
+) -> List[schemas.Review]:
+    """
+    <h1> 여러 리뷰의 상세 정보를 한번에 반환합니다. </h1> </br>
+    __로그인 액세스 토큰 없이(비회원도) 접근 가능한 API 입니다.__ </br> </br>
+    응답의 각 항목은 리뷰 상세보기 API ([GET] /v1/review/{review_id}) 와 같은 형식이며, 요청한 id 순서대로 내려옵니다. </br>
+    삭제되었거나 찾을 수 없는 리뷰는 404 대신 결과에서 빠집니다. </br>
+    </br>
+    __*예시__ </br>
+    /v1/review/batch?ids=12,5,7
     """
-    # 로그인 상태면 현재 유저의 좋아요 기록 불러오기 / 로그인 상태가 아니면 좋아요 기록은 비어있음
     try:
-        user_like_list = crud.user_like.get_like_review_list_by_current_user(db, current_user)
-    except AttributeError:
-        user_like_list = []
-
-    query = crud.review.get_list_paginated(db, page_request, filters)
-    review_list = [schemas.ReviewResponse(
-        id=review.id,
-        user_id=review.user_id,
-        nickname=review.user.nickname,
-        vaccine_round=review.survey.vaccine_round,
-        vaccine_type=review.survey.vaccine_type,
-        is_crossed=review.survey.is_crossed,
-        symptom=symtom_randomizer(review.survey.data),
-        content=review.content,
-        like_count=review.like_count,
-        comment_count=len(review.comments),
-        user_is_like=review.id in user_like_list
-    ) for review in query.get("contents")]
-    return schemas.PageResponseReviews(
-        page_meta=query.get("page_meta"),
-        contents=review_list
+        review_ids = list(dict.fromkeys(int(review_id) for review_id in ids.split(",") if review_id.strip()))
+    except ValueError:
+        raise HTTPException(422, "ids 는 콤마로 구분된 숫자여야 합니다.")
+    if len(review_ids) > MAX_BATCH_REVIEW_IDS:
+        raise HTTPException(422, f"리뷰는 한번에 {MAX_BATCH_REVIEW_IDS}개까지만 가져올 수 있습니다.")
+
+    current_user_id = current_user.id if current_user else 0
+    review_objs = crud.review.get_review_details_by_ids(db, ids=review_ids)
+    liked_review_ids = crud.user_like.get_liked_review_ids(
+        db, user_id=current_user_id, review_ids=[review_obj.id for review_obj in review_objs]
     )
+    return [review_model_to_dto(review_obj, current_user_id, review_obj.id in liked_review_ids)
+            for review_obj in review_objs]
+
+
+@router.get("/trending", response_model=List[schemas.ReviewResponse], name="인기 리뷰 목록 가져오기")
+async def get_trending_reviews(
+        limit: int = Query(20, ge=1, le=MAX_TRENDING_REVIEWS, description=f"가져올 리뷰 수 (최대 {MAX_TRENDING_REVIEWS}개)"),
+        db: Session = Depends(deps.get_db),
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
+) -> List[schemas.ReviewResponse]:
+    """
+    <h1> 최근 좋아요/댓글/조회가 많은 인기 리뷰를 점수 높은 순으로 불러옵니다. </h1> </br>
+    __로그인 액세스 토큰 없이(비회원도) 접근 가능한 API 입니다.__ </br> </br>
+    점수는 좋아요(3) + 댓글(2) + 조회(0.1) 에 시간 감쇠를 적용한 값으로, 하루가 지난 이벤트는 절반만 반영됩니다. </br>
+    좋아요/댓글은 바로 반영되고, 조회수는 DB 에 반영되는 주기(30초)마다, 전체 점수는 1시간마다 다시 계산됩니다. </br>
+    응답의 각 항목은 리뷰 목록 API ([GET] /v1/review) 의 "contents" 항목과 같은 형식입니다. </br>
+    </br>
+    __*예시__ </br>
+    /v1/review/trending?limit=10
+    """
+    feeds = crud.review_feed.get_trending(db, limit=limit)
+    liked_review_ids = crud.user_like.get_liked_review_ids(
+        db, user_id=current_user.id, review_ids=[feed.review_id for feed in feeds]
+    ) if current_user else set()
+    return [schemas.ReviewResponse(
+        id=feed.review_id,
+        user_id=feed.user_id,
+        nickname=feed.nickname,
+        vaccine_round=feed.vaccine_round,
+        vaccine_type=feed.vaccine_type,
+        is_crossed=feed.is_crossed,
+        symptom=symptom_sampler(feed.symptom_candidates, feed.review_id),
+        content=feed.content_preview,
+        like_count=feed.like_count,
+        comment_count=feed.comment_count,
+        user_is_like=feed.review_id in liked_review_ids
+    ) for feed in feeds]
+
+
+@router.get("/views/stats", name="리뷰 조회수 반영 상태 확인 (어드민용)")
+async def get_review_view_stats(
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
+) -> dict:
+    """
+    <h1> 메모리에 모아두고 주기적으로 DB 에 반영하는 리뷰 조회수 카운터의 상태를 확인합니다. 어드민만 사용할 수 있습니다. </h1> </br>
+    |파라미터|내용|
+    |------|--|
+    |pending_reviews / pending_increments|아직 DB 에 반영되지 않은 리뷰 수 / 조회수|
+    |flush_lag_seconds|가장 오래 기다린 조회수가 반영되지 못하고 있는 시간 (초)|
+    |flushed_increments|서버 시작 후 DB 에 반영한 조회수|
+    |deduplicated|같은 회원/IP 의 반복 조회라 세지 않은 조회수|
+    |lost_increments|반영 대기열이 가득 찼거나 서버 종료시 반영하지 못해 유실된 조회수|
+    |last_flush_at / last_flush_error|마지막으로 반영에 성공한 시각 / 마지막 반영 실패 사유|
+    """
+    if current_user.is_super is False:
+        raise HTTPException(400, "관리자만 이 요청을 처리할 수 있습니다.")
+    return review_view_counter.stats()
 
 
 @router.post("/images", response_model=schemas.Images, name="이미지 s3에 등록")
 async def create_images(
         files: List[UploadFile] = File(...),
-        current_user: Union[models.User, None] = Depends(deps.get_current_user)
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user)
 ) -> schemas.Images:
     """
     <h1> 이미지를 업로드하고, 업로드 된 이미지 url object를 반환받습니다. </h1>
@@ -157,8 +293,10 @@ async def create_images(
 @router.get("/{review_id}", response_model=schemas.Review, name="리뷰 상세보기")
 async def get_review_details(
         review_id: int,
+        request: Request,
+        response: Response,
         db: Session = Depends(deps.get_db),
-        current_user: Union[models.User, None] = Depends(deps.get_current_user_optional)
+        current_user: Union[schemas.CurrentUser, None] = Depends(deps.get_current_user_optional)
 ) -> schemas.Review:
     """
     <h1> 요청한 id에 해당하는 리뷰의 상세 정보를 반환합니다. </h1> </br>
@@ -183,31 +321,37 @@ async def get_review_details(
     |nickname|string|작성자의 닉네임|
     |content|string|댓글 내용|
     |nested_comment|list of objects|댓글의 댓글 리스트|
+
+    응답 헤더의 ETag 값을 다음 요청의 If-None-Match 헤더로 보내면, 그 사이 리뷰가 바뀌지 않은 경우 본문 없이 304 를 반환합니다.
     """
     # 비회원인 경우 id 값이 없기 때문에, 작성자인지 여부를 판별할 수 없음 -> 이에 따라 임시 orm 모델로 변환시켜줌
     if current_user is None:
         current_user = models.User(id=0)
-    review_ids_like_by_user = [
-        jsonable_encoder(review_id).get("review_id")
-        for review_id in crud.user_like.get_review_id_by_user_id(db=db, user_id=current_user.id)
-    ]
-    review_obj = crud.review.get_review_details(db=db, review_id=review_id)
-    delattr(review_obj.survey, "id")
-    review_details = schemas.Review(
-        id=review_obj.id,
-        content=review_obj.content,
-        images=review_obj.images,
-        user_id=review_obj.user_id,
-        user_gender=review_obj.user.gender,
-        user_age_group=get_age_group(calculate_birth_year_from_age(review_obj.user.age)),
-        survey=review_obj.survey,
-        is_writer=review_obj.user_id == current_user.id,
-        nickname=review_obj.user.nickname,
-        keywords=[review_keyword.keyword for review_keyword in review_obj.keywords],
-        like_count=review_obj.like_count,
-        comment_count=crud.comment.get_comment_counts_by_review_id(db=db, review_id=review_id),
-        user_is_like=review_obj.id in review_ids_like_by_user,
-    )
+
+    # 조회수는 메모리에 모았다가 주기적으로 반영 (같은 회원/IP 의 반복 조회는 30분 동안 한번만 셈)
+    viewer_key = f"user:{current_user.id}" if current_user.id else f"ip:{get_client_ip(request)}"
+
+    # 리뷰가 바뀔 때마다 올라가는 버전 + 요청한 회원 (작성자 여부/좋아요 여부가 회원마다 다름)
+    etag = make_etag("review", review_id, review_versions.get(review_id), current_user.id)
+    if etag_matches(request, etag):
+        review_view_counter.record(review_id, viewer_key)
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    # 유저와 상관없는 부분은 리뷰 id 별로 캐싱하고, 작성자 여부와 좋아요 여부만 요청마다 채운다.
+    review_details = review_detail_cache.get(review_id)
+    if review_details is None:
+        review_obj = crud.review.get_review_details(db=db, review_id=review_id)
+        review_details = review_model_to_dto(review_obj, current_user_id=0, user_is_like=False)
+        review_detail_cache.set(review_id, review_details)
+
+    review_view_counter.record(review_id, viewer_key)
+
+    review_ids_like_by_user = crud.user_like.get_liked_review_ids(db, user_id=current_user.id, review_ids=[review_id])
+    review_details = review_details.copy(update={
+        "is_writer": review_details.user_id == current_user.id,
+        "user_is_like": review_id in review_ids_like_by_user,
+    })
     return review_details
 
 
@@ -216,7 +360,7 @@ async def edit_review(
         review_id: int,
         review_in: schemas.ReviewUpdate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 사용자가 게시한 리뷰를 수정합니다. </h1> </br>
@@ -237,7 +381,7 @@ async def edit_review(
 async def delete_review(
         review_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 게시글의 상태를 삭제됨으로 변경합니다.</h1> </br>
@@ -257,7 +401,7 @@ async def delete_review(
 async def get_review_content(
         review_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.ReviewContentResponse:
     """
     <h1> 설문 내용 없이 리뷰의 내용만 불러옵니다. </h1> </br>
@@ -277,7 +421,7 @@ async def report_review(
         reason: schemas.ReportReason,
         background_task: BackgroundTasks,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 리뷰를 신고합니다. </h1> </br>
@@ -316,7 +460,7 @@ async def create_comment(
         review_id: int,
         comment_in: schemas.CommentCreate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 리뷰에 코멘트를 추가합니다. </h1> </br>
@@ -335,7 +479,7 @@ async def create_comment(
 async def change_review_like_status(
         review_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 게시글에 대한 좋아요 상태를 변경합니다. </h1> </br>
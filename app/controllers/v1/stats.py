@@ -0,0 +1,59 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app import crud, schemas
+from app.controllers import deps
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import Gender
+from app.utils.user import calculate_birth_year_from_age
+
+router = APIRouter()
+
+
+@router.get("/symptoms", response_model=schemas.SymptomStats, name="증상 통계 가져오기")
+async def get_symptom_stats(
+        *,
+        db: Session = Depends(deps.get_db),
+        vaccine_type: Optional[VaccineType] = None,
+        round: Optional[VaccineRound] = None,
+        gender: Optional[Gender] = None,
+        min_age: Optional[int] = Query(None, ge=0),
+        max_age: Optional[int] = Query(None, ge=0),
+        question: Optional[str] = Query(None, description="질문 번호 ex) q2")
+) -> schemas.SymptomStats:
+    """
+    <h1> 조건에 맞는 리뷰들의 설문 답변별 리뷰 수와 비율을 불러옵니다. </h1> </br>
+    __로그인 액세스 토큰 없이(비회원도) 접근 가능한 API 입니다.__ </br> </br>
+    ex) ?vaccine_type=PFIZER&round=SECOND&question=q2 -> 화이자 2차 접종 리뷰 중 q2 의 답변별 비율 </br>
+    목록에 노출되는 리뷰(삭제/탈퇴 제외) 중 성별과 나이 정보가 있는 리뷰만 셉니다. </br>
+    "total"은 조건에 맞는 리뷰 수이고, "ratio"는 그 중 해당 답변을 고른 리뷰의 비율입니다.
+    (여러개를 고를 수 있는 질문은 비율의 합이 1 보다 클 수 있습니다.) </br>
+    |파라미터|내용|
+    |------|--|
+    |vaccine_type / round / gender|리뷰 목록 API 의 필터와 같은 값|
+    |min_age / max_age|나이 범위 (둘 다 포함)|
+    |question|"q1" ~ "q5", 생략하면 전체 질문|
+    """
+    if min_age is not None and max_age is not None and min_age > max_age:
+        raise HTTPException(400, "min_age 는 max_age 보다 클 수 없습니다.")
+    # 나이가 많을수록 출생연도가 작다.
+    stats = crud.symptom_stat.get_stats(
+        db, vaccine_type=vaccine_type, vaccine_round=round, gender=gender,
+        min_birth_year=calculate_birth_year_from_age(max_age) if max_age is not None else None,
+        max_birth_year=calculate_birth_year_from_age(min_age) if min_age is not None else None,
+        question=question
+    )
+    total = stats["total"]
+    return schemas.SymptomStats(total=total, questions={
+        stat_question: {
+            str(answer): schemas.SymptomAnswerStat(count=count, ratio=round_ratio(count, total))
+            for answer, count in sorted(answers.items())
+        }
+        for stat_question, answers in sorted(stats["questions"].items())
+    })
+
+
+def round_ratio(count: int, total: int) -> float:
+    return round(count / total, 4) if total else 0.0
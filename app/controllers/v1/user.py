@@ -2,25 +2,51 @@ import logging
 from typing import Any, List
 
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, Body, HTTPException
+from fastapi import APIRouter, Depends, Body, HTTPException, Request, Response
 from fastapi.encoders import jsonable_encoder
 
 from app.controllers import deps
 from app import crud, schemas, models
+from app.utils.etag import make_etag, etag_matches, not_modified, user_profile_versions
+from app.utils.loader import EntityLoader
+from app.utils.review import profile_post_to_dto
 
 router = APIRouter()
 logger = logging.getLogger('ddakkm_logger')
 
 
+def user_posts_page(page: dict) -> schemas.PageResponseUserPosts:
+    return schemas.PageResponseUserPosts(page_meta=page.get("page_meta"),
+                                         contents=[profile_post_to_dto(row) for row in page.get("contents")])
+
+
+def user_profile_response(stats: models.UserStats) -> schemas.UserProfileResponse:
+    # user_stats row 하나로 프로필 응답을 만든다. (접종 정보는 가입설문 A 또는 가장 최근 리뷰의 설문)
+    details = {"vaccine_round": stats.vaccine_round,
+               "vaccine_type": stats.vaccine_type,
+               "is_crossed": stats.is_crossed}
+    # 가입설문이 A인 경우
+    if stats.join_survey_code == models.JoinSurveyCode.A:
+        vaccine_status = schemas.VaccineStatus(join_survey_code=stats.join_survey_code, details=details)
+    # 가입설문이 A가 아니지만, 자유 후기 작성으로 A 타입을 채운경우
+    elif stats.post_count > 0 and stats.vaccine_type is not None:
+        vaccine_status = schemas.VaccineStatus(join_survey_code=models.JoinSurveyCode.A, details=details)
+    else:
+        vaccine_status = schemas.VaccineStatus(join_survey_code=stats.join_survey_code)
+    return schemas.UserProfileResponse(vaccine_status=vaccine_status, character_image=stats.character_image,
+                                       nickname=stats.nickname, post_counts=stats.post_count,
+                                       comment_counts=stats.comment_count, like_counts=stats.like_count)
+
+
 @router.get("/join-survey", response_model=schemas.JoinSurveyStatusResponse, name="회원가입 설문 여부 확인")
 async def get_join_survey_status(
-        db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.JoinSurveyStatusResponse:
     """
     <h1>푸시알림수신 동의 여부 및 회원가입 설문의 상태를 리턴합니다.</h1>
     """
-    user = crud.user.get(db=db, id=current_user.id)
+    user = loader.load(models.User, current_user.id)
     return schemas.JoinSurveyStatusResponse(
         done_survey=user.join_survey_code != "NONE"
     )
@@ -31,7 +57,8 @@ async def create_join_survey(
         *,
         survey_in: schemas.SurveyCreate = Body(..., examples=schemas.survey_details_example),
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 회원 가입 설문을 등록합니다. </h1>
@@ -74,7 +101,9 @@ async def create_join_survey(
     __이미 가입 설문을 마친 유저__가 설문을 할 경우 400 에러를 반환합니다.
     """
     logger.info(f"리뷰 작성 요청 {jsonable_encoder(survey_in)}")
-    if current_user.join_survey_code != models.JoinSurveyCode.NONE:
+    # create_join_survey 에서도 같은 로더로 회원을 불러오므로 중간에 커밋이 없으면 다시 조회하지 않는다.
+    user = loader.load(models.User, current_user.id)
+    if user.join_survey_code != models.JoinSurveyCode.NONE:
         raise HTTPException(400, "이미 회원가입 설문을 마친 회원입니다.")
     crud.user.create_join_survey(db=db, survey_in=survey_in, user_id=current_user.id)
     response = schemas.BaseResponse(object=current_user.id, message=f"유저 ID : #{current_user.id}의 회원가입 설문이 등록되었습니다.")
@@ -85,19 +114,16 @@ async def create_join_survey(
 async def get_my_likes(
         *,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> List[int]:
-    return [
-        jsonable_encoder(review_id).get("review_id")
-        for review_id in crud.user_like.get_review_id_by_user_id(db=db, user_id=current_user.id)
-    ]
+    return crud.user_like.get_like_review_list_by_current_user(db, current_user)
 
 
 @router.get("/me/profile", response_model=schemas.UserProfileResponse, name="내 프로필 확인")
 async def get_my_profile(
         *,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.UserProfileResponse:
     """
     <h1> 회원 정보 요약본을 가져옵니다. </h2> </br>
@@ -109,36 +135,17 @@ async def get_my_profile(
     </br>
     __join_survey_code__의 값이 C나 NONE인 유저는 미접종 유저로 접종 내역이 없기 때문에 __details__라는 object는 null 값을 반환합니다. </br>
     """
-    user = crud.user.get(db=db, id=current_user.id)
-    post_counts = crud.review.get_review_counts_by_user_id(db=db, user_id=current_user.id)
-    comment_counts = crud.comment.get_comment_counts_by_user_id(db=db, user_id=current_user.id)
-    like_counts = crud.user_like.get_like_counts_by_user_id(db=db, user_id=current_user.id)
-    # 가입설문이 A인 경우
-    if user.join_survey_code == models.JoinSurveyCode.A:
-        details = {"vaccine_round": user.survey_a.vaccine_round,
-                   "vaccine_type": user.survey_a.vaccine_type,
-                   "is_crossed": user.survey_a.is_crossed}
-        vaccine_status = schemas.VaccineStatus(join_survey_code=user.join_survey_code, details=details)
-
-    # 가입설문이 A가 아니지만, 자유 후기 작성으로 A 타입을 채운경우
-    elif user.join_survey_code != models.JoinSurveyCode.A and post_counts > 0:
-        latest_review = crud.review.get_reviews_by_user_id(db=db, user_id=current_user.id)[0]
-        details = {"vaccine_round": latest_review.survey.vaccine_round,
-                   "vaccine_type": latest_review.survey.vaccine_type,
-                   "is_crossed": latest_review.survey.is_crossed}
-        vaccine_status = schemas.VaccineStatus(join_survey_code=models.JoinSurveyCode.A, details=details)
-
-    else:
-        vaccine_status = schemas.VaccineStatus(join_survey_code=user.join_survey_code)
-    return schemas.UserProfileResponse(vaccine_status=vaccine_status, character_image=user.character_image, nickname=user.nickname,
-                                       post_counts=post_counts, comment_counts=comment_counts, like_counts=like_counts)
+    stats = crud.user_stats.get_profile(db, user_id=current_user.id)
+    if stats is None:
+        raise HTTPException(404, "해당 회원을 찾을 수 없습니다.")
+    return user_profile_response(stats)
 
 
 @router.get("/me/post", response_model=List[schemas.UserProfilePostResponse], name="내가 쓴 글 확인")
 async def get_my_posts(
         *,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """
     <h1> 내가 올린 후기들의 리스트를 불러옵니다. </h1>
@@ -149,25 +156,30 @@ async def get_my_posts(
     A, B, C, null 중 하나이지만, </br>
     __본 API에서는__ 모든 후기가 "A" 타입의 survey이며, join_survey도 아니기 때문에 해당 값은 항상 null 입니다.
     """
-    user_reviews_model = crud.review.get_reviews_by_user_id(db=db, user_id=current_user.id)
-    user_reviews = [schemas.UserProfilePostResponse(
-        id=review.id,
-        nickname=review.user.nickname,
-        like_count=len(review.user_like),
-        comment_count=len(review.comments),
-        created_at=review.created_at,
-        vaccine_status=schemas.VaccineStatus(join_survey_code=None,
-                                             details={"vaccine_round": review.survey.vaccine_round,
-                                                      "vaccine_type": review.survey.vaccine_type,
-                                                      "is_crossed": review.survey.is_crossed}),
-        ) for review in user_reviews_model]
-    return user_reviews
+    query = crud.review.profile_posts_query(db, written_by=current_user.id)
+    return [profile_post_to_dto(row) for row in crud.review.get_profile_posts(query)]
+
+
+@router.get("/me/post/page", response_model=schemas.PageResponseUserPosts, name="내가 쓴 글 확인 (페이지)")
+async def get_my_posts_paginated(
+        *,
+        db: Session = Depends(deps.get_db),
+        page_request: dict = Depends(deps.get_page_request),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
+) -> schemas.PageResponseUserPosts:
+    """
+    <h1> 내가 올린 후기들을 최신순으로 20개씩 불러옵니다. </h1> </br>
+    항목은 [GET] /v1/user/me/post 와 같습니다. 첫 요청은 cursor 없이 보내고,
+    이후에는 직전 응답의 "page_meta" > "next_cursor" 값을 cursor 로 보내면 됩니다. "next_cursor"가 null 이면 마지막 페이지입니다.
+    """
+    query = crud.review.profile_posts_query(db, written_by=current_user.id)
+    return user_posts_page(crud.review.get_profile_posts_paginated(query, page_request))
 
 
 @router.get("/me/push", response_model=schemas.PushStatusResponse, name="푸시알림 동의 여부 확인 (키워드/활동 둘다)")
 async def get_agree_push_status(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.PushStatusResponse:
     """
     <h1> push 알림 수신 동의 여부를 확인합니다. </h1>
@@ -175,17 +187,17 @@ async def get_agree_push_status(
     """
     <h1>푸시알림수신 동의 여부 및 회원가입 설문의 상태를 리턴합니다.</h1>
     """
-    user = crud.user.get(db=db, id=current_user.id)
     return schemas.PushStatusResponse(
-        agree_activity_push=user.agree_activity_push,
-        agree_keyword_push=user.agree_keyword_push
+        agree_activity_push=current_user.agree_activity_push,
+        agree_keyword_push=current_user.agree_keyword_push
     )
 
 
 @router.post("/push/keyword", name="키워드 푸시 알림 동의 상태 변경", response_model=schemas.BaseResponse)
 async def change_push_status(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 키워드 push 알림 수신 동의 여부를 변경합니다. </h1>
@@ -193,13 +205,14 @@ async def change_push_status(
     </br>
     ```동의 / 동의취소 따로 만들어야하면 말해주세요.```
     """
-    return crud.user.change_user_agree_keyword_push_status(db=db, current_user=current_user)
+    return crud.user.change_user_agree_keyword_push_status(db=db, current_user=loader.load(models.User, current_user.id))
 
 
 @router.post("/push/activity", name="활동 푸시 알림 동의 상태 변경", response_model=schemas.BaseResponse)
 async def change_push_status(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        loader: EntityLoader = Depends(deps.get_entity_loader),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 활동 push 알림 수신 동의 여부를 변경합니다. </h1>
@@ -207,13 +220,13 @@ async def change_push_status(
     </br>
     ```동의 / 동의취소 따로 만들어야하면 말해주세요.```
     """
-    return crud.user.change_user_agree_activity_push_status(db=db, current_user=current_user)
+    return crud.user.change_user_agree_activity_push_status(db=db, current_user=loader.load(models.User, current_user.id))
 
 
 @router.get("/keyword", name="회원의 키워드 목록 가져오기", response_model=List[str])
 async def get_keyword(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> List[str]:
     user_keywords_model = crud.user_keyword.get_keywords_by_user_id(db=db, user_id=current_user.id)
     user_keywords = [dict(keyword).get("keyword") for keyword in user_keywords_model]
@@ -225,7 +238,7 @@ async def set_keyword(
         *,
         obj_in: schemas.UserKeywordCreate,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 유저의 키워드를 설정합니다. </h1>
@@ -250,8 +263,10 @@ async def set_keyword(
 async def get_user_profile(
         user_id: int,
         *,
+        request: Request,
+        response: Response,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user_optional)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user_optional)
 ) -> schemas.UserProfileResponse:
     """
     <h1> 회원 정보 요약본을 가져옵니다. </h2> </br>
@@ -262,32 +277,19 @@ async def get_user_profile(
     __join_survey_code__의 값이 B인 유저는 접종예정 유저로 접종 내역이 없기 때문에 __details__라는 object는 null 값을 반환합니다. </br>
     </br>
     __join_survey_code__의 값이 C나 NONE인 유저는 미접종 유저로 접종 내역이 없기 때문에 __details__라는 object는 null 값을 반환합니다. </br>
+    </br>
+    응답 헤더의 ETag 값을 다음 요청의 If-None-Match 헤더로 보내면, 그 사이 프로필이 바뀌지 않은 경우 본문 없이 304 를 반환합니다.
     """
-    user = crud.user.get(db=db, id=user_id)
-    if user is None or user.is_active is False:
-        raise HTTPException(404, "해당 회원을 찾을 수 없습니다.")
-    post_counts = crud.review.get_review_counts_by_user_id(db=db, user_id=user_id)
-    comment_counts = crud.comment.get_comment_counts_by_user_id(db=db, user_id=user_id)
-    like_counts = crud.user_like.get_like_counts_by_user_id(db=db, user_id=user_id)
-    # 가입설문이 A인 경우
-    if user.join_survey_code == models.JoinSurveyCode.A:
-        details = {"vaccine_round": user.survey_a.vaccine_round,
-                   "vaccine_type": user.survey_a.vaccine_type,
-                   "is_crossed": user.survey_a.is_crossed}
-        vaccine_status = schemas.VaccineStatus(join_survey_code=user.join_survey_code, details=details)
+    # 회원의 설문/리뷰/댓글/좋아요가 바뀔 때마다 올라가는 버전 (프로필은 요청한 회원과 상관없음)
+    etag = make_etag("profile", user_id, user_profile_versions.get(user_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    # 가입설문이 A가 아니지만, 자유 후기 작성으로 A 타입을 채운경우
-    elif user.join_survey_code != models.JoinSurveyCode.A and post_counts > 0:
-        latest_review = crud.review.get_reviews_by_user_id(db=db, user_id=user_id)[0]
-        details = {"vaccine_round": latest_review.survey.vaccine_round,
-                   "vaccine_type": latest_review.survey.vaccine_type,
-                   "is_crossed": latest_review.survey.is_crossed}
-        vaccine_status = schemas.VaccineStatus(join_survey_code=models.JoinSurveyCode.A, details=details)
-
-    else:
-        vaccine_status = schemas.VaccineStatus(join_survey_code=user.join_survey_code)
-    return schemas.UserProfileResponse(vaccine_status=vaccine_status, character_image=user.character_image, nickname=user.nickname,
-                                       post_counts=post_counts, comment_counts=comment_counts, like_counts=like_counts)
+    stats = crud.user_stats.get_profile(db, user_id=user_id)
+    if stats is None:
+        raise HTTPException(404, "해당 회원을 찾을 수 없습니다.")
+    response.headers["ETag"] = etag
+    return user_profile_response(stats)
 
 
 @router.get("/{user_id}/post", response_model=List[schemas.UserProfilePostResponse], name="다른 회원이 쓴 글 확인")
@@ -295,7 +297,7 @@ async def get_user_posts(
         *,
         user_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user_optional)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user_optional)
 ) -> Any:
     """
     <h1> 다른 회원이 올린 후기들의 리스트를 불러옵니다. </h1>
@@ -306,29 +308,33 @@ async def get_user_posts(
     A, B, C, null 중 하나이지만, </br>
     __본 API에서는__ 모든 후기가 "A" 타입의 survey이며, join_survey도 아니기 때문에 해당 값은 항상 null 입니다.
     """
-    user = crud.user.get(db=db, id=user_id)
-    if user is None or user.is_active is False:
+    if not crud.user.is_active_user(db, user_id=user_id):
+        raise HTTPException(404, "해당 회원을 찾을 수 없습니다.")
+    query = crud.review.profile_posts_query(db, written_by=user_id)
+    return [profile_post_to_dto(row) for row in crud.review.get_profile_posts(query)]
+
+
+@router.get("/{user_id}/post/page", response_model=schemas.PageResponseUserPosts, name="다른 회원이 쓴 글 확인 (페이지)")
+async def get_user_posts_paginated(
+        user_id: int,
+        db: Session = Depends(deps.get_db),
+        page_request: dict = Depends(deps.get_page_request)
+) -> schemas.PageResponseUserPosts:
+    """
+    <h1> 다른 회원이 올린 후기들을 최신순으로 20개씩 불러옵니다. </h1> </br>
+    항목은 [GET] /v1/user/{user_id}/post 와 같고, 페이지는 [GET] /v1/user/me/post/page 와 같은 방식으로 넘깁니다.
+    """
+    if not crud.user.is_active_user(db, user_id=user_id):
         raise HTTPException(404, "해당 회원을 찾을 수 없습니다.")
-    user_reviews_model = crud.review.get_reviews_by_user_id(db=db, user_id=user_id)
-    user_reviews = [schemas.UserProfilePostResponse(
-        id=review.id,
-        nickname=review.user.nickname,
-        like_count=len(review.user_like),
-        comment_count=len(review.comments),
-        created_at=review.created_at,
-        vaccine_status=schemas.VaccineStatus(join_survey_code=None,
-                                             details={"vaccine_round": review.survey.vaccine_round,
-                                                      "vaccine_type": review.survey.vaccine_type,
-                                                      "is_crossed": review.survey.is_crossed}),
-        ) for review in user_reviews_model]
-    return user_reviews
+    query = crud.review.profile_posts_query(db, written_by=user_id)
+    return user_posts_page(crud.review.get_profile_posts_paginated(query, page_request))
 
 
 # TODO 유저 댓글 삭제 -> 유저가 쓴 리뷰의 댓글 삭제 -> 유저가 쓴 리뷰의 키워드 삭제 -> 유저의 좋아요 삭제 -> 유저가 쓴 리뷰의 좋아요 삭제 -> 유저의 리뷰 삭제 -> 유저의 설문조사 삭제 -> 유저 삭제
 @router.delete("", response_model=schemas.BaseResponse, deprecated=True, name="회원삭제 (개발 테스트용)")
 async def delete_user(
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 회원을 삭제합니다. 본 API는 테스트용으로만 사용합니다. </h1> </br>
@@ -342,7 +348,7 @@ async def delete_user(
 async def delete_user_by_id(
         user_id: int,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> schemas.BaseResponse:
     """
     <h1> 회원을 삭제합니다. 본 API는 테스트용으로만 사용합니다. </h1> </br>
@@ -355,7 +361,7 @@ async def delete_user_by_id(
 async def get_my_comments(
         *,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> List[schemas.UserProfilePostResponse]:
     """
     <h1> 내가 댓글 단 후기들의 리스트를 불러옵니다. </h1>
@@ -366,30 +372,30 @@ async def get_my_comments(
     A, B, C, null 중 하나이지만, </br>
     __본 API에서는__ 모든 후기가 "A" 타입의 survey이며, join_survey도 아니기 때문에 해당 값은 항상 null 입니다.
     """
-    review_ids_comment_by_user = [
-        jsonable_encoder(review_id).get("review_id")
-        for review_id in crud.comment.get_review_id_by_comment_user_id(db=db, user_id=current_user.id)
-    ]
-    reviews_model = crud.review.get_reviews_by_ids(db=db, ids=review_ids_comment_by_user)
-    reviews = [schemas.UserProfilePostResponse(
-        id=review.id,
-        nickname=review.user.nickname,
-        like_count=len(review.user_like),
-        comment_count=len(review.comments),
-        created_at=review.created_at,
-        vaccine_status=schemas.VaccineStatus(join_survey_code=None,
-                                             details={"vaccine_round": review.survey.vaccine_round,
-                                                      "vaccine_type": review.survey.vaccine_type,
-                                                      "is_crossed": review.survey.is_crossed}),
-        ) for review in reviews_model]
-    return reviews
+    query = crud.review.profile_posts_query(db, commented_by=current_user.id)
+    return [profile_post_to_dto(row) for row in crud.review.get_profile_posts(query)]
+
+
+@router.get("/me/comment-posts/page", response_model=schemas.PageResponseUserPosts, name="내가 댓글 단 글 확인 (페이지)")
+async def get_my_comment_posts_paginated(
+        *,
+        db: Session = Depends(deps.get_db),
+        page_request: dict = Depends(deps.get_page_request),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
+) -> schemas.PageResponseUserPosts:
+    """
+    <h1> 내가 댓글 단 후기들을 최신 후기순으로 20개씩 불러옵니다. </h1> </br>
+    항목은 [GET] /v1/user/me/comment-posts 와 같고, 페이지는 [GET] /v1/user/me/post/page 와 같은 방식으로 넘깁니다.
+    """
+    query = crud.review.profile_posts_query(db, commented_by=current_user.id)
+    return user_posts_page(crud.review.get_profile_posts_paginated(query, page_request))
 
 
 @router.get("/me/like-posts", response_model=List[schemas.UserProfilePostResponse], deprecated=True, name="내가 좋아요 한 글 확인")
 async def get_user_info(
         *,
         db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_user)
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
 ) -> List[schemas.UserProfilePostResponse]:
     """
     <h1> 내가 좋아요 한 후기들의 리스트를 불러옵니다. </h1>
@@ -400,22 +406,22 @@ async def get_user_info(
     A, B, C, null 중 하나이지만, </br>
     __본 API에서는__ 모든 후기가 "A" 타입의 survey이며, join_survey도 아니기 때문에 해당 값은 항상 null 입니다.
     """
-    review_ids_like_by_user = [
-        jsonable_encoder(review_id).get("review_id")
-        for review_id in crud.user_like.get_review_id_by_user_id(db=db, user_id=current_user.id)
-    ]
-    reviews_model = crud.review.get_reviews_by_ids(db=db, ids=review_ids_like_by_user)
-    reviews = [schemas.UserProfilePostResponse(
-        id=review.id,
-        nickname=review.user.nickname,
-        like_count=len(review.user_like),
-        comment_count=len(review.comments),
-        created_at=review.created_at,
-        vaccine_status=schemas.VaccineStatus(join_survey_code=None,
-                                             details={"vaccine_round": review.survey.vaccine_round,
-                                                      "vaccine_type": review.survey.vaccine_type,
-                                                      "is_crossed": review.survey.is_crossed}),
-        ) for review in reviews_model]
-    return reviews
+    query = crud.review.profile_posts_query(db, liked_by=current_user.id)
+    return [profile_post_to_dto(row) for row in crud.review.get_profile_posts(query)]
+
+
+@router.get("/me/like-posts/page", response_model=schemas.PageResponseUserPosts, name="내가 좋아요 한 글 확인 (페이지)")
+async def get_my_like_posts_paginated(
+        *,
+        db: Session = Depends(deps.get_db),
+        page_request: dict = Depends(deps.get_page_request),
+        current_user: schemas.CurrentUser = Depends(deps.get_current_user)
+) -> schemas.PageResponseUserPosts:
+    """
+    <h1> 내가 좋아요 한 후기들을 최신 후기순으로 20개씩 불러옵니다. </h1> </br>
+    항목은 [GET] /v1/user/me/like-posts 와 같고, 페이지는 [GET] /v1/user/me/post/page 와 같은 방식으로 넘깁니다.
+    """
+    query = crud.review.profile_posts_query(db, liked_by=current_user.id)
+    return user_posts_page(crud.review.get_profile_posts_paginated(query, page_request))
 
 
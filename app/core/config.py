@@ -37,6 +37,22 @@ class Settings(BaseSettings):
 
     KAKAO_ADMIN_KEY: str
 
+    # 리뷰 목록 필터를 메모리 비트셋 인덱스로 처리할지 여부 (서버 시작시 review_feed 전체를 읽어옴)
+    REVIEW_FILTER_INDEX_ENABLED: bool = False
+
+    # 메모리에 모아둔 리뷰 조회수를 DB 에 반영하는 주기 (초)
+    REVIEW_VIEW_FLUSH_SECONDS: int = 30
+
+    # 좋아요 수 증감을 메모리에 합쳐두었다가 LIKE_COUNT_FLUSH_SECONDS 마다 한번에 반영할지 여부 (좋아요가 몰리는 리뷰/댓글의 row lock 경합 감소)
+    LIKE_COUNT_WRITE_COMBINING: bool = False
+    LIKE_COUNT_FLUSH_SECONDS: int = 2
+
+    # 인기 리뷰 점수를 DB 의 좋아요/댓글/조회수 기록으로 다시 계산하는 주기 (초)
+    REVIEW_TRENDING_RECONCILE_SECONDS: int = 60 * 60
+
+    # 회원 프로필 활동 수(user_stats)를 원본 테이블로 다시 세어 맞추는 주기 (초)
+    USER_STATS_RECONCILE_SECONDS: int = 60 * 60 * 6
+
 # debug
 # _env_file=f'{os.getenv("app_env", "../app/env/local")}.env'
 
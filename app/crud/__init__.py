@@ -1,5 +1,9 @@
 from .user import user
+from .user_stats import user_stats
 from .review import review
+from .review_feed import review_feed
+from .review_facet_count import review_facet_count
+from .symptom_stat import symptom_stat
 from .survey import survey_a, survey_b, survey_c
 from .comment import comment
 from .user_like import user_like
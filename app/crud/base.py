@@ -1,7 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 from app.db.base_class import Base
@@ -10,6 +12,20 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+MYSQL_DEADLOCK_ERROR = 1213
+
+
+def run_with_deadlock_retry(db: Session, job: Callable[[], Any], attempts: int = 3) -> Any:
+    # 같은 row 를 동시에 지우고/만드는 요청끼리 InnoDB gap lock 으로 deadlock 이 나면 롤백 후 다시 시도한다.
+    for attempt in range(attempts):
+        try:
+            return job()
+        except OperationalError as e:
+            db.rollback()
+            # 드라이버 예외가 아니거나 args 가 비어있는 경우도 deadlock 이 아닌 것으로 보고 원래 예외를 그대로 올린다.
+            if getattr(e.orig, "args", ())[:1] != (MYSQL_DEADLOCK_ERROR,) or attempt == attempts - 1:
+                raise
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -63,3 +79,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.commit()
         return obj
 
+    def toggle(self, db: Session, **keys: Any) -> int:
+        """
+        keys(PK) 에 해당하는 row 가 있으면 지우고 없으면 만든 뒤 -1 / +1 을 반환합니다. </br>
+        row 를 읽어오지 않고 DELETE, INSERT IGNORE 한번씩으로 처리하며, 동시에 들어온 같은 요청이 먼저 만들었으면 0 을 반환합니다. </br>
+        commit 은 호출하는 쪽에서 카운트 증감과 함께 합니다.
+        """
+        conditions = [getattr(self.model, key) == value for key, value in keys.items()]
+        if db.query(self.model).filter(*conditions).delete(synchronize_session=False):
+            return -1
+        return db.execute(insert(self.model).prefix_with("IGNORE").values(**keys)).rowcount
@@ -1,12 +1,17 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 
+from sqlalchemy import case, select, union_all
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
-from app import crud
+from app import crud, models
 from app.crud.base import CRUDBase
-from app.models.users import User
+from app.schemas.user import CurrentUser
 from app.models.comments import Comment
+from app.utils.after_commit import on_commit
+from app.utils.etag import comment_list_versions, user_profile_versions
+from app.utils.loader import get_loader
 from app.utils.review import check_is_deleted
 from app.schemas.comment import CommentCreate, CommentUpdate
 
@@ -17,16 +22,76 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             options(joinedload(self.model.user)).filter(self.model.review_id == review_id).all()
         return comment_obj
 
-    def get_comment(self, db: Session, id: int) -> Comment:
-        comment_obj = db.query(self.model).join(self.model.user).\
-            options(joinedload(self.model.user)).\
-            filter(self.model.id == id).first()
+    def get_top_level_comments_by_review_id(self, db: Session, review_id: int, *,
+                                            cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Comment]:
+        # 최상위 댓글을 작성 순(id)으로, cursor(마지막으로 받은 댓글 id) 다음부터 limit 개 가져온다.
+        # 작성자는 join 하지 않는다. (build_comment_tree 에서 loader 로 작성자별 한번씩 불러옴)
+        query = db.query(self.model).filter(self.model.review_id == review_id).filter(self.model.parent_id == None)
+        if cursor is not None:
+            query = query.filter(self.model.id > cursor)
+        query = query.order_by(self.model.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_comments_by_parent_ids(self, db: Session, parent_ids: List[int]) -> List[Comment]:
+        if not parent_ids:
+            return []
+        return db.query(self.model).filter(self.model.parent_id.in_(parent_ids)).order_by(self.model.id).all()
+
+    def get_reply_previews(self, db: Session, *, review_id: int, parent_ids: List[int], reply_limit: int) -> List[Comment]:
+        # 댓글마다 앞에서부터 reply_limit 개의 대댓글만 가져온다.
+        # 댓글별로 (review_id, parent_id, id) 인덱스 범위를 reply_limit 개만 읽도록 LIMIT 을 건 UNION ALL 로 id 를 먼저 구한다.
+        if not parent_ids or reply_limit == 0:
+            return []
+        reply_ids = [reply_id for reply_id, in db.execute(union_all(*[
+            select(self.model.id).where(self.model.review_id == review_id).where(self.model.parent_id == parent_id).
+            order_by(self.model.id).limit(reply_limit)
+            for parent_id in parent_ids
+        ])).all()]
+        if not reply_ids:
+            return []
+        return db.query(self.model).filter(self.model.id.in_(reply_ids)).order_by(self.model.id).all()
+
+    def get_comment(self, db: Session, id: int) -> Optional[Comment]:
+        # 같은 요청에서 이미 불러온 댓글/작성자는 다시 조회하지 않는다. (작성자가 없는 댓글은 None)
+        loader = get_loader(db)
+        comment_obj = loader.load(self.model, id)
+        if comment_obj is None or loader.load(models.User, comment_obj.user_id) is None:
+            return None
         return comment_obj
 
-    def get_comments_by_parent_id(self, db: Session, parent_id: int) -> List[Comment]:
-        return db.query(self.model).join(self.model.user).\
-            options(joinedload(self.model.user)).\
-            filter(self.model.parent_id == parent_id).all()
+    def get_review_id_of_comment(self, db: Session, comment_id: int) -> Optional[int]:
+        # get_comment 와 같은 조건이지만 댓글 row 대신 리뷰 id 만 가져온다.
+        row = db.query(self.model.review_id).join(self.model.user).filter(self.model.id == comment_id).first()
+        return row.review_id if row else None
+
+    def change_like_counts(self, db: Session, *, counts: Dict[int, int]) -> None:
+        # {comment_id: 증감량} 을 DB 에서 직접 증감한다.
+        db.query(self.model).filter(self.model.id.in_(list(counts))).\
+            update({self.model.like_count: self.model.like_count + case(counts, value=self.model.id, else_=0)},
+                   synchronize_session=False)
+
+    def get_comments_by_parent_id(self, db: Session, parent_id: int, *, review_id: Optional[int] = None,
+                                  cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Comment]:
+        # 대댓글을 작성 순(id)으로, cursor(마지막으로 받은 대댓글 id) 다음부터 limit 개 가져온다.
+        # review_id 를 함께 넘기면 (review_id, parent_id, id) 인덱스를 탄다.
+        query = db.query(self.model).filter(self.model.parent_id == parent_id)
+        if review_id is not None:
+            query = query.filter(self.model.review_id == review_id)
+        if cursor is not None:
+            query = query.filter(self.model.id > cursor)
+        query = query.order_by(self.model.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def change_reply_count(self, db: Session, *, comment_id: int, amount: int) -> None:
+        # 동시에 달린 대댓글이 유실되지 않도록 DB 에서 직접 증감한다. (대댓글이 달릴 때만 마지막 대댓글 시각 갱신)
+        values = {self.model.reply_count: self.model.reply_count + amount}
+        if amount > 0:
+            values[self.model.last_reply_at] = datetime.now()
+        db.query(self.model).filter(self.model.id == comment_id).update(values, synchronize_session=False)
 
     def edit_comment(self, db: Session, id: int, obj_in: CommentUpdate, user_id: int) -> Comment:
         db_obj = db.query(self.model).filter(self.model.id == id).first()
@@ -34,11 +99,12 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             raise HTTPException(400, "수정 권한이 없는 댓글입니다.")
         db_obj.content = obj_in.content
         db.add(db_obj)
+        on_commit(db, comment_list_versions.bump, db_obj.review_id)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def create_by_current_user(self, db: Session, *, obj_in: CommentCreate, current_user: User, review_id: int) -> Comment:
+    def create_by_current_user(self, db: Session, *, obj_in: CommentCreate, current_user: CurrentUser, review_id: int) -> Comment:
         db_obj = self.model(
             user_id=current_user.id,
             review_id=review_id,
@@ -47,12 +113,16 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
         review = crud.review.get_review(db=db, id=review_id)
         check_is_deleted(review)
         db.add(db_obj)
+        crud.review.change_comment_count(db, review_id=review_id, amount=1)
+        crud.user_stats.change(db, user_id=current_user.id, comment_count=1)
+        on_commit(db, comment_list_versions.bump, review_id)
+        on_commit(db, user_profile_versions.bump, current_user.id)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def create_nested_comment(self, db: Session, *,
-                              obj_in: CommentCreate, current_user: User, comment_id: int) -> Comment:
+                              obj_in: CommentCreate, current_user: CurrentUser, comment_id: int) -> Comment:
         comment_obj = self.get_comment(db, id=comment_id)
         if comment_obj.depth == 1:
             raise HTTPException(400, "대댓글에는 대댓글을 달 수 없습니다.")
@@ -67,15 +137,26 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             content=obj_in.content
         )
         db.add(db_obj)
+        crud.review.change_comment_count(db, review_id=review_id, amount=1)
+        self.change_reply_count(db, comment_id=comment_id, amount=1)
+        crud.user_stats.change(db, user_id=current_user.id, comment_count=1)
+        on_commit(db, comment_list_versions.bump, review_id)
+        on_commit(db, user_profile_versions.bump, current_user.id)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    @staticmethod
-    def set_comment_status_as_deleted(db: Session, *, db_obj: Comment, current_user: User) -> Comment:
+    def set_comment_status_as_deleted(self, db: Session, *, db_obj: Comment, current_user: CurrentUser) -> Comment:
         if current_user.is_super is True or db_obj.user_id == current_user.id:
             db_obj.is_delete = True
             db.add(db_obj)
+            crud.review.change_comment_count(db, review_id=db_obj.review_id, amount=-1,
+                                             commented_at=db_obj.created_at)
+            if db_obj.parent_id is not None:
+                self.change_reply_count(db, comment_id=db_obj.parent_id, amount=-1)
+            crud.user_stats.change(db, user_id=db_obj.user_id, comment_count=-1)
+            on_commit(db, comment_list_versions.bump, db_obj.review_id)
+            on_commit(db, user_profile_versions.bump, db_obj.user_id)
             db.commit()
             db.refresh(db_obj)
             return db_obj
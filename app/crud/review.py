@@ -1,23 +1,46 @@
-from typing import List
+from datetime import datetime
+from typing import List, Dict, Iterator, Optional
 import logging
 
-from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy import case
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, Query, aliased, contains_eager, selectinload, lazyload
 from fastapi.encoders import jsonable_encoder
 from fastapi import HTTPException
 
 from app import models
 from app.crud.base import CRUDBase
 from app.crud.survey import survey_a
+from app.crud.review_feed import review_feed
+from app.crud.user_stats import user_stats
 from app.models.reviews import Review, ReviewKeyword
-from app.models.users import User, UserKeyword
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewParams
+from app.models.users import UserKeyword
+from app.schemas.page_response import keyset_paginated_query, encode_cursor, decode_cursor, CountMode
+from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.schemas.user import CurrentUser
 from app.schemas.survey import SurveyA
-from app.schemas.page_response import paginated_query
-from app.utils.user import calculate_birth_year_from_age
+from app.utils.after_commit import on_commit
+from app.utils.cache import TTLCache
+from app.utils.etag import review_versions, user_profile_versions
+from app.utils.loader import get_loader
+from app.utils.trending import review_trending
+from app.utils.view_counter import review_view_counter
 
 
 logger = logging.getLogger('ddakkm_logger')
 
+# 리뷰 id 별 상세 응답(schemas.Review) 중 유저와 상관없는 부분 -> 리뷰 수정/삭제, 좋아요, 댓글 작성/삭제시 지워짐
+review_detail_cache = TTLCache(ttl=60 * 5)
+
+# 데이터 추출시 서버 사이드 커서에서 한번에 읽어오는 row 수
+EXPORT_BATCH_SIZE = 1000
+
+
+def invalidate_review_detail(db: Session, review_id: int) -> None:
+    # 커밋된 뒤에 상세 캐시를 지우고 상세 응답의 ETag 도 바꾼다.
+    on_commit(db, review_detail_cache.delete, review_id)
+    on_commit(db, review_versions.bump, review_id)
+
 
 class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
     def create_no_commit(self, db: Session, *, obj_in: ReviewCreate) -> Review:
@@ -25,6 +48,10 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
         db_obj = self.model(**obj_in_data)  # type: ignore
         db.add(db_obj)
         db.flush()
+        review_feed.refresh(db, review_ids=[db_obj.id])
+        user_stats.change(db, user_id=db_obj.user_id, post_count=1)
+        user_stats.refresh_profile(db, user_id=db_obj.user_id)
+        on_commit(db, user_profile_versions.bump, db_obj.user_id)
         return db_obj
 
     def create_by_current_user(self, db: Session, *, obj_in: ReviewCreate, user_id: int):
@@ -48,84 +75,23 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
             )
         db.add(db_obj)
         db.flush()
+        review_feed.refresh(db, review_ids=[db_obj.id])
+        user_stats.change(db, user_id=user_id, post_count=1)
+        user_stats.refresh_profile(db, user_id=user_id)
+        on_commit(db, user_profile_versions.bump, user_id)
         return db_obj
 
-    def get_list_paginated(self, db: Session, page_request: dict, filters: ReviewParams) -> List[Review]:
-        if filters.q:
-            filter_query = self.model.content.contains(filters.q)
-        else:
-            filter_query = self.model.id
-
-        if filters.min_age and filters.max_age:
-            min_birth_year = calculate_birth_year_from_age(filters.min_age)
-            max_birth_year = calculate_birth_year_from_age(filters.max_age)
-            filter_age = models.User.age.between(max_birth_year, min_birth_year)
-        else:
-            filter_age = self.model.id
-
-        if filters.gender:
-            filter_gender = models.User.gender == filters.gender
-        else:
-            filter_gender = self.model.id
-
-        if filters.vaccine_type:
-            filter_vaccine_type = models.SurveyA.vaccine_type == filters.vaccine_type
-        else:
-            filter_vaccine_type = self.model.id
-
-        if filters.is_crossed is None:
-            filter_is_crossed = self.model.id
-        elif filters.is_crossed is True:
-            filter_is_crossed = models.SurveyA.is_crossed == True
-        else:
-            filter_is_crossed = models.SurveyA.is_crossed == False
-
-        if filters.round:
-            filter_round = models.SurveyA.vaccine_round == filters.round
-        else:
-            filter_round = self.model.id
-
-        if filters.is_pregnant is None:
-            filter_is_pregnant = self.model.id
-        elif filters.is_pregnant is True:
-            filter_is_pregnant = models.SurveyA.is_pregnant == True
-        else:
-            filter_is_pregnant = models.SurveyA.is_pregnant == False
-
-        if filters.is_underlying_disease is None:
-            filter_is_underlying_disease = self.model.id
-        elif filters.is_underlying_disease is True:
-            filter_is_underlying_disease = models.SurveyA.is_underlying_disease == True
-        else:
-            filter_is_underlying_disease = models.SurveyA.is_underlying_disease == False
-
-        query = db.query(self.model).outerjoin(models.SurveyA).options(joinedload(self.model.survey)).\
-            join(models.User).options(joinedload(self.model.user)).\
-            filter(filter_query).filter(filter_age).filter(filter_gender).filter(filter_vaccine_type).\
-            filter(filter_is_crossed).filter(filter_round).filter(filter_is_pregnant).\
-            filter(filter_is_underlying_disease).filter(self.model.is_delete == False).\
-            filter(models.User.is_active == True).\
-            group_by(self.model.id)
-
-        page = page_request.get("page", 1)
-        size = page_request.get("size", 20)
-
-        return paginated_query(
-            page_request,
-            query,
-            lambda x: x.order_by(self.model.id.desc()).limit(size).offset((page - 1) * size).all()
-        )
-
     def get_review(self, db: Session, id: int) -> Review:
-        review_obj = db.query(self.model).filter(self.model.id == id).\
-            join(models.User).options(joinedload(self.model.user)).\
-            filter(models.User.is_active == True).first()
-        if review_obj is None:
+        # 같은 요청에서 이미 불러온 리뷰/작성자는 다시 조회하지 않는다. (핸들러와 crud 에서 같은 리뷰를 여러번 찾는 경우)
+        loader = get_loader(db)
+        review_obj = loader.load(self.model, id)
+        author = loader.load(models.User, review_obj.user_id) if review_obj is not None else None
+        if author is None or author.is_active is not True:
             raise HTTPException(404, "리뷰를 찾을 수 없습니다.")
         return review_obj
 
     @staticmethod
-    def update_review(db: Session, *, db_obj: Review, obj_in: ReviewUpdate, current_user: User) -> Review:
+    def update_review(db: Session, *, db_obj: Review, obj_in: ReviewUpdate, current_user: CurrentUser) -> Review:
         if db_obj.user_id != current_user.id:
             raise HTTPException(400, "이 게시글을 수정할 권한이 없습니다.")
         logger.info(f"리뷰 #{db_obj.id} 수정 요청 {jsonable_encoder(obj_in)}")
@@ -140,32 +106,141 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
         db.add(db_obj)
         db.flush()
         db.refresh(db_obj)
+        review_feed.refresh(db, review_ids=[db_obj.id])
+        invalidate_review_detail(db, db_obj.id)
+        on_commit(db, user_profile_versions.bump, db_obj.user_id)
         return db_obj
 
     @staticmethod
-    def set_review_status_as_deleted(db: Session, *, db_obj: Review, current_user: User) -> Review:
+    def set_review_status_as_deleted(db: Session, *, db_obj: Review, current_user: CurrentUser) -> Review:
         if current_user.is_super is True or db_obj.user_id == current_user.id:
             db_obj.is_delete = True
             db.add(db_obj)
+            db.flush()
+            review_feed.refresh(db, review_ids=[db_obj.id])
+            user_stats.change(db, user_id=db_obj.user_id, post_count=-1)
+            user_stats.refresh_profile(db, user_id=db_obj.user_id)
+            invalidate_review_detail(db, db_obj.id)
+            on_commit(db, user_profile_versions.bump, db_obj.user_id)
             db.commit()
             db.refresh(db_obj)
             return db_obj
         else:
             raise HTTPException(400, "이 게시글을 수정할 권한이 없습니다.")
 
+    def change_comment_count(self, db: Session, *, review_id: int, amount: int,
+                             commented_at: Optional[datetime] = None) -> None:
+        # 동시에 달린 댓글이 유실되지 않도록 DB 에서 직접 증감한다.
+        # 댓글 삭제는 commented_at 에 원래 댓글 시각을 넘겨서 인기 점수에서 그때 더한 가중치만큼 뺀다.
+        db.query(self.model).filter(self.model.id == review_id).\
+            update({self.model.comment_count: self.model.comment_count + amount}, synchronize_session=False)
+        review_feed.change_counts(db, review_id=review_id, comment_count=amount)
+        invalidate_review_detail(db, review_id)
+        on_commit(db, review_trending.record, review_id, "comment", amount,
+                  commented_at.timestamp() if commented_at is not None else None)
+
+    def change_like_counts(self, db: Session, *, counts: Dict[int, int]) -> None:
+        # {review_id: 증감량} 을 DB 에서 직접 증감한다. (좋아요 토글 한건이든 모아둔 증감량이든 UPDATE 한번)
+        db.query(self.model).filter(self.model.id.in_(list(counts))).\
+            update({self.model.like_count: self.model.like_count + case(counts, value=self.model.id, else_=0)},
+                   synchronize_session=False)
+        review_feed.change_like_counts(db, counts=counts)
+        for review_id in counts:
+            invalidate_review_detail(db, review_id)
+
+    def is_active_review(self, db: Session, review_id: int) -> bool:
+        # get_review 와 같은 조건이지만 리뷰/작성자/설문 row 를 불러오지 않는다.
+        return db.query(self.model.id).join(models.User, models.User.id == self.model.user_id).\
+            filter(self.model.id == review_id).filter(models.User.is_active == True).first() is not None
+
+    def get_comment_count(self, db: Session, review_id: int) -> int:
+        # 삭제되지 않은 댓글 수 (댓글 작성/삭제 때마다 증감하는 review.comment_count)
+        row = db.query(self.model.comment_count).filter(self.model.id == review_id).first()
+        return row.comment_count if row else 0
+
+    def flush_view_counts(self, db: Session) -> int:
+        # 메모리에 모아둔 조회수를 UPDATE 한번으로 반영한다. (조회수 때문에 updated_at 이 바뀌지 않도록 그대로 둠)
+        def writer(counts: Dict[int, int]) -> None:
+            db.query(self.model).filter(self.model.id.in_(list(counts))).update({
+                self.model.view_count: self.model.view_count + case(counts, value=self.model.id, else_=0),
+                self.model.updated_at: self.model.updated_at,
+            }, synchronize_session=False)
+            db.commit()
+            for review_id, count in counts.items():
+                review_trending.record(review_id, "view", count)
+        return review_view_counter.flush(writer)
+
     def get_review_details(self, db: Session, review_id: int) -> Review:
-        review_user = aliased(models.User)
-        review_obj = db.query(self.model).outerjoin(models.Comment).outerjoin(models.Comment.user).\
-            options(joinedload(self.model.comments).joinedload(models.Comment.user)).\
-            outerjoin(models.ReviewKeyword).options(joinedload(self.model.keywords)).\
-            join(review_user, review_user.id == self.model.user_id).options(joinedload(self.model.user)).\
+        # 상세 응답에 필요한 리뷰 + 설문 + 키워드는 한번의 쿼리로, 작성자는 요청 단위 loader 로 가져온다. (댓글은 댓글 API 에서 따로 불러옴)
+        review_objs = db.query(self.model).options(lazyload(self.model.user)).\
+            outerjoin(models.SurveyA, models.SurveyA.id == self.model.survey_id).options(contains_eager(self.model.survey)).\
+            outerjoin(models.ReviewKeyword, models.ReviewKeyword.review_id == self.model.id).\
+            options(contains_eager(self.model.keywords)).\
             filter(self.model.is_delete == False).filter(self.model.id == review_id).\
-            filter(review_user.is_active == True).\
-            first()
-
-        if review_obj is None:
+            all()
+        review_objs = self.__with_active_authors(db, review_objs)
+        if not review_objs:
             raise HTTPException(404, "리뷰를 찾을 수 없습니다.")
-        return review_obj
+        return review_objs[0]
+
+    def get_review_details_by_ids(self, db: Session, ids: List[int]) -> List[Review]:
+        # 리뷰 + 설문은 join 한번, 키워드와 작성자(loader)는 IN 쿼리 한번씩으로 가져온다. 결과는 ids 순서대로, 없는 리뷰는 빠진다.
+        if not ids:
+            return []
+        review_objs = db.query(self.model).options(lazyload(self.model.user)).\
+            outerjoin(models.SurveyA, models.SurveyA.id == self.model.survey_id).options(contains_eager(self.model.survey)).\
+            options(selectinload(self.model.keywords)).\
+            filter(self.model.id.in_(ids)).filter(self.model.is_delete == False).all()
+        review_by_id = {review_obj.id: review_obj for review_obj in self.__with_active_authors(db, review_objs)}
+        return [review_by_id[review_id] for review_id in ids if review_id in review_by_id]
+
+    @staticmethod
+    def __with_active_authors(db: Session, review_objs: List[Review]) -> List[Review]:
+        # 작성자는 요청 단위 loader 로 작성자별 한번씩 불러온다. 세션에 올라온 작성자는 review.user 에서 다시 조회되지 않는다.
+        authors = {user.id: user for user in
+                   get_loader(db).load_many(models.User, [review_obj.user_id for review_obj in review_objs])}
+        return [review_obj for review_obj in review_objs
+                if review_obj.user_id in authors and authors[review_obj.user_id].is_active is True]
+
+    def profile_posts_query(self, db: Session, *, written_by: Optional[int] = None, liked_by: Optional[int] = None,
+                            commented_by: Optional[int] = None) -> Query:
+        """
+        프로필 글 목록(schemas.UserProfilePostResponse)에 필요한 컬럼만 가져오는 쿼리 (삭제된 리뷰 제외) </br>
+        written_by / liked_by / commented_by 중 하나로 회원이 쓴 / 좋아요 한 / 댓글 단 리뷰를 고른다.
+        좋아요/댓글 수는 컬렉션을 불러오지 않고 review 의 카운터를 사용한다.
+        """
+        query = db.query(
+            self.model.id, models.User.nickname, self.model.like_count, self.model.comment_count, self.model.created_at,
+            models.SurveyA.vaccine_round, models.SurveyA.vaccine_type, models.SurveyA.is_crossed
+        ).\
+            join(models.User, models.User.id == self.model.user_id).\
+            join(models.SurveyA, models.SurveyA.id == self.model.survey_id).\
+            filter(self.model.is_delete == False)
+        if written_by is not None:
+            query = query.filter(self.model.user_id == written_by)
+        if liked_by is not None:
+            query = query.join(models.UserLike, models.UserLike.review_id == self.model.id).\
+                filter(models.UserLike.user_id == liked_by)
+        if commented_by is not None:
+            query = query.filter(self.model.id.in_(
+                db.query(models.Comment.review_id).filter(models.Comment.user_id == commented_by)
+            ))
+        return query
+
+    def get_profile_posts(self, query: Query) -> List[Row]:
+        return query.order_by(self.model.id.desc()).all()
+
+    def get_profile_posts_paginated(self, query: Query, page_request: dict) -> dict:
+        # 최신 리뷰부터 review.id < cursor 조건으로 다음 페이지를 가져온다. (total 은 계산하지 않음)
+        cursor = page_request.get("cursor")
+        cursor_filter = self.model.id < decode_cursor(cursor, int)[0] if cursor else self.model.id
+        return keyset_paginated_query(
+            page_request,
+            query,
+            lambda x, limit: x.filter(cursor_filter).order_by(self.model.id.desc()).limit(limit).all(),
+            lambda row: encode_cursor(row.id),
+            count_mode=CountMode.NONE
+        )
 
     def get_reviews_by_user_id(self, db: Session, user_id: int) -> List[Review]:
         result = db.query(self.model).filter(self.model.user_id == user_id).filter(self.model.is_delete == False).order_by(self.model.created_at.desc()).all()
@@ -182,5 +257,30 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
     def get_reviews_has_comment(self, db: Session):
         return db.query(self.model).join(models.Comment).all()
 
+    def iter_export_rows(self, db: Session, *, since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> Iterator[Row]:
+        """
+        데이터 추출용 리뷰 + 설문 + 작성자 인구통계 row 를 서버 사이드 커서로 EXPORT_BATCH_SIZE 개씩 읽어온다. </br>
+        since 이상, until 미만의 작성 시각 기준이며, 삭제된 리뷰와 탈퇴한 회원의 리뷰는 제외한다.
+        """
+        query = db.query(
+            self.model.id.label("review_id"), self.model.created_at, self.model.updated_at, self.model.content,
+            self.model.like_count, self.model.comment_count, self.model.view_count,
+            self.model.user_id, models.User.gender, models.User.age.label("birth_year"),
+            models.SurveyA.vaccine_type, models.SurveyA.vaccine_round, models.SurveyA.is_crossed,
+            models.SurveyA.is_pregnant, models.SurveyA.is_underlying_disease, models.SurveyA.date_from,
+            models.SurveyA.data.label("survey_data")
+        ).\
+            join(models.SurveyA, models.SurveyA.id == self.model.survey_id).\
+            join(models.User, models.User.id == self.model.user_id).\
+            filter(self.model.is_delete == False).\
+            filter(models.User.is_active == True)
+        if since is not None:
+            query = query.filter(self.model.created_at >= since)
+        if until is not None:
+            query = query.filter(self.model.created_at < until)
+        # yield_per 는 stream_results 를 켜서 결과 전체를 메모리에 올리지 않는다.
+        return iter(query.order_by(self.model.id).yield_per(EXPORT_BATCH_SIZE))
+
 
 review = CRUDReview(Review)
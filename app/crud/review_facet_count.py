@@ -0,0 +1,116 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.review_facet_count import ReviewFacetCount
+from app.models.review_feed import ReviewFeed
+from app.schemas.review import ReviewParams
+from app.utils.review_index import FILTER_FIELDS, FACET_FIELDS
+from app.utils.user import calculate_birth_year_from_age, get_age_group
+
+
+def facet_key(values: Sequence[Any]) -> str:
+    # FILTER_FIELDS 순서의 값들을 문자열로 잇는다. (비어있는 값은 빈 문자열, bool 은 0/1 -> 마이그레이션의 raw 값과 같게)
+    def part(value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return str(int(value))
+        return str(getattr(value, "value", value))
+    return "|".join(part(value) for value in values)
+
+
+def count_facet_groups(rows: Iterable[Mapping[str, Any]], sign: int = 1) -> Counter:
+    # review_feed row (dict) 들을 FILTER_FIELDS 값 조합별로 센다.
+    groups = Counter()
+    for row in rows:
+        groups[tuple(row[field] for field in FILTER_FIELDS)] += sign
+    return groups
+
+
+def facet_counts_from_groups(groups: Iterable[Tuple[tuple, int]], filters: ReviewParams) -> Dict[str, Any]:
+    """
+    (FILTER_FIELDS 값 조합, 리뷰 수) 집계로 필터 항목별 {값: 리뷰 수} 를 계산한다. </br>
+    각 항목의 수는 그 항목을 제외한 나머지 필터를 적용한 결과 (ReviewFilterIndex.facet_counts 와 같은 결과)
+    """
+    birth_year_range = None
+    if filters.min_age and filters.max_age:
+        birth_year_range = (calculate_birth_year_from_age(filters.max_age),
+                            calculate_birth_year_from_age(filters.min_age))
+    wanted = {FILTER_FIELDS.index(field): getattr(filters, param)
+              for param, field in FACET_FIELDS.items() if getattr(filters, param) is not None}
+    birth_year_index = FILTER_FIELDS.index("birth_year")
+
+    counts: Dict[str, Any] = {"total": 0}
+    facets = {param: defaultdict(int) for param in FACET_FIELDS}
+    age_counts = defaultdict(int)
+    for values, count in groups:
+        birth_year = values[birth_year_index]
+        age_matched = birth_year_range is None or \
+            (birth_year is not None and birth_year_range[0] <= birth_year <= birth_year_range[1])
+        mismatched = [index for index, value in wanted.items() if values[index] != value]
+        if len(mismatched) > 1:
+            continue
+        if not mismatched:
+            if age_matched:
+                counts["total"] += count
+            if birth_year is not None:
+                age_counts[get_age_group(calculate_birth_year_from_age(birth_year))] += count
+        if not age_matched:
+            continue
+        # 다른 필터는 모두 맞고 이 항목만 다르거나(그 항목을 뺀 결과) 모두 맞는 경우에만 그 항목의 값으로 센다.
+        for param, field in FACET_FIELDS.items():
+            index = FILTER_FIELDS.index(field)
+            if not mismatched or mismatched == [index]:
+                facets[param][values[index]] += count
+    for param in FACET_FIELDS:
+        counts[param] = dict(facets[param])
+    counts["age_group"] = dict(age_counts)
+    return counts
+
+
+class CRUDReviewFacetCount(CRUDBase[ReviewFacetCount, BaseModel, BaseModel]):
+    def change(self, db: Session, *, removed: Iterable[Mapping[str, Any]] = (),
+               added: Iterable[Mapping[str, Any]] = ()) -> None:
+        # review_feed 에서 빠진 row 는 빼고 새로 들어간 row 는 더한다. (커밋은 호출하는 쪽에서)
+        groups = count_facet_groups(removed, sign=-1)
+        groups.update(count_facet_groups(added))
+        self.__upsert_counts(db, groups)
+
+    def rebuild(self, db: Session) -> None:
+        """
+        review_feed 전체를 다시 세서 집계 테이블을 새로 채운다. (python -m app.db.rebuild_symptom_stats) </br>
+        INSERT … SELECT … GROUP BY 한 문장으로 집계한다. facet_key 는 facet_key() 와 같게 SQL 에서 만든다.
+        (enum 은 이름 문자열, bool 은 0/1, 비어있는 값은 빈 문자열)
+        """
+        fields = [getattr(ReviewFeed, field) for field in FILTER_FIELDS]
+        key = func.concat_ws("|", *[func.ifnull(field, "") for field in fields])
+        db.query(self.model).delete(synchronize_session=False)
+        db.execute(insert(self.model).from_select(
+            FILTER_FIELDS + ("facet_key", "review_count"),
+            select(*fields, key, func.count(ReviewFeed.review_id)).group_by(*fields)
+        ))
+        db.commit()
+
+    def __upsert_counts(self, db: Session, groups: Counter) -> None:
+        values = [dict(zip(FILTER_FIELDS, key), facet_key=facet_key(key), review_count=count)
+                  for key, count in groups.items() if count]
+        if not values:
+            return
+        statement = insert(self.model)
+        db.execute(statement.on_duplicate_key_update(
+            review_count=self.model.review_count + statement.inserted.review_count), values)
+
+    def get_groups(self, db: Session) -> List[Tuple[tuple, int]]:
+        # 값 조합의 수는 리뷰 수와 상관없이 필터 값 종류의 곱 이하이므로 전부 읽어서 메모리에서 더한다.
+        return [(tuple(row[:-1]), row[-1]) for row in
+                db.query(*[getattr(self.model, field) for field in FILTER_FIELDS], self.model.review_count).
+                filter(self.model.review_count > 0).all()]
+
+
+review_facet_count = CRUDReviewFacetCount(ReviewFacetCount)
@@ -0,0 +1,402 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Integer, or_, and_, func, insert, case, cast
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.dialects.mysql import match
+
+from app import models
+from app.crud.base import CRUDBase
+from app.crud.review_facet_count import review_facet_count, facet_counts_from_groups
+from app.crud.symptom_stat import symptom_stat
+from app.models.review_feed import ReviewFeed, CONTENT_PREVIEW_LENGTH
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import Gender
+from app.schemas.review import ReviewParams
+from app.schemas.page_response import paginated_query, keyset_paginated_query, encode_cursor, decode_cursor, CountMode
+from app.utils.after_commit import on_commit
+from app.utils.cache import TTLCache
+from app.utils.review import get_symptom_candidates
+from app.utils.review_index import review_filter_index, iter_ids_desc, count_bits, FILTER_FIELDS, FACET_FIELDS
+from app.utils.trending import review_trending, TRENDING_WINDOW_DAYS
+from app.utils.user import calculate_birth_year_from_age, get_age_group
+
+# utils.user.get_age_group 의 연령대 구분
+AGE_GROUPS = ("0019", "2029", "3039", "4049", "5059", "6099")
+
+# 검색 결과 정렬/커서에 쓰는 관련도 정수 키의 배율 -> MATCH() 의 실수 점수는 json 을 거치면 반올림되어 같은 값 비교가 어긋날 수 있음
+RELEVANCE_SCALE = 1000000
+
+# MySQL ngram parser 의 ngram_token_size (기본값 2) -> 이보다 짧은 검색어는 FULLTEXT 인덱스로 찾을 수 없음
+NGRAM_TOKEN_SIZE = 2
+
+# 필터 조합(ReviewParams)별 리뷰 목록 total -> review_feed 가 갱신될 때 비워짐
+review_count_cache = TTLCache(ttl=60 * 5)
+
+# (필터 조합, page, cursor)별 비회원 기준 리뷰 목록 응답(json bytes) -> review_feed 가 갱신되거나 좋아요/댓글 수가 바뀔 때 비워짐
+review_page_cache = TTLCache(ttl=60, maxsize=512)
+
+
+def review_page_cache_key(page_request: dict, filters: ReviewParams) -> tuple:
+    # ReviewParams 는 pydantic 에서 enum/bool 값이 정규화되므로 json 그대로 키로 사용한다.
+    # cursor 방식에서는 page 값이 쓰이지 않으므로 키에서 뺀다.
+    cursor = page_request.get("cursor")
+    page = page_request.get("page") if cursor is None else None
+    return filters.json(), page, page_request.get("size"), cursor
+
+
+class CRUDReviewFeed(CRUDBase[ReviewFeed, BaseModel, BaseModel]):
+    def refresh(self, db: Session, *, review_ids: List[int]) -> None:
+        """
+        review / survey_a / user 의 현재 값으로 review_feed row 를 다시 만든다. (커밋은 호출하는 쪽에서) </br>
+        삭제된 리뷰나 탈퇴한 회원의 리뷰는 다시 만들어지지 않으므로 목록에서 빠진다.
+        설문이 없는 리뷰(survey_id 가 NULL)는 설문 항목을 비워둔 채로 목록에 남는다.
+        """
+        if not review_ids:
+            return
+        source_rows = db.query(
+            models.Review.id.label("review_id"), models.Review.user_id, models.User.nickname, models.User.gender,
+            models.User.age.label("birth_year"), models.SurveyA.vaccine_type, models.SurveyA.vaccine_round,
+            models.SurveyA.is_crossed, models.SurveyA.is_pregnant, models.SurveyA.is_underlying_disease,
+            models.SurveyA.data.label("survey_data"),
+            func.left(models.Review.content, CONTENT_PREVIEW_LENGTH).label("content_preview"),
+            models.Review.like_count, models.Review.comment_count
+        ).\
+            outerjoin(models.SurveyA, models.SurveyA.id == models.Review.survey_id).\
+            join(models.User, models.User.id == models.Review.user_id).\
+            filter(models.Review.id.in_(review_ids)).\
+            filter(models.Review.is_delete == False).\
+            filter(models.User.is_active == True).all()
+
+        feed_rows = []
+        for row in source_rows:
+            feed_row = row._asdict()
+            # 목록의 증상 미리보기 후보는 설문이 저장될 때 한번만 계산해둔다.
+            feed_row["symptom_candidates"] = get_symptom_candidates(feed_row.pop("survey_data"))
+            feed_rows.append(feed_row)
+
+        # 증상 통계/필터 항목별 리뷰 수는 빠지는 row 를 빼고 새 row 를 더해서 같은 트랜잭션에서 맞춘다.
+        removed_rows = self.__get_stat_rows(db, self.model.review_id.in_(review_ids))
+        db.query(self.model).filter(self.model.review_id.in_(review_ids)).delete(synchronize_session=False)
+        if feed_rows:
+            db.execute(insert(self.model), feed_rows)
+        symptom_stat.change(db, removed=removed_rows, added=feed_rows)
+        review_facet_count.change(db, removed=removed_rows, added=feed_rows)
+        on_commit(db, self.__apply_refresh, review_ids, source_rows)
+
+    @staticmethod
+    def __apply_refresh(review_ids: List[int], source_rows: List[Any]) -> None:
+        # 메모리의 목록 캐시/랭킹/필터 인덱스는 review_feed 가 커밋된 뒤에 맞춘다.
+        review_count_cache.clear()
+        review_page_cache.clear()
+        review_trending.remove(set(review_ids) - {row.review_id for row in source_rows})
+        if review_filter_index.loaded:
+            for review_id in review_ids:
+                review_filter_index.remove(review_id)
+            for row in source_rows:
+                review_filter_index.upsert(row)
+
+    def refresh_by_user_id(self, db: Session, *, user_id: int) -> None:
+        review_ids = [review_id for review_id, in
+                      db.query(models.Review.id).filter(models.Review.user_id == user_id).all()]
+        self.refresh(db, review_ids=review_ids)
+
+    def delete_by_user_id(self, db: Session, *, user_id: int) -> None:
+        removed_rows = self.__get_stat_rows(db, self.model.user_id == user_id)
+        review_ids = [row["review_id"] for row in removed_rows]
+        symptom_stat.change(db, removed=removed_rows)
+        review_facet_count.change(db, removed=removed_rows)
+        db.query(self.model).filter(self.model.user_id == user_id).delete(synchronize_session=False)
+        on_commit(db, self.__apply_refresh, review_ids, [])
+
+    def __get_stat_rows(self, db: Session, condition: Any) -> List[dict]:
+        # 집계 키(STAT_DIMENSIONS)는 모두 FILTER_FIELDS 에 포함되어 있다.
+        return [row._asdict() for row in db.query(
+            self.model.review_id, *[getattr(self.model, field) for field in FILTER_FIELDS],
+            self.model.symptom_candidates
+        ).filter(condition).all()]
+
+    def load_filter_index(self, db: Session) -> None:
+        # 서버 시작시 review_feed 전체로 필터 인덱스를 만든다. (settings.REVIEW_FILTER_INDEX_ENABLED)
+        review_filter_index.load(self.__get_filter_index_rows(db))
+
+    def __get_filter_index_rows(self, db: Session, review_ids: List[int] = None):
+        query = db.query(self.model.review_id, *[getattr(self.model, field) for field in FILTER_FIELDS])
+        if review_ids is not None:
+            query = query.filter(self.model.review_id.in_(review_ids))
+        return query.all()
+
+    def change_counts(self, db: Session, *, review_id: int, like_count: int = 0, comment_count: int = 0) -> None:
+        # review 의 카운트 컬럼과 같은 트랜잭션에서 증감한다.
+        db.query(self.model).filter(self.model.review_id == review_id).\
+            update({self.model.like_count: self.model.like_count + like_count,
+                    self.model.comment_count: self.model.comment_count + comment_count},
+                   synchronize_session=False)
+        on_commit(db, review_page_cache.clear)
+
+    def change_like_counts(self, db: Session, *, counts: Dict[int, int]) -> None:
+        # {review_id: 증감량} 을 UPDATE 한번으로 반영한다.
+        db.query(self.model).filter(self.model.review_id.in_(list(counts))).\
+            update({self.model.like_count: self.model.like_count + case(counts, value=self.model.review_id, else_=0)},
+                   synchronize_session=False)
+        on_commit(db, review_page_cache.clear)
+
+    def reconcile_trending(self, db: Session) -> None:
+        """
+        최근 TRENDING_WINDOW_DAYS 일 동안의 좋아요/댓글 기록과 리뷰 조회수로 인기 리뷰 점수를 다시 계산한다. </br>
+        이벤트 때마다 더해온 점수에서 생긴 오차(좋아요 취소, 반영 실패 등)를 바로잡는다. 목록에 노출되는 리뷰만 대상으로 한다.
+        """
+        since = datetime.now() - timedelta(days=TRENDING_WINDOW_DAYS)
+        # 읽는 동안 들어온 좋아요/댓글은 읽은 결과에 없을 수 있으므로 load 할 때 다시 반영되도록 모아둔다.
+        review_trending.begin_reload()
+        try:
+            likes = db.query(models.UserLike.review_id, models.UserLike.created_at).\
+                join(self.model, self.model.review_id == models.UserLike.review_id).\
+                filter(models.UserLike.created_at >= since).all()
+            comments = db.query(models.Comment.review_id, models.Comment.created_at).\
+                join(self.model, self.model.review_id == models.Comment.review_id).\
+                filter(models.Comment.is_delete == False).\
+                filter(models.Comment.created_at >= since).all()
+            # 조회수는 시각별 기록이 없으므로 처음 계산할 때(서버 시작)만 리뷰 작성 시각의 이벤트로 넣는다.
+            # 이후에는 조회수를 반영할 때 review_trending 에 더해온 조회 점수가 그대로 이어진다. (매 재계산마다 점수가 튀지 않도록)
+            views = []
+            if review_trending.loaded_at is None:
+                views = db.query(models.Review.id, models.Review.view_count, models.Review.created_at).\
+                    join(self.model, self.model.review_id == models.Review.id).\
+                    filter(models.Review.created_at >= since).\
+                    filter(models.Review.view_count > 0).all()
+        except Exception:
+            review_trending.cancel_reload()
+            raise
+        review_trending.load(
+            [(review_id, "like", 1, created_at) for review_id, created_at in likes] +
+            [(review_id, "comment", 1, created_at) for review_id, created_at in comments] +
+            [(review_id, "view", view_count, created_at) for review_id, view_count, created_at in views]
+        )
+
+    def get_trending(self, db: Session, *, limit: int) -> List[ReviewFeed]:
+        # 순위는 메모리의 review_trending 에서 바로 꺼내고, DB 에서는 해당 리뷰들의 review_feed row 만 PK 로 가져온다.
+        review_ids = [review_id for review_id, _ in review_trending.top(limit)]
+        if not review_ids:
+            return []
+        feeds = {feed.review_id: feed for feed in
+                 db.query(self.model).filter(self.model.review_id.in_(review_ids)).all()}
+        # 목록에서 빠진 리뷰(삭제 등)가 남아있었다면 랭킹에서도 뺀다.
+        review_trending.remove([review_id for review_id in review_ids if review_id not in feeds])
+        return [feeds[review_id] for review_id in review_ids if review_id in feeds]
+
+    def get_list_paginated(self, db: Session, page_request: dict, filters: ReviewParams,
+                           count_mode: CountMode = CountMode.EXACT) -> dict:
+        if not filters.q and review_filter_index.loaded:
+            return self.__get_list_from_filter_index(db, page_request, filters, count_mode)
+
+        query, relevance = self.__filter_query(db.query(self.model), filters)
+
+        count_options = dict(count_mode=count_mode, count_cache=review_count_cache, count_key=filters.json())
+        if relevance is not None:
+            return self.__get_search_result_paginated(page_request, query, relevance, count_options)
+
+        # cursor 가 넘어오면 OFFSET 대신 review_id < cursor 조건으로 다음 페이지를 가져온다.
+        cursor = page_request.get("cursor")
+        if cursor is not None:
+            cursor_filter = self.model.review_id < decode_cursor(cursor, int)[0] if cursor else self.model.review_id
+            return keyset_paginated_query(
+                page_request,
+                query,
+                lambda x, limit: x.filter(cursor_filter).order_by(self.model.review_id.desc()).limit(limit).all(),
+                lambda feed_obj: encode_cursor(feed_obj.review_id),
+                **count_options
+            )
+
+        return paginated_query(
+            page_request,
+            query,
+            lambda x, limit, offset: x.order_by(self.model.review_id.desc()).limit(limit).offset(offset).all(),
+            lambda feed_obj: encode_cursor(feed_obj.review_id),
+            **count_options
+        )
+
+    def __filter_query(self, query: Query, filters: ReviewParams) -> Tuple[Query, Any]:
+        # ReviewParams 의 조건을 review_feed 쿼리에 적용한다. 검색어가 FULLTEXT 로 처리되면 관련도 컬럼도 함께 반환
+        relevance = None
+        if filters.q and len(filters.q.strip()) >= NGRAM_TOKEN_SIZE:
+            # review.content 의 FULLTEXT(ngram) 인덱스로 검색하고 관련도 순으로 정렬한다.
+            relevance = match(models.Review.content, against=filters.q.strip()).in_natural_language_mode()
+            query = query.join(models.Review, models.Review.id == self.model.review_id)
+            filter_query = relevance
+        elif filters.q:
+            query = query.join(models.Review, models.Review.id == self.model.review_id)
+            filter_query = models.Review.content.contains(filters.q)
+        else:
+            filter_query = self.model.review_id
+
+        if filters.min_age and filters.max_age:
+            min_birth_year = calculate_birth_year_from_age(filters.min_age)
+            max_birth_year = calculate_birth_year_from_age(filters.max_age)
+            filter_age = self.model.birth_year.between(max_birth_year, min_birth_year)
+        else:
+            filter_age = self.model.review_id
+
+        if filters.gender:
+            filter_gender = self.model.gender == filters.gender
+        else:
+            filter_gender = self.model.review_id
+
+        if filters.vaccine_type:
+            filter_vaccine_type = self.model.vaccine_type == filters.vaccine_type
+        else:
+            filter_vaccine_type = self.model.review_id
+
+        if filters.is_crossed is None:
+            filter_is_crossed = self.model.review_id
+        else:
+            filter_is_crossed = self.model.is_crossed == filters.is_crossed
+
+        if filters.round:
+            filter_round = self.model.vaccine_round == filters.round
+        else:
+            filter_round = self.model.review_id
+
+        if filters.is_pregnant is None:
+            filter_is_pregnant = self.model.review_id
+        else:
+            filter_is_pregnant = self.model.is_pregnant == filters.is_pregnant
+
+        if filters.is_underlying_disease is None:
+            filter_is_underlying_disease = self.model.review_id
+        else:
+            filter_is_underlying_disease = self.model.is_underlying_disease == filters.is_underlying_disease
+
+        # review_feed 에는 목록에 노출되는 리뷰만 있으므로 삭제 여부/회원 활성 여부를 다시 거를 필요 없음
+        query = query.filter(filter_query).filter(filter_age).filter(filter_gender).filter(filter_vaccine_type).\
+            filter(filter_is_crossed).filter(filter_round).filter(filter_is_pregnant).\
+            filter(filter_is_underlying_disease)
+        return query, relevance
+
+    def get_facet_counts(self, db: Session, filters: ReviewParams) -> dict:
+        """
+        필터 항목별 {값: 리뷰 수} 를 계산한다. 각 항목의 수는 그 항목을 제외한 나머지 필터를 적용한 결과 </br>
+        필터 인덱스가 올라와 있으면 비트셋 교집합으로 세고, 아니면 미리 세어둔 review_facet_count 집계를 더한다. </br>
+        검색어(q)가 있는 경우에만 FULLTEXT 인덱스를 써야 하므로 review_feed 를 직접 집계한다. (결과는 필터 조합별로 캐싱)
+        """
+        if not filters.q and review_filter_index.loaded:
+            return self.__format_facet_counts(review_filter_index.facet_counts(filters))
+
+        cache_key = ("facets", filters.json())
+        counts = review_count_cache.get(cache_key)
+        if counts is None:
+            if filters.q:
+                counts = self.__count_search_facets(db, filters)
+            else:
+                counts = facet_counts_from_groups(review_facet_count.get_groups(db), filters)
+            counts = self.__format_facet_counts(counts)
+            review_count_cache.set(cache_key, counts)
+        return counts
+
+    def __count_search_facets(self, db: Session, filters: ReviewParams) -> dict:
+        counts = {"total": self.__filter_query(
+            db.query(func.count(self.model.review_id)).select_from(self.model), filters)[0].scalar()}
+        for param, field in FACET_FIELDS.items():
+            column = getattr(self.model, field)
+            query, _ = self.__filter_query(db.query(column, func.count(self.model.review_id)),
+                                           filters.copy(update={param: None}))
+            counts[param] = dict(query.group_by(column).all())
+        query, _ = self.__filter_query(db.query(self.model.birth_year, func.count(self.model.review_id)),
+                                       filters.copy(update={"min_age": None, "max_age": None}))
+        age_counts = defaultdict(int)
+        for birth_year, count in query.group_by(self.model.birth_year).all():
+            if birth_year is not None:
+                age_counts[get_age_group(calculate_birth_year_from_age(birth_year))] += count
+        counts["age_group"] = dict(age_counts)
+        return counts
+
+    @staticmethod
+    def __format_facet_counts(counts: dict) -> dict:
+        # 선택지가 모두 보이도록 0건인 값도 채우고, 키는 쿼리 파라미터에 그대로 쓸 수 있는 문자열로 바꾼다.
+        def facet_key(value) -> str:
+            if isinstance(value, bool):
+                return "true" if value else "false"
+            return getattr(value, "value", value)
+
+        choices = {
+            "gender": list(Gender),
+            "vaccine_type": list(VaccineType),
+            "round": list(VaccineRound),
+            "is_crossed": [True, False],
+            "is_pregnant": [True, False],
+            "is_underlying_disease": [True, False],
+        }
+        result = {"total": counts.get("total", 0)}
+        for param, values in choices.items():
+            found = {facet_key(value): count for value, count in counts.get(param, {}).items() if value is not None}
+            result[param] = {facet_key(value): found.get(facet_key(value), 0) for value in values}
+        result["age_group"] = {age_group: counts.get("age_group", {}).get(age_group, 0) for age_group in AGE_GROUPS}
+        return result
+
+    def __get_search_result_paginated(self, page_request: dict, query, relevance, count_options: dict) -> dict:
+        # 검색 결과는 (관련도 정수 키, id) 내림차순으로 정렬하고, 커서에도 두 값을 함께 담는다.
+        # 정렬과 커서 비교에 같은 정수 키를 쓰므로 관련도가 같거나 아주 가까운 리뷰도 빠지거나 반복되지 않는다.
+        relevance = cast(relevance * RELEVANCE_SCALE, Integer)
+        order_by = (relevance.desc(), self.model.review_id.desc())
+        cursor_of = lambda row: encode_cursor(int(row[1]), row[0].review_id)
+
+        cursor = page_request.get("cursor")
+        if cursor is not None:
+            if cursor:
+                last_relevance, last_id = decode_cursor(cursor, int, int)
+                cursor_filter = or_(relevance < last_relevance,
+                                    and_(relevance == last_relevance, self.model.review_id < last_id))
+            else:
+                cursor_filter = self.model.review_id
+            result = keyset_paginated_query(
+                page_request,
+                query,
+                lambda x, limit: x.add_columns(relevance).filter(cursor_filter).order_by(*order_by).limit(limit).all(),
+                cursor_of,
+                **count_options
+            )
+        else:
+            result = paginated_query(
+                page_request,
+                query,
+                lambda x, limit, offset: x.add_columns(relevance).order_by(*order_by).limit(limit).offset(offset).all(),
+                cursor_of,
+                **count_options
+            )
+        result["contents"] = [feed_obj for feed_obj, _ in result.get("contents")]
+        return result
+
+    def __get_list_from_filter_index(self, db: Session, page_request: dict, filters: ReviewParams,
+                                     count_mode: CountMode) -> dict:
+        # 필터 조합은 메모리의 비트셋으로 계산하고, DB 에서는 해당 페이지의 row 만 PK 로 가져온다.
+        bits = review_filter_index.resolve(filters)
+        size = page_request.get("size", 10)
+        cursor = page_request.get("cursor")
+        if cursor is not None:
+            page = None
+            before = decode_cursor(cursor, int)[0] if cursor else None
+            ids = iter_ids_desc(bits, before=before, limit=size + 1)
+        else:
+            page = page_request.get("page", 1)
+            ids = iter_ids_desc(bits, offset=(page - 1) * size, limit=size + 1)
+        has_next = len(ids) > size
+        ids = ids[:size]
+
+        rows = {row.review_id: row for row in db.query(self.model).filter(self.model.review_id.in_(ids)).all()} \
+            if ids else {}
+        contents = [rows[review_id] for review_id in ids if review_id in rows]
+        return {
+            "page_meta": {
+                "page": page,
+                "size": size,
+                "total": None if count_mode == CountMode.NONE else count_bits(bits),
+                "has_next": has_next,
+                "next_cursor": encode_cursor(ids[-1]) if has_next else None,
+            },
+            "contents": contents,
+        }
+
+
+review_feed = CRUDReviewFeed(ReviewFeed)
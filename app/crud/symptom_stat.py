@@ -0,0 +1,128 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.review_feed import ReviewFeed
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.symptom_stat import SymptomStat, SymptomStatTotal
+from app.models.users import Gender
+
+# 집계 키 (백신 종류, 차수, 성별, 출생연도) -> 하나라도 비어있는 리뷰(가입 정보가 없는 예전 회원 등)는 세지 않는다.
+STAT_DIMENSIONS = ("vaccine_type", "vaccine_round", "gender", "birth_year")
+
+# review_feed 의 symptom_candidates([[질문, 답변], ...]) 를 (리뷰, 질문, 번호 답변) row 로 펼쳐서 한 문장으로 집계한다. (MySQL 8 의 JSON_TABLE)
+# 답변은 번호 하나거나 번호/문자열 목록이므로 목록이면 원소마다(NESTED PATH), 아니면 답변 그대로 한 row 가 된다.
+# count_symptom_stats 와 같게 번호(INTEGER) 답변만, 리뷰 하나에서 같은 답변은 한번만 센다.
+REBUILD_SYMPTOM_STAT = text(f"""
+INSERT INTO symptom_stat ({", ".join(STAT_DIMENSIONS)}, question, answer, review_count, created_at, updated_at)
+SELECT {", ".join(STAT_DIMENSIONS)}, question, CAST(answer_json AS SIGNED), COUNT(DISTINCT review_id), NOW(), NOW()
+FROM (
+    SELECT {", ".join("review_feed." + dimension for dimension in STAT_DIMENSIONS)}, review_feed.review_id,
+           candidate.question, IFNULL(candidate.list_answer, candidate.answer) AS answer_json
+    FROM review_feed,
+         JSON_TABLE(review_feed.symptom_candidates, '$[*]' COLUMNS (
+             question VARCHAR(10) PATH '$[0]',
+             answer JSON PATH '$[1]',
+             NESTED PATH '$[1][*]' COLUMNS (list_answer JSON PATH '$')
+         )) AS candidate
+    WHERE {" AND ".join("review_feed." + dimension + " IS NOT NULL" for dimension in STAT_DIMENSIONS)}
+) AS answers
+WHERE JSON_TYPE(answer_json) IN ('INTEGER', 'UNSIGNED INTEGER')
+GROUP BY {", ".join(STAT_DIMENSIONS)}, question, CAST(answer_json AS SIGNED)
+""")
+
+
+def count_symptom_stats(rows: Iterable[Mapping[str, Any]], sign: int = 1) -> Tuple[Counter, Counter]:
+    """
+    review_feed row (dict) 들의 설문 답변을 세어 (답변별 수, 리뷰 수) Counter 를 반환한다. </br>
+    답변은 symptom_candidates 의 번호 답변만 센다. (자유 입력 문자열은 통계에서 제외)
+    """
+    stats, totals = Counter(), Counter()
+    for row in rows:
+        dimensions = tuple(row[dimension] for dimension in STAT_DIMENSIONS)
+        if None in dimensions:
+            continue
+        totals[dimensions] += sign
+        for question, answers in row["symptom_candidates"] or []:
+            for answer in set(answers if isinstance(answers, list) else [answers]):
+                if isinstance(answer, int) and not isinstance(answer, bool):
+                    stats[dimensions + (question, answer)] += sign
+    return stats, totals
+
+
+class CRUDSymptomStat(CRUDBase[SymptomStat, BaseModel, BaseModel]):
+    def change(self, db: Session, *, removed: Iterable[Mapping[str, Any]] = (),
+               added: Iterable[Mapping[str, Any]] = ()) -> None:
+        """
+        review_feed 에서 빠진 row 는 빼고 새로 들어간 row 는 더한다. (커밋은 호출하는 쪽에서) </br>
+        같은 리뷰가 수정된 경우 빠진 row 와 들어간 row 가 상쇄되어 바뀐 답변만 반영된다.
+        """
+        removed_stats, removed_totals = count_symptom_stats(removed, sign=-1)
+        added_stats, added_totals = count_symptom_stats(added)
+        removed_stats.update(added_stats)
+        removed_totals.update(added_totals)
+        self.__upsert_counts(db, SymptomStat, STAT_DIMENSIONS + ("question", "answer"), removed_stats)
+        self.__upsert_counts(db, SymptomStatTotal, STAT_DIMENSIONS, removed_totals)
+
+    def rebuild(self, db: Session) -> None:
+        """
+        review_feed 전체를 다시 세서 집계 테이블을 새로 채운다. (python -m app.db.rebuild_symptom_stats) </br>
+        review_feed 를 앱으로 읽어오지 않고 테이블마다 INSERT … SELECT … GROUP BY 한 문장으로 집계한다.
+        """
+        dimensions = [getattr(ReviewFeed, dimension) for dimension in STAT_DIMENSIONS]
+        db.query(SymptomStat).delete(synchronize_session=False)
+        db.query(SymptomStatTotal).delete(synchronize_session=False)
+        db.execute(REBUILD_SYMPTOM_STAT)
+        db.execute(insert(SymptomStatTotal).from_select(
+            STAT_DIMENSIONS + ("review_count",),
+            select(*dimensions, func.count(ReviewFeed.review_id)).
+            where(*[dimension.isnot(None) for dimension in dimensions]).group_by(*dimensions)
+        ))
+        db.commit()
+
+    @staticmethod
+    def __upsert_counts(db: Session, model: Any, columns: Tuple[str, ...], counts: Counter) -> None:
+        values = [dict(zip(columns, key), review_count=count) for key, count in counts.items() if count]
+        if not values:
+            return
+        statement = insert(model)
+        db.execute(statement.on_duplicate_key_update(review_count=model.review_count + statement.inserted.review_count),
+                   values)
+
+    def get_stats(self, db: Session, *, vaccine_type: Optional[VaccineType] = None,
+                  vaccine_round: Optional[VaccineRound] = None, gender: Optional[Gender] = None,
+                  min_birth_year: Optional[int] = None, max_birth_year: Optional[int] = None,
+                  question: Optional[str] = None) -> Dict[str, Any]:
+        # 집계 테이블의 PK 앞부분(백신 종류, 차수, 성별)으로 범위를 좁혀서 더하기만 한다.
+        def filter_dimensions(query, model):
+            if vaccine_type is not None:
+                query = query.filter(model.vaccine_type == vaccine_type)
+            if vaccine_round is not None:
+                query = query.filter(model.vaccine_round == vaccine_round)
+            if gender is not None:
+                query = query.filter(model.gender == gender)
+            if min_birth_year is not None:
+                query = query.filter(model.birth_year >= min_birth_year)
+            if max_birth_year is not None:
+                query = query.filter(model.birth_year <= max_birth_year)
+            return query
+
+        total = filter_dimensions(db.query(func.sum(SymptomStatTotal.review_count)), SymptomStatTotal).scalar()
+        query = filter_dimensions(
+            db.query(self.model.question, self.model.answer, func.sum(self.model.review_count)), self.model
+        )
+        if question is not None:
+            query = query.filter(self.model.question == question)
+        questions: Dict[str, Dict[int, int]] = {}
+        for stat_question, answer, count in query.group_by(self.model.question, self.model.answer).all():
+            if count:
+                questions.setdefault(stat_question, {})[answer] = int(count)
+        return {"total": int(total or 0), "questions": questions}
+
+
+symptom_stat = CRUDSymptomStat(SymptomStat)
@@ -8,15 +8,23 @@ from fastapi.encoders import jsonable_encoder
 from app import crud, models, schemas
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
+from app.crud.review import review_detail_cache
 from app.models.users import User, JoinSurveyCode, SnsProviderType, UserKeyword
 from app.schemas.user import UserCreate, UserUpdate, SNSUserCreate, OauthIn
 from app.schemas.keyword import UserKeywordCreate
 from app.schemas.survey import SurveyType, SurveyCreate, SurveyA, SurveyB, SurveyC
 from app.schemas.response import BaseResponse
+from app.utils.after_commit import on_commit
+from app.utils.cache import TTLCache
+from app.utils.etag import bump_all_versions, user_profile_versions
+from app.utils.loader import get_loader
 from app.utils.user import nickname_randomizer, character_image_randomizer, character_images
 
 logger = logging.getLogger('ddakkm_logger')
 
+# 인증된 회원의 스냅샷 (user_id -> schemas.CurrentUser), 회원 정보 쓰기 경로에서 지운다.
+principal_cache = TTLCache(ttl=60, maxsize=4096)
+
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     # TODO : nickname_randomizer 실행 전 이메일 중복등 validation 필요
@@ -37,6 +45,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             fcm_token=obj_in.fcm_token,
         )
         db.add(db_obj)
+        db.flush()
+        crud.user_stats.refresh_profile(db, user_id=db_obj.id)
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -58,6 +68,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             fcm_token=oauth_in.fcm_token,
         )
         db.add(db_obj)
+        db.flush()
+        crud.user_stats.refresh_profile(db, user_id=db_obj.id)
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -110,14 +122,36 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 data=survey_create_schema, user_id=user_id, is_join_survey=True
             ))
 
-        # 유저 정보 업데이트
-        db_obj = db.query(self.model).filter(self.model.id == user_id).first()
+        # 유저 정보 업데이트 (핸들러에서 이미 불러온 회원이면 다시 조회하지 않음)
+        db_obj = get_loader(db).load(self.model, user_id)
         db_obj.join_survey_code = survey_in.survey_type
         db.add(db_obj)
+        crud.user_stats.refresh_profile(db, user_id=user_id)
+        on_commit(db, user_profile_versions.bump, user_id)
         db.commit()
+        principal_cache.delete(user_id)
         db.refresh(db_obj)
         return db_obj
 
+    def is_active_user(self, db: Session, *, user_id: int) -> bool:
+        # get 과 달리 설문(survey_a/b/c)을 join 하지 않고 탈퇴 여부만 확인한다.
+        return db.query(self.model.id).filter(self.model.id == user_id).filter(self.model.is_active == True).\
+            first() is not None
+
+    def get_principal(self, db: Session, *, user_id: int) -> Optional[schemas.CurrentUser]:
+        # 인증마다 get 으로 설문(survey_a/b/c)까지 join 하지 않도록 필요한 컬럼만 조회해서 캐시해둔다.
+        principal = principal_cache.get(user_id)
+        if principal is None:
+            row = db.query(
+                self.model.id, self.model.nickname, self.model.is_super, self.model.is_active,
+                self.model.agree_keyword_push, self.model.agree_activity_push
+            ).filter(self.model.id == user_id).first()
+            if row is None:
+                return None
+            principal = schemas.CurrentUser.from_orm(row)
+            principal_cache.set(user_id, principal)
+        return principal
+
     def delete_by_user_id(self, db: Session, *, user_id: int) -> BaseResponse:
         user = db.query(self.model).filter(self.model.id == user_id).first()
         message = f"user from {user.sns_provider} | user_id: {user_id} \n is deleted" \
@@ -136,11 +170,17 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             # db.query(models.SurveyA).filter(models.SurveyA.user_id == user_id).delete()
             # db.query(models.SurveyB).filter(models.SurveyB.user_id == user_id).delete()
             # db.query(models.SurveyC).filter(models.SurveyC.user_id == user_id).delete()
+            crud.review_feed.delete_by_user_id(db, user_id=user_id)
+            crud.user_stats.delete_by_user_id(db, user_id=user_id)
             db.delete(user)
             db.commit()
+            principal_cache.delete(user_id)
+            review_detail_cache.clear()
+            bump_all_versions()
             return BaseResponse(status="ok", object=user_id, message=message)
         except Exception as e:
             logger.warning(f"Unknown Error Occured: {e}")
+            db.rollback()
             return BaseResponse(status="failed", object=user_id, error=str(e))
 
     def soft_delete_by_user_id(self, db: Session, user_id: int) -> BaseResponse:
@@ -150,8 +190,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user.updated_at = now
         user.sns_id = None
         db.add(user)
+        # 탈퇴한 회원의 리뷰는 목록에서 빠지고 상세 조회도 되지 않는다.
+        crud.review_feed.delete_by_user_id(db, user_id=user_id)
+        crud.user_stats.refresh_profile(db, user_id=user_id)
         db.commit()
+        principal_cache.delete(user_id)
         db.refresh(user)
+        review_detail_cache.clear()
+        bump_all_versions()
         return BaseResponse(message=f"유저 #{user.id}가 비활성화 되었습니다.", object=user_id)
 
     def delete_fcm_token(self, db: Session, user_id: int) -> BaseResponse:
@@ -161,6 +207,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user.updated_at = now
         db.add(user)
         db.commit()
+        principal_cache.delete(user_id)
         db.refresh(user)
         return BaseResponse(message=f"유저 #{user.id}가 로그아웃하였습니다. fcm_token을 삭제합니다.", object=user_id)
 
@@ -170,6 +217,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             current_user.agree_keyword_push = True
             db.add(current_user)
             db.commit()
+            principal_cache.delete(current_user.id)
             db.refresh(current_user)
             return schemas.BaseResponse(
                 object=current_user.id, message=f"유저 ID : #{current_user.id}의 키워드 알림 수신 여부가 \"동의\"로 변경되었습니다."
@@ -178,6 +226,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             current_user.agree_keyword_push = False
             db.add(current_user)
             db.commit()
+            principal_cache.delete(current_user.id)
             db.refresh(current_user)
             return schemas.BaseResponse(
                 object=current_user.id, message=f"유저 ID : #{current_user.id}의 키워드 알림 수신 여부가 \"거부\"로 변경되었습니다."
@@ -189,6 +238,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             current_user.agree_activity_push = True
             db.add(current_user)
             db.commit()
+            principal_cache.delete(current_user.id)
             db.refresh(current_user)
             return schemas.BaseResponse(
                 object=current_user.id, message=f"유저 ID : #{current_user.id}의 활동 알림 수신 여부가 \"동의\"로 변경되었습니다."
@@ -197,6 +247,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             current_user.agree_activity_push = False
             db.add(current_user)
             db.commit()
+            principal_cache.delete(current_user.id)
             db.refresh(current_user)
             return schemas.BaseResponse(
                 object=current_user.id, message=f"유저 ID : #{current_user.id}의 활동 알림 수신 여부가 \"거부\"로 변경되었습니다."
@@ -1,50 +1,64 @@
+from typing import Dict, List, Set
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from app import crud, schemas
-from app.crud.base import CRUDBase
-from app.models.users import User
+from app import crud, models, schemas
+from app.core.config import settings
+from app.crud.base import CRUDBase, run_with_deadlock_retry
+from app.schemas.user import CurrentUser
 from app.models.user_comment_like import UserCommentLike
 from app.schemas.user_comment_like import UserCommentLikeCreate, UserCommentLikeUpdate
+from app.utils.counter_buffer import CounterBuffer
+from app.utils.etag import comment_list_versions
+
+# LIKE_COUNT_WRITE_COMBINING 일 때 아직 comment.like_count 에 반영하지 않은 {comment_id: 증감량}
+comment_like_count_buffer = CounterBuffer()
 
 
 class CRUDUserCommentLike(CRUDBase[UserCommentLike, UserCommentLikeCreate, UserCommentLikeUpdate]):
-    def change_user_comment_like_status(self, db: Session, current_user: User, comment_id: int) -> schemas.BaseResponse:
-        comment = crud.comment.get_comment(db, id=comment_id)
-        if not comment:
+    def change_user_comment_like_status(self, db: Session, current_user: CurrentUser, comment_id: int) -> schemas.BaseResponse:
+        review_id = crud.comment.get_review_id_of_comment(db, comment_id=comment_id)
+        if review_id is None:
             raise HTTPException(404, "좋아요 할 댓글을 찾을 수 없습니다.")
 
-        # 이미 좋아요 한 상태면 좋아요 기록 삭제
-        check_like = db.query(self.model).\
-            filter(self.model.user_id == current_user.id).filter(self.model.comment_id == comment_id).first()
-        if check_like:
-            db.delete(check_like)
-            comment.like_count -= 1
-            db.add(comment)
+        # 좋아요 기록이 있으면 삭제, 없으면 생성하고 댓글의 좋아요 수를 같은 트랜잭션에서 DB 에서 직접 증감
+        def toggle() -> int:
+            amount = self.toggle(db, user_id=current_user.id, comment_id=comment_id)
+            if amount and not settings.LIKE_COUNT_WRITE_COMBINING:
+                crud.comment.change_like_counts(db, counts={comment_id: amount})
             db.commit()
-            db.refresh(comment)
-            response = schemas.BaseResponse(
-                object=comment.review_id, message=f"리뷰 ID : #{comment.review_id}의 댓글 ID : #{comment_id}에 대해 유저 ID : #{current_user.id}가 좋아요를 취소했습니다."
+            return amount
+        amount = run_with_deadlock_retry(db, toggle)
+        if amount and settings.LIKE_COUNT_WRITE_COMBINING:
+            comment_like_count_buffer.add(comment_id, amount)
+        if amount:
+            comment_list_versions.bump(review_id)
+
+        if amount < 0:
+            return schemas.BaseResponse(
+                object=review_id, message=f"리뷰 ID : #{review_id}의 댓글 ID : #{comment_id}에 대해 유저 ID : #{current_user.id}가 좋아요를 취소했습니다."
             )
-            return response
-
-        # 좋아요 안한 상태면 좋아요 기록 생성
-        else:
-            db_obj = self.model(user_id=current_user.id, comment_id=comment_id)
-            comment.like_count += 1
-            db.add(comment)
-            db.add(db_obj)
+        return schemas.BaseResponse(
+            object=review_id, message=f"리뷰 ID : #{review_id}의 댓글 ID : #{comment_id}에 대해 유저 ID : #{current_user.id}가 좋아요하였습니다."
+        )
+
+    def flush_like_counts(self, db: Session) -> int:
+        # LIKE_COUNT_WRITE_COMBINING 일 때 모아둔 댓글 좋아요 수 증감을 한번에 반영한다.
+        def writer(counts: Dict[int, int]) -> None:
+            crud.comment.change_like_counts(db, counts=counts)
             db.commit()
-            db.refresh(db_obj)
-            response = schemas.BaseResponse(
-                object=comment.review_id, message=f"리뷰 ID : #{comment.review_id}의 댓글 ID : #{comment_id}에 대해 유저 ID : #{current_user.id}가 좋아요하였습니다."
-            )
-            return response
+            for review_id, in db.query(models.Comment.review_id).filter(models.Comment.id.in_(list(counts))).distinct().all():
+                comment_list_versions.bump(review_id)
+        return comment_like_count_buffer.flush(writer)
 
-    def get_comment_id_by_user_id(self, db: Session, user_id: int):
-        result = db.query(self.model.comment_id).\
-            filter(self.model.user_id == user_id).group_by(self.model.comment_id).all()
-        return result
+    def get_liked_comment_ids(self, db: Session, *, user_id: int, comment_ids: List[int]) -> Set[int]:
+        # 화면에 내려가는 댓글들 중 좋아요 한 댓글 id 만 (user_id, comment_id) PK 로 조회한다.
+        if not comment_ids:
+            return set()
+        return {comment_id for comment_id, in
+                db.query(self.model.comment_id).filter(self.model.user_id == user_id).
+                filter(self.model.comment_id.in_(comment_ids)).all()}
 
 
 user_comment_like = CRUDUserCommentLike(UserCommentLike)
@@ -1,58 +1,80 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app import crud, schemas
-from app.crud.base import CRUDBase
-from app.models.users import User
+from app.core.config import settings
+from app.crud.base import CRUDBase, run_with_deadlock_retry
+from app.schemas.user import CurrentUser
 from app.models.user_like import UserLike
 from app.schemas.user_like import UserCreate, UserUpdate
+from app.utils.counter_buffer import CounterBuffer
+from app.utils.etag import review_versions, user_profile_versions
+from app.utils.trending import review_trending
+
+# LIKE_COUNT_WRITE_COMBINING 일 때 아직 review.like_count 에 반영하지 않은 {review_id: 증감량}
+review_like_count_buffer = CounterBuffer()
 
 
 class CRUDUserLike(CRUDBase[UserLike, UserCreate, UserUpdate]):
-    def change_user_like_review_status(self, db: Session, current_user: User, review_id: int) -> schemas.BaseResponse:
-        review = crud.review.get_review(db, id=review_id)
-        if not review:
+    def change_user_like_review_status(self, db: Session, current_user: CurrentUser, review_id: int) -> schemas.BaseResponse:
+        if not crud.review.is_active_review(db, review_id=review_id):
             raise HTTPException(404, "좋아요 할 리뷰를 찾을 수 없습니다.")
 
-        # 이미 좋아요 한 상태면 좋아요 기록 삭제
-        check_like = db.query(self.model).\
-            filter(self.model.user_id == current_user.id).filter(self.model.review_id == review_id).first()
-        if check_like:
-            db.delete(check_like)
-            review.like_count -= 1
-            db.add(review)
+        # 좋아요 기록이 있으면 삭제, 없으면 생성하고 리뷰/회원의 좋아요 수를 같은 트랜잭션에서 DB 에서 직접 증감
+        def toggle() -> Tuple[int, Optional[datetime]]:
+            # 좋아요 취소는 인기 점수에서 원래 좋아요 시각의 가중치만큼 빼야 하므로 지우기 전에 시각을 읽어둔다.
+            liked_at = db.query(self.model.created_at).filter(self.model.user_id == current_user.id).\
+                filter(self.model.review_id == review_id).scalar()
+            amount = self.toggle(db, user_id=current_user.id, review_id=review_id)
+            if amount:
+                crud.user_stats.change(db, user_id=current_user.id, like_count=amount)
+            if amount and not settings.LIKE_COUNT_WRITE_COMBINING:
+                crud.review.change_like_counts(db, counts={review_id: amount})
             db.commit()
-            db.refresh(review)
-            response = schemas.BaseResponse(
+            return amount, liked_at
+        amount, liked_at = run_with_deadlock_retry(db, toggle)
+        if amount and settings.LIKE_COUNT_WRITE_COMBINING:
+            review_like_count_buffer.add(review_id, amount)
+        if amount:
+            review_trending.record(review_id, "like", amount,
+                                   at=liked_at.timestamp() if amount < 0 and liked_at is not None else None)
+            # 좋아요 수를 모아서 반영하는 경우에도 요청한 회원의 좋아요 여부는 바로 바뀐다.
+            review_versions.bump(review_id)
+            user_profile_versions.bump(current_user.id)
+
+        if amount < 0:
+            return schemas.BaseResponse(
                 object=review_id, message=f"리뷰 ID : #{review_id}에 대해 회원 ID : #{current_user.id}가 좋아요를 취소했습니다."
             )
-            return response
-
-        # 좋아요 안한 상태면 좋아요 기록 생성
-        else:
-            db_obj = self.model(user_id=current_user.id, review_id=review_id)
-            review.like_count += 1
-            db.add(review)
-            db.add(db_obj)
+        return schemas.BaseResponse(
+            object=review_id, message=f"리뷰 ID : #{review_id}에 대해 회원 ID : #{current_user.id}가 좋아요하였습니다."
+        )
+
+    def flush_like_counts(self, db: Session) -> int:
+        # LIKE_COUNT_WRITE_COMBINING 일 때 모아둔 리뷰 좋아요 수 증감을 한번에 반영한다.
+        def writer(counts: Dict[int, int]) -> None:
+            crud.review.change_like_counts(db, counts=counts)
             db.commit()
-            db.refresh(db_obj)
-            response = schemas.BaseResponse(
-                object=review_id, message=f"리뷰 ID : #{review_id}에 대해 회원 ID : #{current_user.id}가 좋아요하였습니다."
-            )
-            return response
+        return review_like_count_buffer.flush(writer)
 
-    def get_like_review_list_by_current_user(self, db: Session, current_user: User):
+    def get_like_review_list_by_current_user(self, db: Session, current_user: CurrentUser) -> List[int]:
         return [review_id_set[0] for review_id_set
                 in db.query(self.model.review_id).filter(self.model.user_id == current_user.id).all()]
 
+    def get_liked_review_ids(self, db: Session, *, user_id: int, review_ids: List[int]) -> Set[int]:
+        # 화면에 내려가는 리뷰들 중 좋아요 한 리뷰 id 만 (user_id, review_id) PK 로 조회한다.
+        if not review_ids:
+            return set()
+        return {review_id for review_id, in
+                db.query(self.model.review_id).filter(self.model.user_id == user_id).
+                filter(self.model.review_id.in_(review_ids)).all()}
+
     def get_like_counts_by_user_id(self, db: Session, user_id: int) -> int:
         counts = db.query(self.model).filter(self.model.user_id == user_id).count()
         return counts
 
-    def get_review_id_by_user_id(self, db: Session, user_id: int):
-        result = db.query(self.model.review_id).\
-            filter(self.model.user_id == user_id).group_by(self.model.review_id).all()
-        return result
-
 
 user_like = CRUDUserLike(UserLike)
@@ -0,0 +1,137 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+
+from app.crud.base import CRUDBase, run_with_deadlock_retry
+from app.models.comments import Comment
+from app.models.reviews import Review
+from app.models.surveys import SurveyA
+from app.models.user_like import UserLike
+from app.models.user_stats import UserStats
+from app.models.users import User, JoinSurveyCode
+
+COUNT_COLUMNS = ("post_count", "comment_count", "like_count")
+PROFILE_COLUMNS = ("latest_review_id", "nickname", "character_image", "join_survey_code", "is_active",
+                   "vaccine_type", "vaccine_round", "is_crossed")
+
+# 다시 셀 때 한 문장에서 맞추는 회원 id 구간 크기 (원본 row 에 거는 잠금을 짧게 유지)
+RECONCILE_BATCH_SIZE = 1000
+
+
+def profile_source(*conditions: Any) -> Select:
+    """
+    user 에서 user_stats 의 프로필 정보(PROFILE_COLUMNS)를 뽑는 SELECT </br>
+    접종 정보는 가입설문이 A 이면 가입설문(survey_a.is_join_survey), 아니면 삭제되지 않은 가장 최근 리뷰의 설문에서 가져온다.
+    """
+    latest_review = aliased(Review)
+    latest_survey = aliased(SurveyA)
+    join_survey = aliased(SurveyA)
+    latest_review_id = select(func.max(Review.id)).where(Review.user_id == User.id).\
+        where(Review.is_delete == False).correlate(User).scalar_subquery()
+    join_survey_id = select(func.max(SurveyA.id)).where(SurveyA.user_id == User.id).\
+        where(SurveyA.is_join_survey == True).correlate(User).scalar_subquery()
+
+    def vaccine_info(column: str) -> Any:
+        return case((User.join_survey_code == JoinSurveyCode.A, getattr(join_survey, column)),
+                    else_=getattr(latest_survey, column)).label(column)
+
+    return select(
+        User.id.label("user_id"), latest_review.id.label("latest_review_id"), User.nickname, User.character_image,
+        User.join_survey_code, User.is_active,
+        vaccine_info("vaccine_type"), vaccine_info("vaccine_round"), vaccine_info("is_crossed")
+    ).select_from(User).\
+        outerjoin(latest_review, latest_review.id == latest_review_id).\
+        outerjoin(latest_survey, latest_survey.id == latest_review.survey_id).\
+        outerjoin(join_survey, join_survey.id == join_survey_id).\
+        where(*conditions)
+
+
+class CRUDUserStats(CRUDBase[UserStats, BaseModel, BaseModel]):
+    def change(self, db: Session, *, user_id: int, post_count: int = 0, comment_count: int = 0, like_count: int = 0) -> None:
+        """
+        회원의 활동 수를 DB 에서 직접 증감한다. (커밋은 호출하는 쪽에서) </br>
+        row 가 없으면 만든다. 프로필 정보는 refresh_profile 로 따로 맞춘다.
+        """
+        counts = dict(post_count=post_count, comment_count=comment_count, like_count=like_count)
+        updates = {column: getattr(self.model, column) + amount for column, amount in counts.items() if amount}
+        if not updates:
+            return
+        statement = insert(self.model).values(user_id=user_id, **{column: max(amount, 0) for column, amount in counts.items()})
+        db.execute(statement.on_duplicate_key_update(**updates))
+
+    def refresh_profile(self, db: Session, *, user_id: int) -> None:
+        """
+        user / 가입설문 / 가장 최근 리뷰의 현재 값으로 회원의 프로필 정보를 다시 채운다. (커밋은 호출하는 쪽에서) </br>
+        ORM 으로 바꾼 user 값은 flush 된 뒤에 읽힌다.
+        """
+        db.flush()
+        statement = insert(self.model).from_select(("user_id",) + PROFILE_COLUMNS, profile_source(User.id == user_id))
+        db.execute(statement.on_duplicate_key_update(
+            **{column: getattr(statement.inserted, column) for column in PROFILE_COLUMNS}
+        ))
+
+    def get_profile(self, db: Session, *, user_id: int) -> Optional[UserStats]:
+        """
+        프로필 화면에 필요한 값(활동 수, 닉네임, 캐릭터, 접종 정보)을 user_stats PK 조회 한번으로 가져온다. </br>
+        없는 회원이나 탈퇴한 회원은 None
+        """
+        stats = db.query(self.model).filter(self.model.user_id == user_id).first()
+        if stats is None:
+            # 아직 row 가 없는 회원(다음 reconcile 전)은 user 에서 채워둔다.
+            self.refresh_profile(db, user_id=user_id)
+            db.commit()
+            stats = db.query(self.model).filter(self.model.user_id == user_id).first()
+        if stats is None or not stats.is_active:
+            return None
+        return stats
+
+    def delete_by_user_id(self, db: Session, *, user_id: int) -> None:
+        db.query(self.model).filter(self.model.user_id == user_id).delete(synchronize_session=False)
+
+    def reconcile(self, db: Session) -> None:
+        """
+        리뷰/댓글/좋아요/회원 테이블로 user_stats 를 다시 계산해서 덮어쓴다. </br>
+        회원 id 구간마다 INSERT … SELECT … ON DUPLICATE KEY UPDATE 한 문장으로 처리한다.
+        InnoDB(REPEATABLE READ)의 INSERT … SELECT 는 읽는 원본 row 에 공유 잠금을 건다. 그래서 집계 중인 회원의 리뷰/댓글/좋아요 쓰기와
+        user_stats 증감은 이 문장이 끝날 때까지 기다렸다가 새 값 위에 더해지고, 먼저 진행 중이던 쓰기는 커밋된 뒤에 집계된다.
+        """
+        max_user_id = db.query(func.max(User.id)).scalar() or 0
+        for start in range(0, max_user_id + 1, RECONCILE_BATCH_SIZE):
+            end = start + RECONCILE_BATCH_SIZE - 1
+
+            def job() -> None:
+                db.execute(self.__reconcile_statement(start, end))
+                db.commit()
+            run_with_deadlock_retry(db, job)
+        # 지워진 회원의 row 정리
+        db.query(self.model).filter(self.model.user_id.notin_(select(User.id))).delete(synchronize_session=False)
+        db.commit()
+
+    def __reconcile_statement(self, start: int, end: int) -> Any:
+        posts = select(Review.user_id, func.count(Review.id).label("post_count")).\
+            where(Review.user_id.between(start, end)).where(Review.is_delete == False).\
+            group_by(Review.user_id).subquery()
+        comments = select(Comment.user_id, func.count(Comment.id).label("comment_count")).\
+            where(Comment.user_id.between(start, end)).where(Comment.is_delete == False).\
+            group_by(Comment.user_id).subquery()
+        likes = select(UserLike.user_id, func.count(UserLike.review_id).label("like_count")).\
+            where(UserLike.user_id.between(start, end)).\
+            group_by(UserLike.user_id).subquery()
+        source = profile_source(User.id.between(start, end)).add_columns(
+            func.coalesce(posts.c.post_count, 0), func.coalesce(comments.c.comment_count, 0),
+            func.coalesce(likes.c.like_count, 0)
+        ).\
+            outerjoin(posts, posts.c.user_id == User.id).\
+            outerjoin(comments, comments.c.user_id == User.id).\
+            outerjoin(likes, likes.c.user_id == User.id)
+        columns = ("user_id",) + PROFILE_COLUMNS + COUNT_COLUMNS
+        statement = insert(self.model).from_select(columns, source)
+        return statement.on_duplicate_key_update(
+            **{column: getattr(statement.inserted, column) for column in PROFILE_COLUMNS + COUNT_COLUMNS}
+        )
+
+user_stats = CRUDUserStats(UserStats)
@@ -1,6 +1,10 @@
 from app.db.base_class import Base                                      # noqa
 from app.models.comments import Comment                                 # noqa
 from app.models.reviews import Review, ReviewKeyword                    # noqa
+from app.models.review_feed import ReviewFeed                           # noqa
+from app.models.review_facet_count import ReviewFacetCount              # noqa
+from app.models.symptom_stat import SymptomStat, SymptomStatTotal       # noqa
 from app.models.surveys import SurveyA, SurveyB, SurveyC                # noqa
 from app.models.user_like import UserLike                               # noqa
 from app.models.users import User, UserKeyword                          # noqa
+from app.models.user_stats import UserStats                             # noqa
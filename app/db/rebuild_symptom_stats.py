@@ -0,0 +1,17 @@
+# 증상 통계 집계 테이블(symptom_stat, symptom_stat_total)과 필터 항목별 리뷰 수(review_facet_count)를 review_feed 로부터 다시 계산한다.
+# 집계가 어긋났다고 의심될 때 실행 -> python -m app.db.rebuild_symptom_stats
+from app import crud
+from app.db.session import SessionLocal
+
+
+def rebuild_symptom_stats() -> None:
+    db = SessionLocal()
+    try:
+        crud.symptom_stat.rebuild(db)
+        crud.review_facet_count.rebuild(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_symptom_stats()
@@ -1,18 +1,23 @@
+import asyncio
 import logging
 import traceback
+from typing import Any, Callable
 from logging.config import dictConfig
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import Response, JSONResponse
 
-from app import schemas
+from app import schemas, crud
 from app.core.logging import log_config
 from app.core.config import settings
 from app.controllers.route import api_router
+from app.db.session import SessionLocal
 from app.utils.user import open_nickname_csv, make_nickname_list, nicknames
+from app.utils.view_counter import review_view_counter
 
 dictConfig(log_config)
 logger = logging.getLogger('ddakkm_logger')
@@ -72,6 +77,81 @@ def startup_event():
     # lines = open_nickname_csv("../app/nickname_csv.csv")
     make_nickname_list(lines, nicknames)
 
+    if settings.REVIEW_FILTER_INDEX_ENABLED:
+        db = SessionLocal()
+        try:
+            crud.review_feed.load_filter_index(db)
+        finally:
+            db.close()
+
+    # 인기 리뷰 점수는 주기적으로 다시 계산되므로, DB 문제로 실패해도 서버는 뜨도록 한다. (빈 랭킹으로 시작)
+    try:
+        reconcile_trending()
+    except Exception as e:
+        logger.warning(f"인기 리뷰 점수 계산 실패, 다음 주기에 다시 시도합니다: {e}")
+
+    loop = asyncio.get_event_loop()
+    loop.create_task(run_periodically(flush_review_views, settings.REVIEW_VIEW_FLUSH_SECONDS, "리뷰 조회수 반영"))
+    if settings.LIKE_COUNT_WRITE_COMBINING:
+        loop.create_task(run_periodically(flush_like_counts, settings.LIKE_COUNT_FLUSH_SECONDS, "좋아요 수 반영"))
+    loop.create_task(run_periodically(reconcile_trending, settings.REVIEW_TRENDING_RECONCILE_SECONDS, "인기 리뷰 점수 계산"))
+    loop.create_task(run_periodically(reconcile_user_stats, settings.USER_STATS_RECONCILE_SECONDS, "회원 활동 수 맞추기"))
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    try:
+        flush_like_counts()
+    except Exception as e:
+        logger.warning(f"좋아요 수를 반영하지 못했습니다: {e}")
+    try:
+        flush_review_views()
+    except Exception as e:
+        lost = review_view_counter.discard_pending()
+        logger.warning(f"리뷰 조회수 {lost}건을 반영하지 못했습니다: {e}")
+
+
+def flush_review_views():
+    db = SessionLocal()
+    try:
+        crud.review.flush_view_counts(db)
+    finally:
+        db.close()
+
+
+def flush_like_counts():
+    db = SessionLocal()
+    try:
+        crud.user_like.flush_like_counts(db)
+        crud.user_comment_like.flush_like_counts(db)
+    finally:
+        db.close()
+
+
+def reconcile_trending():
+    db = SessionLocal()
+    try:
+        crud.review_feed.reconcile_trending(db)
+    finally:
+        db.close()
+
+
+def reconcile_user_stats():
+    db = SessionLocal()
+    try:
+        crud.user_stats.reconcile(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(job: Callable[[], Any], seconds: int, name: str):
+    while True:
+        await asyncio.sleep(seconds)
+        try:
+            await run_in_threadpool(job)
+        except Exception as e:
+            logger.warning(f"{name} 실패, 다음 주기에 다시 시도합니다: {e}")
+
 
 @app.get("/")
 def index():
@@ -2,8 +2,12 @@ from app.db.base_class import Base          # noqa (for alembic target data)
 
 from .comments import Comment
 from .reviews import Review, ReviewKeyword
+from .review_feed import ReviewFeed
+from .review_facet_count import ReviewFacetCount
+from .symptom_stat import SymptomStat, SymptomStatTotal
 from .surveys import SurveyA, SurveyB, SurveyC
 from .user_like import UserLike
 from .user_comment_like import UserCommentLike
 from .users import User, UserKeyword, NicknameCounter, SnsProviderType, JoinSurveyCode
+from .user_stats import UserStats
 from .qna import Qna
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -13,6 +13,8 @@ class Comment(Base):
     like_count = Column(Integer, default=0)
     parent_id = Column(Integer, default=None)
     is_delete = Column(Boolean, default=False)
+    reply_count = Column(Integer, default=0, nullable=False)    # 삭제되지 않은 대댓글 수
+    last_reply_at = Column(DateTime, nullable=True)             # 마지막 대댓글 작성 시각
 
     # Many to One
     user = relationship("User", back_populates="comments", join_depth=0, uselist=False, lazy="noload")
@@ -20,3 +22,8 @@ class Comment(Base):
 
     # Many to Many
     user_comment_like = relationship("UserCommentLike", back_populates="comment")
+
+    # 리뷰의 최상위 댓글 페이지 (parent_id IS NULL) / 댓글별 대댓글 미리보기 조회용
+    __table_args__ = (
+        Index("ix_comment_review_id_parent_id_id", "review_id", "parent_id", "id"),
+    )
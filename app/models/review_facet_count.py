@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Boolean, Enum
+
+from app.db.base_class import Base
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import Gender
+
+
+# 리뷰 필터 항목별 리뷰 수 집계 테이블 -> 목록에 노출되는 리뷰(review_feed)를 필터 컬럼 값 조합별로 미리 세어둔다.
+# 필터 컬럼은 비어있을 수 있어 PK 로 쓰지 못하므로, 값 조합을 문자열로 이은 facet_key 를 PK 로 쓴다. (crud.review_facet_count.facet_key)
+# crud.review_feed 에서 review_feed 가 바뀌는 트랜잭션 안에서 함께 증감한다.
+class ReviewFacetCount(Base):
+    facet_key = Column(String(100), primary_key=True)
+    gender = Column(Enum(Gender))
+    birth_year = Column(Integer)
+    vaccine_type = Column(Enum(VaccineType))
+    vaccine_round = Column(Enum(VaccineRound))
+    is_crossed = Column(Boolean)
+    is_pregnant = Column(Boolean)
+    is_underlying_disease = Column(Boolean)
+    review_count = Column(Integer, default=0, nullable=False)
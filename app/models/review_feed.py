@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Boolean, Enum, Index
+from sqlalchemy.dialects.mysql import JSON
+
+from app.db.base_class import Base
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import Gender
+
+# 목록에 내려주는 본문 미리보기 길이
+CONTENT_PREVIEW_LENGTH = 300
+
+
+# 리뷰 목록 조회용 테이블 (review + survey_a + user 비정규화)
+# 목록에 노출되는 리뷰 (삭제되지 않았고, 작성자가 탈퇴하지 않은 리뷰)만 보관하며 crud.review_feed 에서 동기화한다.
+# 회원 삭제시 리뷰가 함께 지워질 수 있어 review 에 FK 를 걸지 않는다.
+class ReviewFeed(Base):
+    review_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    nickname = Column(String(30), nullable=False)
+    gender = Column(Enum(Gender))
+    birth_year = Column(Integer)
+    vaccine_type = Column(Enum(VaccineType))
+    vaccine_round = Column(Enum(VaccineRound))
+    is_crossed = Column(Boolean)
+    is_pregnant = Column(Boolean)
+    is_underlying_disease = Column(Boolean)
+    symptom_candidates = Column(JSON)  # 목록 증상 미리보기 후보 [[질문, 답변], ...] (utils.review.get_symptom_candidates)
+    content_preview = Column(String(CONTENT_PREVIEW_LENGTH))
+    like_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)
+
+    # 필터 조건 + review_id 역순 정렬을 인덱스 범위 스캔 하나로 처리하기 위한 복합 인덱스
+    __table_args__ = (
+        Index("ix_review_feed_vaccine_type_round", "vaccine_type", "vaccine_round", "review_id"),
+        Index("ix_review_feed_vaccine_round", "vaccine_round", "review_id"),
+        Index("ix_review_feed_gender_birth_year", "gender", "birth_year", "review_id"),
+        Index("ix_review_feed_birth_year", "birth_year", "review_id"),
+        Index("ix_review_feed_user_id", "user_id", "review_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.mysql import JSON
 
@@ -13,20 +13,26 @@ class Review(Base):
     content = Column(String(3000))
     images = Column(JSON)
     like_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)     # 삭제되지 않은 댓글(대댓글 포함) 수
     view_count = Column(Integer, default=0)
 
     # One to One
     survey = relationship("SurveyA", back_populates="review", join_depth=1, uselist=False, lazy="joined")
 
     # One to Many
-    comments = relationship("Comment", back_populates="review", join_depth=1, uselist=True, lazy="joined")
+    comments = relationship("Comment", back_populates="review", join_depth=1, uselist=True, lazy="select")
     keywords = relationship("ReviewKeyword", back_populates="review")
 
     # Many to One
     user = relationship("User", back_populates="reviews", join_depth=1, uselist=False, lazy="joined")
 
     # Many to Many
-    user_like = relationship("UserLike", back_populates="review", join_depth=1, uselist=True, lazy="joined")
+    user_like = relationship("UserLike", back_populates="review", join_depth=1, uselist=True, lazy="select")
+
+    # 한국어 본문 검색용 FULLTEXT 인덱스 (ngram parser)
+    __table_args__ = (
+        Index("ft_review_content", "content", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
 
 
 class ReviewKeyword(Base):
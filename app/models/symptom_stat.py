@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Enum
+
+from app.db.base_class import Base
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import Gender
+
+
+# 증상 통계 집계 테이블 -> 목록에 노출되는 리뷰(review_feed)의 설문 답변을 (백신 종류, 차수, 성별, 출생연도) 별로 미리 세어둔다.
+# 연령대는 해가 바뀌면 달라지므로 출생연도로 보관하고, 조회할 때 출생연도 범위로 합친다.
+# crud.review_feed 에서 review_feed 가 바뀌는 트랜잭션 안에서 함께 증감한다.
+class SymptomStat(Base):
+    vaccine_type = Column(Enum(VaccineType), primary_key=True)
+    vaccine_round = Column(Enum(VaccineRound), primary_key=True)
+    gender = Column(Enum(Gender), primary_key=True)
+    birth_year = Column(Integer, primary_key=True, autoincrement=False)
+    question = Column(String(10), primary_key=True)
+    answer = Column(Integer, primary_key=True, autoincrement=False)
+    review_count = Column(Integer, default=0, nullable=False)
+
+
+# 위 집계의 분모 -> (백신 종류, 차수, 성별, 출생연도) 별 리뷰 수
+class SymptomStatTotal(Base):
+    vaccine_type = Column(Enum(VaccineType), primary_key=True)
+    vaccine_round = Column(Enum(VaccineRound), primary_key=True)
+    gender = Column(Enum(Gender), primary_key=True)
+    birth_year = Column(Integer, primary_key=True, autoincrement=False)
+    review_count = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, Enum, Integer, String
+
+from app.db.base_class import Base
+from app.models.surveys import VaccineType, VaccineRound
+from app.models.users import JoinSurveyCode
+
+
+# 회원 프로필용 활동 수 + 프로필 정보 (user / survey_a 비정규화)
+# 활동 수는 리뷰/댓글/좋아요가 바뀌는 트랜잭션 안에서 crud.user_stats.change 로 함께 증감하고,
+# 프로필 정보는 가입/가입설문/리뷰 작성/삭제/탈퇴 때 crud.user_stats.refresh_profile 로 user 에서 다시 가져온다.
+# 어긋난 값은 주기적으로 원본 테이블을 다시 세어 맞춘다. (settings.USER_STATS_RECONCILE_SECONDS)
+# 회원 삭제시 함께 지워질 수 있도록 user 에 FK 를 걸지 않는다.
+class UserStats(Base):
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    post_count = Column(Integer, default=0, nullable=False)        # 삭제되지 않은 리뷰 수
+    comment_count = Column(Integer, default=0, nullable=False)     # 삭제되지 않은 댓글(대댓글 포함) 수
+    like_count = Column(Integer, default=0, nullable=False)        # 좋아요 한 리뷰 수
+    latest_review_id = Column(Integer, nullable=True)              # 삭제되지 않은 가장 최근 리뷰
+    nickname = Column(String(30))
+    character_image = Column(String(100))
+    join_survey_code = Column(Enum(JoinSurveyCode))
+    is_active = Column(Boolean)
+    # 프로필의 접종 정보 -> 가입설문이 A 이면 가입설문, 아니면 가장 최근 리뷰의 설문
+    vaccine_type = Column(Enum(VaccineType))
+    vaccine_round = Column(Enum(VaccineRound))
+    is_crossed = Column(Boolean)
@@ -1,12 +1,13 @@
 from .login import LoginResponse, CreateSnsResponse
 from .user import UserCreate, UserUpdate, SNSUserCreate, SNSUserUpdate, OauthIn, VaccineStatus, UserProfileResponse,\
-    UserProfilePostResponse, JoinSurveyStatusResponse, PushStatusResponse
-from .review import ReviewCreate, ReviewUpdate, Review, ReviewResponse, Images, ReviewContentResponse
+    UserProfilePostResponse, JoinSurveyStatusResponse, PushStatusResponse, CurrentUser
+from .review import ReviewCreate, ReviewUpdate, Review, ReviewResponse, Images, ReviewContentResponse, ReviewFacets
 from .survey import SurveyACreate, SurveyAUpdated, survey_details_example, Survey, SurveyType, SurveyCreate
 from .comment import CommentBase, CommentCreate, CommentUpdate, Comment, NestedComment
 from .token import TokenPayload
-from .page_response import PageResponse, PageResponseReviews
+from .page_response import PageResponse, PageResponseReviews, PageResponseUserPosts
 from .report import ReportReason
 from .response import BaseResponse
 from .keyword import UserKeywordCreate, KeywordBase
 from .qna import QnaCreate, QnaUpdate, Qna
+from .stats import SymptomAnswerStat, SymptomStats
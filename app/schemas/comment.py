@@ -38,6 +38,8 @@ class Comment(CommentBase):
     user_is_like: bool
     # user_is_active: bool
     user_is_writer: bool
+    # 삭제되지 않은 대댓글 수 (nested_comment 는 미리보기 수만큼만 내려올 수 있음)
+    nested_comment_count: int = 0
     nested_comment: Optional[List[NestedComment]]
 
     class Config:
@@ -47,3 +49,5 @@ class Comment(CommentBase):
 class CommentListResponse(BaseModel):
     comment_count: int
     comment_list: List[Comment]
+    # 다음 페이지 요청시 cursor 로 보낼 값 (마지막 페이지면 null)
+    next_cursor: Optional[int] = None
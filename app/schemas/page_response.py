@@ -1,19 +1,31 @@
-from typing import TypeVar, Generic, List, Callable
+import base64
+import enum
+import json
+from typing import TypeVar, Generic, List, Callable, Optional, Any
 
+from fastapi import HTTPException
 from sqlalchemy.orm import Query
 from pydantic.generics import GenericModel
 from pydantic import BaseModel
 
 from app import schemas
+from app.utils.cache import TTLCache
 
 ModelType = TypeVar("ModelType")
 
 
+class CountMode(str, enum.Enum):
+    EXACT = "EXACT"             # 매 요청마다 COUNT 쿼리 실행
+    ESTIMATED = "ESTIMATED"     # 필터 조합별로 캐시된 COUNT 사용 (만료 혹은 쓰기 발생시 다시 계산)
+    NONE = "NONE"               # total 을 계산하지 않음
+
+
 class PageMeta(BaseModel):
-    total: int
-    page: int
+    total: Optional[int]
+    page: Optional[int]
     size: int
     has_next: bool
+    next_cursor: Optional[str] = None
 
 
 class PageResponse(GenericModel, Generic[ModelType]):
@@ -24,17 +36,92 @@ class PageResponseReviews(PageResponse):
     contents: List[schemas.ReviewResponse]
 
 
-def paginated_query(page_request: dict, base_query: Query, query_executor: Callable):
+class PageResponseUserPosts(PageResponse):
+    contents: List[schemas.UserProfilePostResponse]
+
+
+def encode_cursor(*values: Any) -> str:
+    # 클라이언트가 내용을 해석하지 않도록 정렬 키 값을 base64로 감싸서 전달한다.
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    # types 는 커서에 들어있어야 하는 정렬 키들의 타입 (예: decode_cursor(cursor, int))
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(400, "유효하지 않은 커서입니다.")
+    if not isinstance(values, list) or len(values) != len(types) or \
+            not all(isinstance(value, value_type) and (value_type is bool or not isinstance(value, bool))
+                    for value, value_type in zip(values, types)):
+        raise HTTPException(400, "유효하지 않은 커서입니다.")
+    return values
+
+
+def count_query(base_query: Query, count_mode: CountMode = CountMode.EXACT,
+                count_cache: Optional[TTLCache] = None, count_key: Any = None) -> Optional[int]:
+    if count_mode == CountMode.NONE:
+        return None
+    if count_mode == CountMode.ESTIMATED and count_cache is not None:
+        total = count_cache.get(count_key)
+        if total is None:
+            total = base_query.count()
+            count_cache.set(count_key, total)
+        return total
+    return base_query.count()
+
+
+def paginated_query(page_request: dict, base_query: Query, query_executor: Callable,
+                    cursor_of: Optional[Callable[[Any], str]] = None, *, count_mode: CountMode = CountMode.EXACT,
+                    count_cache: Optional[TTLCache] = None, count_key: Any = None):
+    """
+    query_executor 는 (query, limit, offset) 을 받아 정렬을 적용해 실행해야 합니다.
+    다음 페이지 여부는 total 과 상관없이 size + 1 개를 가져와서 판단합니다.
+    count_mode 가 ESTIMATED 이면 count_cache 에 count_key 로 total 을 저장해두고 재사용합니다.
+    """
     page = page_request.get("page", 1)
     size = page_request.get("size", 10)
-    total = base_query.count()
+    total = count_query(base_query, count_mode, count_cache, count_key)
+    rows = query_executor(base_query, size + 1, (page - 1) * size)
+    has_next = len(rows) > size
+    contents = rows[:size]
 
     return {
         "page_meta": {
             "page": page,
             "size": size,
             "total": total,
-            "has_next": page * size < total,
+            "has_next": has_next,
+            # page 방식으로 첫 페이지를 받은 클라이언트도 이어서 cursor 방식으로 요청할 수 있도록 커서를 내려준다.
+            "next_cursor": cursor_of(contents[-1]) if cursor_of and has_next else None,
+        },
+        "contents": contents,
+    }
+
+
+def keyset_paginated_query(page_request: dict, base_query: Query, query_executor: Callable,
+                           cursor_of: Callable[[Any], str], *, count_mode: CountMode = CountMode.EXACT,
+                           count_cache: Optional[TTLCache] = None, count_key: Any = None):
+    """
+    OFFSET 없이 마지막으로 받은 row 의 정렬 키 이후부터 가져오는 페이지네이션 </br>
+    query_executor 는 (query, limit) 을 받아 커서 조건과 정렬을 적용해 실행해야 합니다.
+    다음 페이지 여부는 size + 1 개를 가져와서 판단합니다.
+    """
+    size = page_request.get("size", 10)
+    total = count_query(base_query, count_mode, count_cache, count_key)
+    rows = query_executor(base_query, size + 1)
+    has_next = len(rows) > size
+    contents = rows[:size]
+
+    return {
+        "page_meta": {
+            "page": None,
+            "size": size,
+            "total": total,
+            "has_next": has_next,
+            "next_cursor": cursor_of(contents[-1]) if has_next else None,
         },
-        "contents": query_executor(base_query),
+        "contents": contents,
     }
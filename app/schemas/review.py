@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 from pydantic import BaseModel
 
@@ -64,9 +64,10 @@ class ReviewResponse(ReviewBase):
     id: int
     user_id: int
     nickname: str
-    vaccine_round: str
-    vaccine_type: str
-    is_crossed: bool
+    # 설문 없이 작성된 리뷰는 설문 항목이 비어있다.
+    vaccine_round: Optional[str]
+    vaccine_type: Optional[str]
+    is_crossed: Optional[bool]
     symptom: dict
     content: Optional[str]
     like_count: int
@@ -78,3 +79,15 @@ class ReviewResponse(ReviewBase):
 class ReviewContentResponse(ReviewBase):
     keywords: List[str] = ["심근염/심낭염"]
     images: Optional[Images]
+
+
+class ReviewFacets(BaseModel):
+    # 필터 항목별 {값: 리뷰 수}, 각 항목의 수는 그 항목을 제외한 나머지 필터를 적용한 결과
+    total: int
+    gender: Dict[str, int]
+    age_group: Dict[str, int]
+    vaccine_type: Dict[str, int]
+    round: Dict[str, int]
+    is_crossed: Dict[str, int]
+    is_pregnant: Dict[str, int]
+    is_underlying_disease: Dict[str, int]
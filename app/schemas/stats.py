@@ -0,0 +1,15 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class SymptomAnswerStat(BaseModel):
+    count: int
+    # 조건에 맞는 리뷰 수(total) 대비 비율 (0 ~ 1)
+    ratio: float
+
+
+class SymptomStats(BaseModel):
+    total: int
+    # {질문: {답변 번호: 통계}} ex) {"q2": {"1": {"count": 10, "ratio": 0.5}}}
+    questions: Dict[str, Dict[str, SymptomAnswerStat]]
@@ -46,6 +46,23 @@ class User(UserBase):
         orm_mode = True
 
 
+class CurrentUser(BaseModel):
+    """
+    인증된 회원의 스냅샷 (deps.get_current_user 가 반환) </br>
+    설문이나 sns 정보 등 ORM 객체가 필요한 핸들러는 crud.user.get 으로 따로 불러옵니다.
+    """
+    id: int
+    nickname: str
+    is_super: Optional[bool] = False
+    is_active: Optional[bool] = True
+    agree_keyword_push: bool = True
+    agree_activity_push: bool = True
+
+    class Config:
+        orm_mode = True
+        allow_mutation = False
+
+
 class VaccineStatus(BaseModel):
     join_survey_code: Optional[JoinSurveyCode]
     details: Optional[dict]
@@ -0,0 +1,38 @@
+import json
+import os, sys
+from typing import Dict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.test.utils import TestingSessionLocal, post_sample_review, delete_sample_review
+from app.utils.export import EXPORT_COLUMNS
+
+
+client = TestClient(app)
+
+
+class TestExport:
+    host = "v1/admin/export/reviews"
+    db: Session = TestingSessionLocal()
+
+    def test_export_reviews_admin_only(self, get_test_user_token: Dict[str, str]):
+        response = client.get(self.host, headers=get_test_user_token)
+        assert response.status_code == 400
+
+    def test_export_reviews(self, get_test_user_token: Dict[str, str], get_test_admin_user_tokne: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, "/v1/review", get_test_user_token)
+
+        response = client.get(f"{self.host}?since=2000-01-01T00:00:00", headers=get_test_admin_user_tokne)
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert all(tuple(row.keys()) == EXPORT_COLUMNS for row in rows)
+        assert review_id in [row.get("review_id") for row in rows]
+
+        response = client.get(f"{self.host}?format=csv&until=2000-01-01T00:00:00", headers=get_test_admin_user_tokne)
+        assert response.status_code == 200
+        assert response.text.lstrip("\ufeff").splitlines() == [",".join(EXPORT_COLUMNS)]
+        delete_sample_review(self.db, review_id)
@@ -1,5 +1,6 @@
 import copy
 import os, sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 import pytest
@@ -9,9 +10,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
+from app import crud, schemas, models
+from app.core.config import settings
 from app.main import app
-from app.test.utils import TestingSessionLocal
+from app.test.utils import TestingSessionLocal, post_sample_review, delete_sample_review, post_sameple_comment, \
+    get_user_model
 from app.utils.user import calculate_birth_year_from_age
 
 client = TestClient(app)
@@ -71,6 +74,47 @@ class TestGetReviews:
 
         assert total == contents_count
 
+    def test_cursor_pagenation(self):
+        cursor = ""
+        total = 0
+        review_ids = []
+        has_next = True
+        while has_next:
+            response = client.get(self.host, params={"cursor": cursor}).json()
+            page_meta = response.get("page_meta")
+
+            total = page_meta.get("total")
+            review_ids += [review.get("id") for review in response.get("contents")]
+
+            has_next = page_meta.get("has_next")
+            cursor = page_meta.get("next_cursor")
+
+        assert total == len(review_ids)
+        assert review_ids == sorted(review_ids, reverse=True)
+
+    def test_search_cursor_pagenation(self):
+        cursor = ""
+        total = 0
+        review_ids = []
+        has_next = True
+        while has_next:
+            response = client.get(self.host, params={"q": "백신", "cursor": cursor}).json()
+            page_meta = response.get("page_meta")
+
+            total = page_meta.get("total")
+            for review in response.get("contents"):
+                assert "백신" in review.get("content")
+                review_ids.append(review.get("id"))
+
+            has_next = page_meta.get("has_next")
+            cursor = page_meta.get("next_cursor")
+
+        assert total == len(set(review_ids)) == len(review_ids)
+
+    def test_invalid_cursor(self):
+        response = client.get(self.host, params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
     def test_get_review_list_model(self):
         response = client.get(self.host)
         response_body = response.json()
@@ -136,3 +180,207 @@ class TestReivewBase:
     def test_get_review_content(self, get_test_user_token: Dict[str, str]):
         response = client.get(f"{self.host}/{self.normal_review_ids[0]}/content", headers=get_test_user_token)
         assert response.status_code == 200
+
+    def test_get_review_batch(self):
+        review_ids = self.normal_review_ids[:3][::-1] + self.abnormal_review_ids[:1]
+        response = client.get(f"{self.host}/batch?ids={','.join(str(review_id) for review_id in review_ids)}")
+        assert response.status_code == 200
+        assert [review.get("id") for review in response.json()] == self.normal_review_ids[:3][::-1]
+
+        response = client.get(f"{self.host}/batch?ids={','.join(str(review_id) for review_id in range(1, 52))}")
+        assert response.status_code == 422
+
+
+class TestReviewCommentCount:
+    host = "/v1/review"
+    db: Session = TestingSessionLocal()
+
+    def test_comment_count(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        post_sameple_comment(client, self.host, review_id, get_test_user_token)
+        self.db.close()
+        assert crud.review.get(self.db, id=review_id).comment_count == 1
+
+        comment = crud.comment.get_comments_by_review_id(self.db, review_id=review_id)[0]
+        response = client.delete(f"/v1/comment/{comment.id}", headers=get_test_user_token)
+        assert response.status_code == 200
+        self.db.close()
+        assert crud.review.get(self.db, id=review_id).comment_count == 0
+        delete_sample_review(self.db, review_id)
+
+
+class TestReviewFeed:
+    host = "/v1/review"
+    db: Session = TestingSessionLocal()
+
+    def test_review_feed_sync(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        post_sameple_comment(client, self.host, review_id, get_test_user_token)
+        self.db.close()
+        feed = self.db.query(models.ReviewFeed).filter(models.ReviewFeed.review_id == review_id).first()
+        assert feed.comment_count == 1
+        assert feed.content_preview == crud.review.get(self.db, id=review_id).content
+
+        response = client.delete(f"{self.host}/{review_id}", headers=get_test_user_token)
+        assert response.status_code == 200
+        self.db.close()
+        assert self.db.query(models.ReviewFeed).filter(models.ReviewFeed.review_id == review_id).first() is None
+        delete_sample_review(self.db, review_id)
+
+    def test_get_review_facets(self):
+        query_params = "?vaccine_type=PFIZER&is_crossed=false"
+        facets = client.get(self.host+"/facets"+query_params).json()
+        total = client.get(self.host+query_params).json().get("page_meta").get("total")
+        assert facets.get("total") == total
+        assert facets.get("vaccine_type").get("PFIZER") == total
+        assert facets.get("is_crossed").get("false") == total
+
+    def test_review_page_cache_invalidated(self, get_test_user_token: Dict[str, str]):
+        first_page = client.get(self.host).json()
+        assert client.get(self.host).json() == first_page
+
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        contents = client.get(self.host).json().get("contents")
+        assert contents[0].get("id") == review_id
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        liked = client.get(self.host, headers=get_test_user_token).json().get("contents")[0]
+        assert liked.get("like_count") == 1 and liked.get("user_is_like") is True
+        assert client.get(self.host).json().get("contents")[0].get("user_is_like") is False
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        self.db.close()
+        delete_sample_review(self.db, review_id)
+
+    def test_review_detail_etag(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        response = client.get(f"{self.host}/{review_id}", headers=get_test_user_token)
+        etag = response.headers.get("etag")
+        assert response.status_code == 200 and etag
+
+        not_modified = client.get(f"{self.host}/{review_id}", headers={**get_test_user_token, "If-None-Match": etag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        # 비회원은 작성자 여부가 다르므로 ETag 도 다름
+        assert client.get(f"{self.host}/{review_id}", headers={"If-None-Match": etag}).status_code == 200
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        changed = client.get(f"{self.host}/{review_id}", headers={**get_test_user_token, "If-None-Match": etag})
+        assert changed.status_code == 200 and changed.json().get("user_is_like") is True
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        self.db.close()
+        delete_sample_review(self.db, review_id)
+
+    def test_profile_counts_follow_writes(self, get_test_user_token: Dict[str, str]):
+        def get_counts():
+            profile = client.get("/v1/user/me/profile", headers=get_test_user_token).json()
+            return profile.get("post_counts"), profile.get("like_counts")
+
+        post_counts, like_counts = get_counts()
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        assert get_counts() == (post_counts + 1, like_counts + 1)
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        client.delete(f"{self.host}/{review_id}", headers=get_test_user_token)
+        assert get_counts() == (post_counts, like_counts)
+        self.db.close()
+
+    def test_my_posts_page(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        page = client.get("/v1/user/me/post/page", headers=get_test_user_token).json()
+        assert page.get("contents")[0].get("id") == review_id
+        assert [post.get("id") for post in page.get("contents")] == \
+               [post.get("id") for post in client.get("/v1/user/me/post", headers=get_test_user_token).json()][:20]
+
+        next_cursor = page.get("page_meta").get("next_cursor")
+        if next_cursor:
+            next_page = client.get(f"/v1/user/me/post/page?cursor={next_cursor}", headers=get_test_user_token).json()
+            assert next_page.get("contents")[0].get("id") < page.get("contents")[-1].get("id")
+        self.db.close()
+        delete_sample_review(self.db, review_id)
+
+    def test_get_trending_reviews(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        trending = client.get(f"{self.host}/trending?limit=50", headers=get_test_user_token).json()
+        liked = [review for review in trending if review.get("id") == review_id]
+        assert liked and liked[0].get("user_is_like") is True
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        client.delete(f"{self.host}/{review_id}", headers=get_test_user_token)
+        trending = client.get(f"{self.host}/trending?limit=50").json()
+        assert review_id not in [review.get("id") for review in trending]
+        self.db.close()
+        delete_sample_review(self.db, review_id)
+
+    def test_review_detail_cache_invalidated(self, get_test_user_token: Dict[str, str]):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        detail = client.get(f"{self.host}/{review_id}", headers=get_test_user_token).json()
+        assert detail.get("is_writer") is True and detail.get("like_count") == 0
+        assert client.get(f"{self.host}/{review_id}").json().get("is_writer") is False
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        post_sameple_comment(client, self.host, review_id, get_test_user_token)
+        detail = client.get(f"{self.host}/{review_id}", headers=get_test_user_token).json()
+        assert detail.get("like_count") == 1 and detail.get("user_is_like") is True
+        assert detail.get("comment_count") == 1
+
+        client.post(f"{self.host}/{review_id}/like_status", headers=get_test_user_token)
+        self.db.close()
+        delete_sample_review(self.db, review_id)
+
+
+class TestLikeConcurrency:
+    host = "/v1/review"
+    db: Session = TestingSessionLocal()
+
+    @staticmethod
+    def toggle_concurrently(toggle, times: int = 31):
+        # 요청마다 별도 세션으로 같은 좋아요를 동시에 토글
+        def run(_):
+            db = TestingSessionLocal()
+            try:
+                toggle(db)
+            finally:
+                db.close()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(run, range(times)))
+
+    def test_concurrent_like_toggle_keeps_count_exact(self, get_test_user_token: Dict[str, str]):
+        self.check_concurrent_like_toggle(get_test_user_token)
+
+    def test_concurrent_like_toggle_with_write_combining(self, get_test_user_token: Dict[str, str], monkeypatch):
+        # 좋아요 수 증감을 모아뒀다가 flush 하는 경우에도 flush 후에는 정확해야 한다.
+        monkeypatch.setattr(settings, "LIKE_COUNT_WRITE_COMBINING", True)
+        self.check_concurrent_like_toggle(get_test_user_token, flush=True)
+
+    def check_concurrent_like_toggle(self, get_test_user_token: Dict[str, str], flush: bool = False):
+        review_id = post_sample_review(client, self.db, self.host, get_test_user_token)
+        comment_id = post_sameple_comment(client, self.host, review_id, get_test_user_token)
+        user = get_user_model(self.db, get_test_user_token)
+
+        self.toggle_concurrently(
+            lambda db: crud.user_like.change_user_like_review_status(db, current_user=user, review_id=review_id))
+        self.toggle_concurrently(
+            lambda db: crud.user_comment_like.change_user_comment_like_status(db, current_user=user, comment_id=comment_id))
+        if flush:
+            crud.user_like.flush_like_counts(self.db)
+            crud.user_comment_like.flush_like_counts(self.db)
+
+        self.db.close()
+        review_likes = self.db.query(models.UserLike).filter(models.UserLike.review_id == review_id).count()
+        comment_likes = self.db.query(models.UserCommentLike).filter(models.UserCommentLike.comment_id == comment_id).count()
+        assert crud.review.get(self.db, id=review_id).like_count == review_likes
+        assert self.db.query(models.ReviewFeed).filter(models.ReviewFeed.review_id == review_id).first().like_count == review_likes
+        assert crud.comment.get(self.db, id=comment_id).like_count == comment_likes
+
+        if review_likes:
+            crud.user_like.change_user_like_review_status(self.db, current_user=user, review_id=review_id)
+        if comment_likes:
+            crud.user_comment_like.change_user_comment_like_status(self.db, current_user=user, comment_id=comment_id)
+        if flush:
+            crud.user_like.flush_like_counts(self.db)
+            crud.user_comment_like.flush_like_counts(self.db)
+        self.db.close()
+        delete_sample_review(self.db, review_id)
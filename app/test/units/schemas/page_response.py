@@ -0,0 +1,24 @@
+import os, sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.schemas.page_response import encode_cursor, decode_cursor
+
+
+class TestCursor:
+    def test_encode_decode_cursor(self):
+        cursor = encode_cursor(123)
+        assert decode_cursor(cursor, int) == [123]
+
+    def test_decode_invalid_cursor(self):
+        with pytest.raises(HTTPException):
+            decode_cursor("not-a-cursor", int)
+
+    def test_decode_cursor_with_wrong_type(self):
+        with pytest.raises(HTTPException):
+            decode_cursor(encode_cursor("123"), int)
+        with pytest.raises(HTTPException):
+            decode_cursor(encode_cursor(True), int)
@@ -0,0 +1,38 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.utils.after_commit import on_commit
+
+
+def make_session():
+    return sessionmaker(bind=create_engine("sqlite://"))()
+
+
+class TestOnCommit:
+    def test_runs_after_commit_in_order(self):
+        db = make_session()
+        applied = []
+        db.execute(text("SELECT 1"))
+        on_commit(db, applied.append, 1)
+        on_commit(db, applied.append, 2)
+        assert applied == []
+        db.commit()
+        assert applied == [1, 2]
+        db.commit()
+        assert applied == [1, 2]
+
+    def test_discarded_on_rollback_and_close(self):
+        db = make_session()
+        applied = []
+        db.execute(text("SELECT 1"))
+        on_commit(db, applied.append, 1)
+        db.rollback()
+        db.execute(text("SELECT 1"))
+        on_commit(db, applied.append, 2)
+        db.close()
+        db.commit()
+        assert applied == []
@@ -0,0 +1,36 @@
+import os, sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_and_set(self):
+        cache = TTLCache(ttl=60)
+        cache.set("key", 1)
+        assert cache.get("key") == 1
+        assert cache.get("none") is None
+
+    def test_expired_value(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set("key", 1)
+        time.sleep(0.02)
+        assert cache.get("key") is None
+
+    def test_evict_least_recently_used(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_clear(self):
+        cache = TTLCache(ttl=60)
+        cache.set("key", 1)
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,39 @@
+import os, sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.models.comments import Comment
+from app.models.users import User
+from app.utils.comment import build_comment_tree
+
+
+def make_comment(id: int, parent_id: int = None, user_id: int = 1, **kwargs) -> Comment:
+    values = dict(content=f"댓글 {id}", like_count=0, is_delete=False, created_at=datetime(2021, 12, 1))
+    values.update(kwargs)
+    comment = Comment(id=id, parent_id=parent_id, user_id=user_id, **values)
+    comment.user = User(id=user_id, nickname=f"회원 {user_id}", is_active=True)
+    return comment
+
+
+class TestBuildCommentTree:
+    def test_groups_replies_by_parent(self):
+        comments = [make_comment(1, reply_count=2), make_comment(2), make_comment(3, parent_id=1), make_comment(4, parent_id=2),
+                    make_comment(5, parent_id=1, user_id=2)]
+        tree = build_comment_tree(comments, {5}, current_user_id=2)
+        assert [comment.id for comment in tree] == [1, 2]
+        assert [nested.id for nested in tree[0].nested_comment] == [3, 5]
+        assert tree[0].nested_comment_count == 2
+        assert tree[0].nested_comment[1].user_is_like and tree[0].nested_comment[1].user_is_writer
+
+    def test_reply_limit_keeps_total_count(self):
+        comments = [make_comment(1, reply_count=5)] + [make_comment(id, parent_id=1) for id in range(2, 7)]
+        tree = build_comment_tree(comments, set(), current_user_id=0, reply_limit=2)
+        assert [nested.id for nested in tree[0].nested_comment] == [2, 3]
+        assert tree[0].nested_comment_count == 5
+
+    def test_placeholder_does_not_touch_models(self):
+        deleted = make_comment(1, is_delete=True)
+        tree = build_comment_tree([deleted], set(), current_user_id=0)
+        assert tree[0].content == "삭제된 댓글입니다."
+        assert deleted.content == "댓글 1"
@@ -0,0 +1,61 @@
+import os, sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.utils.counter_buffer import CounterBuffer
+
+
+class TestCounterBuffer:
+    def test_add_combines_deltas(self):
+        buffer = CounterBuffer()
+        buffer.add(1, 1)
+        buffer.add(1, 1)
+        buffer.add(2, 1)
+        buffer.add(2, -1)
+        assert buffer.pending(1) == 2
+        assert len(buffer) == 1
+
+        written = []
+        assert buffer.flush(written.append) == 1
+        assert written == [{1: 2}]
+        assert len(buffer) == 0
+
+    def test_flush_requeues_on_writer_error(self):
+        buffer = CounterBuffer()
+        buffer.add(1, 3)
+
+        def failing_writer(counts):
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            buffer.flush(failing_writer)
+        buffer.add(1, -1)
+        assert buffer.pending(1) == 2
+
+    def test_concurrent_add_and_flush_is_exact(self):
+        buffer = CounterBuffer()
+        flushed = {}
+        lock = threading.Lock()
+
+        def writer(counts):
+            with lock:
+                for key, delta in counts.items():
+                    flushed[key] = flushed.get(key, 0) + delta
+
+        def like(i):
+            buffer.add(i % 3, 1 if i % 4 else -1)
+            if i % 50 == 0:
+                buffer.flush(writer)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(like, range(3000)))
+        buffer.flush(writer)
+
+        expected = {}
+        for i in range(3000):
+            expected[i % 3] = expected.get(i % 3, 0) + (1 if i % 4 else -1)
+        assert flushed == expected
@@ -0,0 +1,35 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from starlette.requests import Request
+
+from app.utils.etag import VersionStamps, make_etag, etag_matches
+
+
+def make_request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestEtag:
+    def test_version_stamps(self):
+        versions = VersionStamps()
+        first = versions.get(1)
+        assert versions.get(1) == first
+        versions.bump(1)
+        assert versions.get(1) != first
+        second, other = versions.get(1), versions.get(2)
+        versions.bump_all()
+        assert versions.get(1) != second and versions.get(2) != other
+        # 다른 인스턴스(서버 재시작)와 버전이 겹치지 않음
+        assert VersionStamps().get(1) != VersionStamps().get(1)
+
+    def test_etag_matches(self):
+        etag = make_etag("review", 1, "v1", 0)
+        assert etag.startswith('"') and etag != make_etag("review", 1, "v1", 2)
+        assert etag_matches(make_request(etag), etag)
+        assert etag_matches(make_request(f'"other", W/{etag}'), etag)
+        assert etag_matches(make_request("*"), etag)
+        assert not etag_matches(make_request('"other"'), etag)
+        assert not etag_matches(make_request(), etag)
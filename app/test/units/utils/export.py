@@ -0,0 +1,36 @@
+import csv
+import io
+import json
+import os, sys
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.models.surveys import VaccineType
+from app.utils.export import EXPORT_COLUMNS, EXPORT_CHUNK_ROWS, iter_csv, iter_ndjson
+
+
+def make_row(review_id: int) -> SimpleNamespace:
+    row = {column: None for column in EXPORT_COLUMNS}
+    row.update(review_id=review_id, created_at=datetime(2022, 1, 1), content='팔이, "아파요"',
+               vaccine_type=VaccineType.PFIZER, survey_data={"q1": [1, "근육통"]})
+    return SimpleNamespace(**row)
+
+
+class TestExport:
+    def test_iter_ndjson_chunks(self):
+        chunks = list(iter_ndjson(make_row(i) for i in range(EXPORT_CHUNK_ROWS + 1)))
+        assert len(chunks) == 2
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert len(rows) == EXPORT_CHUNK_ROWS + 1
+        assert rows[0]["vaccine_type"] == "PFIZER" and rows[0]["created_at"] == "2022-01-01T00:00:00"
+        assert rows[0]["survey_data"] == {"q1": [1, "근육통"]}
+
+    def test_iter_csv(self):
+        content = "".join(iter_csv([make_row(1), make_row(2)]))
+        rows = list(csv.DictReader(io.StringIO(content.lstrip("\ufeff"))))
+        assert [row["review_id"] for row in rows] == ["1", "2"]
+        assert rows[0]["content"] == '팔이, "아파요"'
+        assert json.loads(rows[0]["survey_data"]) == {"q1": [1, "근육통"]}
+        assert list(iter_csv([])) == ["\ufeff" + ",".join(EXPORT_COLUMNS) + "\r\n"]
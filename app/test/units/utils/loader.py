@@ -0,0 +1,76 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.orm import declarative_base, lazyload, relationship, sessionmaker
+
+from app.utils.loader import get_loader
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = "author"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(10))
+
+
+class Post(Base):
+    __tablename__ = "post"
+    id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, ForeignKey("author.id"))
+    author = relationship("Author", lazy="joined")
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([Author(id=i, name=f"author{i}") for i in range(1, 4)])
+    db.add_all([Post(id=i, author_id=i % 3 + 1) for i in range(1, 7)])
+    db.commit()
+    db.expunge_all()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return db, statements
+
+
+class TestEntityLoader:
+    def test_load_same_id_once(self):
+        db, statements = make_session()
+        loader = get_loader(db)
+        assert loader.load(Author, 1).name == "author1"
+        assert loader.load(Author, 1).name == "author1"
+        assert loader.load(Author, 9) is None
+        assert loader.load(Author, 9) is None
+        assert len(statements) == 2
+
+    def test_load_many_in_one_query(self):
+        db, statements = make_session()
+        loader = get_loader(db)
+        loader.load(Author, 2)
+        assert [author.id for author in loader.load_many(Author, [3, 9, 2, 3, 1])] == [3, 2, 1]
+        assert len(statements) == 2 and "IN" in statements[1]
+
+    def test_many_to_one_uses_loaded_entities(self):
+        db, statements = make_session()
+        posts = db.query(Post).options(lazyload(Post.author)).all()
+        loader = get_loader(db)
+        loader.load_many(Author, [post.author_id for post in posts])
+        assert len(statements) == 2
+        # 로더로 불러온 작성자는 다대일 관계에서 다시 조회하지 않는다.
+        assert {post.author.name for post in posts} == {"author1", "author2", "author3"}
+        assert len(statements) == 2
+
+    def test_forget_after_commit(self):
+        db, _ = make_session()
+        loader = get_loader(db)
+        assert loader.load(Author, 4) is None
+        db.add(Author(id=4, name="author4"))
+        db.commit()
+        assert loader.load(Author, 4).name == "author4"
+
+    def test_same_loader_per_session(self):
+        db, _ = make_session()
+        assert get_loader(db) is get_loader(db)
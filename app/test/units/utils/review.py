@@ -0,0 +1,31 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.utils.review import get_symptom_candidates, symptom_sampler
+
+SYMPTOM = {
+    "q1": [1, 2, "팔이 아파요"],
+    "q2": [3],
+    "q2_1": [1],
+    "q3": ["머리가 아파요"],
+    "q4": [2],
+    "q5": [1]
+}
+
+
+class TestSymptomPreview:
+    def test_get_symptom_candidates(self):
+        candidates = get_symptom_candidates(SYMPTOM)
+        assert [question for question, _ in candidates] == ["q1", "q2", "q4", "q5"]
+
+    def test_symptom_sampler_is_deterministic(self):
+        candidates = get_symptom_candidates(SYMPTOM)
+        preview = symptom_sampler(candidates, review_id=1, epoch=100)
+        assert len(preview) == 2
+        assert all(SYMPTOM.get(question) == answer for question, answer in preview.items())
+        assert symptom_sampler(candidates, review_id=1, epoch=100) == preview
+
+    def test_symptom_sampler_with_few_candidates(self):
+        assert symptom_sampler([["q2", [3]]], review_id=1) == {"q2": [3]}
+        assert symptom_sampler(None, review_id=1) == {}
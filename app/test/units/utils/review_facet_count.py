@@ -0,0 +1,52 @@
+import os, sys
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.crud.review_facet_count import count_facet_groups, facet_counts_from_groups, facet_key
+from app.schemas.review import ReviewParams
+from app.utils.review_index import ReviewFilterIndex, FILTER_FIELDS
+from app.utils.user import calculate_birth_year_from_age
+
+Row = namedtuple("Row", ("review_id",) + FILTER_FIELDS)
+
+
+def make_row(review_id: int, **kwargs) -> Row:
+    values = dict(gender="MALE", birth_year=calculate_birth_year_from_age(30), vaccine_type="PFIZER",
+                  vaccine_round="FIRST", is_crossed=False, is_pregnant=False, is_underlying_disease=False)
+    values.update(kwargs)
+    return Row(review_id=review_id, **values)
+
+
+def nonzero(counts: dict) -> dict:
+    # 0건인 값은 응답을 만들 때(__format_facet_counts) 다시 채워지므로 비교에서 뺀다.
+    return {key: nonzero(value) if isinstance(value, dict) else value
+            for key, value in counts.items() if not isinstance(value, int) or value or key == "total"}
+
+
+class TestReviewFacetCount:
+    def test_same_counts_as_filter_index(self):
+        rows = [
+            make_row(1),
+            make_row(2, vaccine_type="MODERNA"),
+            make_row(3, gender="FEMALE", birth_year=calculate_birth_year_from_age(50)),
+            make_row(4, is_crossed=True),
+            make_row(5, vaccine_type="MODERNA", is_pregnant=None, birth_year=None),
+            make_row(6),
+        ]
+        index = ReviewFilterIndex()
+        index.load(rows)
+        groups = list(count_facet_groups(row._asdict() for row in rows).items())
+        for filters in (ReviewParams(), ReviewParams(vaccine_type="PFIZER", is_crossed=False),
+                        ReviewParams(min_age=25, max_age=35, gender="MALE"), ReviewParams(is_pregnant=False)):
+            assert nonzero(facet_counts_from_groups(groups, filters)) == nonzero(index.facet_counts(filters))
+
+    def test_removed_rows_cancel_out(self):
+        groups = count_facet_groups([make_row(1)._asdict()], sign=-1)
+        groups.update(count_facet_groups([make_row(1)._asdict(), make_row(2, is_crossed=True)._asdict()]))
+        assert {key: count for key, count in groups.items() if count} == \
+            {tuple(make_row(2, is_crossed=True)[1:]): 1}
+
+    def test_facet_key(self):
+        assert facet_key(make_row(1, is_pregnant=None, is_crossed=True)[1:]) == \
+            f"MALE|{calculate_birth_year_from_age(30)}|PFIZER|FIRST|1||0"
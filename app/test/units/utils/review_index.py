@@ -0,0 +1,63 @@
+import os, sys
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.schemas.review import ReviewParams
+from app.utils.review_index import ReviewFilterIndex, FILTER_FIELDS, iter_ids_desc, count_bits
+from app.utils.user import calculate_birth_year_from_age
+
+Row = namedtuple("Row", ("review_id",) + FILTER_FIELDS)
+
+
+def make_row(review_id: int, **kwargs) -> Row:
+    values = dict(gender="MALE", birth_year=calculate_birth_year_from_age(30), vaccine_type="PFIZER",
+                  vaccine_round="FIRST", is_crossed=False, is_pregnant=False, is_underlying_disease=False)
+    values.update(kwargs)
+    return Row(review_id=review_id, **values)
+
+
+class TestReviewFilterIndex:
+    def test_resolve(self):
+        index = ReviewFilterIndex()
+        index.load([
+            make_row(1),
+            make_row(2, vaccine_type="MODERNA"),
+            make_row(3, gender="FEMALE", birth_year=calculate_birth_year_from_age(50)),
+            make_row(4, is_crossed=True),
+        ])
+        assert iter_ids_desc(index.resolve(ReviewParams())) == [4, 3, 2, 1]
+        assert iter_ids_desc(index.resolve(ReviewParams(vaccine_type="PFIZER", is_crossed=False))) == [3, 1]
+        assert iter_ids_desc(index.resolve(ReviewParams(min_age=25, max_age=35))) == [4, 2, 1]
+        assert iter_ids_desc(index.resolve(ReviewParams(gender="FEMALE", round="FIRST"))) == [3]
+        assert index.resolve(ReviewParams(vaccine_type="AZ")) == 0
+
+    def test_upsert_and_remove(self):
+        index = ReviewFilterIndex()
+        index.load([make_row(1), make_row(2)])
+        index.upsert(make_row(2, vaccine_type="MODERNA"))
+        index.remove(1)
+        assert len(index) == 1
+        assert index.resolve(ReviewParams(vaccine_type="PFIZER")) == 0
+        assert iter_ids_desc(index.resolve(ReviewParams(vaccine_type="MODERNA"))) == [2]
+
+    def test_facet_counts(self):
+        index = ReviewFilterIndex()
+        index.load([make_row(1), make_row(2, vaccine_type="MODERNA"), make_row(3, is_crossed=True)])
+        counts = index.facet_counts(ReviewParams(vaccine_type="PFIZER", is_crossed=False))
+        assert counts.get("total") == 1
+        assert counts.get("vaccine_type") == {"PFIZER": 1, "MODERNA": 1}
+        assert counts.get("is_crossed") == {False: 1, True: 1}
+        assert counts.get("age_group") == {"3039": 1}
+
+    def test_iter_ids_desc(self):
+        bits = sum(1 << review_id for review_id in (3, 5, 8, 13, 21))
+        assert count_bits(bits) == 5
+        assert iter_ids_desc(bits, limit=2) == [21, 13]
+        assert iter_ids_desc(bits, offset=2, limit=2) == [8, 5]
+        assert iter_ids_desc(bits, before=13) == [8, 5, 3]
+
+    def test_iter_ids_desc_huge_cursor(self):
+        bits = sum(1 << review_id for review_id in (3, 5, 8))
+        assert iter_ids_desc(bits, before=99999999999) == [8, 5, 3]
+        assert iter_ids_desc(bits, before=-1) == []
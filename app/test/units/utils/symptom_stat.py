@@ -0,0 +1,36 @@
+import os, sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.crud.symptom_stat import count_symptom_stats
+
+
+def make_row(symptom_candidates, **kwargs):
+    row = dict(vaccine_type="PFIZER", vaccine_round="SECOND", gender="MALE", birth_year=1990,
+               symptom_candidates=symptom_candidates)
+    row.update(kwargs)
+    return row
+
+
+class TestCountSymptomStats:
+    def test_counts_number_answers_only(self):
+        stats, totals = count_symptom_stats([
+            make_row([["q1", [1, 3]], ["q2", 2]]),
+            make_row([["q1", [1, "두통"]], ["q2", 2]]),
+        ])
+        key = ("PFIZER", "SECOND", "MALE", 1990)
+        assert totals == {key: 2}
+        assert stats == {key + ("q1", 1): 2, key + ("q1", 3): 1, key + ("q2", 2): 2}
+
+    def test_skips_rows_without_dimensions(self):
+        stats, totals = count_symptom_stats([make_row([["q2", 1]], gender=None)])
+        assert not stats and not totals
+
+    def test_removed_and_added_rows_cancel_out(self):
+        stats, totals = count_symptom_stats([make_row([["q2", 1]])], sign=-1)
+        added_stats, added_totals = count_symptom_stats([make_row([["q2", 2]])])
+        stats.update(added_stats)
+        totals.update(added_totals)
+        key = ("PFIZER", "SECOND", "MALE", 1990)
+        assert totals[key] == 0
+        assert stats[key + ("q2", 1)] == -1 and stats[key + ("q2", 2)] == 1
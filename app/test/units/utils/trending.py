@@ -0,0 +1,96 @@
+import os, sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.utils.trending import TrendingScores, TRENDING_HALF_LIFE_SECONDS
+
+
+class TestTrendingScores:
+    def test_record_keeps_ranking_sorted(self):
+        trending = TrendingScores()
+        trending.record(1, "like")
+        trending.record(2, "comment")
+        trending.record(3, "view", 100)
+        assert [review_id for review_id, _ in trending.top(3)] == [3, 1, 2]
+
+        trending.record(2, "like", 3)
+        assert [review_id for review_id, _ in trending.top(2)] == [2, 3]
+        assert [review_id for review_id, _ in trending.top(2, offset=1)] == [3, 1]
+
+    def test_recent_events_outweigh_old_events(self):
+        trending = TrendingScores()
+        trending.record(1, "like", 3, at=time.time() - TRENDING_HALF_LIFE_SECONDS * 2)
+        trending.record(2, "like", 1)
+        # 반감기 2번이 지난 좋아요 3개 (0.75) < 방금 좋아요 1개
+        assert [review_id for review_id, _ in trending.top(2)] == [2, 1]
+        assert trending.top(1)[0][1] == 3.0
+
+    def test_remove_and_unlike(self):
+        trending = TrendingScores()
+        trending.record(1, "like")
+        trending.record(2, "like")
+        trending.record(2, "like", -1)
+        trending.remove([3])
+        assert [review_id for review_id, _ in trending.top(10)] == [1]
+        trending.remove([1])
+        assert trending.top(10) == [] and len(trending) == 0
+
+    def test_load_rebuilds_scores(self):
+        trending = TrendingScores()
+        trending.record(9, "like")
+        now = datetime.now()
+        trending.load([
+            (1, "like", 1, now - timedelta(days=1)),
+            (1, "comment", 1, now - timedelta(days=1)),
+            (2, "like", 1, now),
+        ])
+        assert [review_id for review_id, _ in trending.top(10)] == [2, 1]
+        assert trending.loaded_at is not None
+
+    def test_load_keeps_recorded_views(self):
+        trending = TrendingScores()
+        now = datetime.now()
+        trending.load([(1, "view", 10, now - timedelta(days=30))])
+        trending.record(1, "view", 10)
+        trending.record(2, "like")
+        before = dict(trending.top(10))
+        trending.load([(2, "like", 1, now)])
+        after = dict(trending.top(10))
+        assert abs(after[1] - before[1]) < 0.01
+        trending.remove([1])
+        trending.load([(2, "like", 1, now)])
+        assert [review_id for review_id, _ in trending.top(10)] == [2]
+
+    def test_events_during_reload_are_replayed(self):
+        trending = TrendingScores()
+        now = datetime.now()
+        trending.begin_reload()
+        # DB 를 읽은 뒤 load 전에 들어온 좋아요/삭제
+        trending.record(2, "like", 2)
+        trending.remove([1])
+        trending.load([(1, "like", 1, now), (2, "like", 1, now)])
+        assert [review_id for review_id, _ in trending.top(10)] == [2]
+        assert abs(trending.top(1)[0][1] - 9.0) < 0.01
+
+        # 재계산이 끝난 뒤의 이벤트는 다음 load 에 다시 반영되지 않는다.
+        trending.record(3, "like")
+        trending.load([(2, "like", 1, now)])
+        assert [review_id for review_id, _ in trending.top(10)] == [2]
+
+    def test_cancel_reload_drops_buffer(self):
+        trending = TrendingScores()
+        trending.begin_reload()
+        trending.record(1, "like")
+        trending.cancel_reload()
+        trending.load([])
+        assert trending.top(10) == []
+
+    def test_unlike_removes_original_weight(self):
+        trending = TrendingScores()
+        liked_at = time.time() - TRENDING_HALF_LIFE_SECONDS
+        trending.record(1, "like", at=liked_at)
+        trending.record(2, "like", at=liked_at)
+        trending.record(1, "like", -1, at=liked_at)
+        assert [review_id for review_id, _ in trending.top(10)] == [2]
@@ -0,0 +1,56 @@
+import os, sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.utils.view_counter import ViewCounter
+
+
+class TestViewCounter:
+    def test_record_deduplicates_viewer(self):
+        counter = ViewCounter()
+        assert counter.record(1, "user:1") is True
+        assert counter.record(1, "user:1") is False
+        assert counter.record(1, "ip:127.0.0.1") is True
+        assert counter.record(2, "user:1") is True
+        stats = counter.stats()
+        assert stats["pending_reviews"] == 2
+        assert stats["pending_increments"] == 3
+        assert stats["deduplicated"] == 1
+
+    def test_flush_aggregates_pending_counts(self):
+        counter = ViewCounter()
+        counter.record(1, "a")
+        counter.record(1, "b")
+        counter.record(2, "a")
+        written = []
+        assert counter.flush(written.append) == 3
+        assert written == [{1: 2, 2: 1}]
+        assert counter.flush(written.append) == 0
+        assert counter.stats()["flushed_increments"] == 3
+        assert counter.stats()["flush_lag_seconds"] == 0
+
+    def test_flush_requeues_on_writer_error(self):
+        counter = ViewCounter()
+        counter.record(1, "a")
+
+        def failing_writer(counts):
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            counter.flush(failing_writer)
+        counter.record(1, "b")
+        assert counter.stats()["last_flush_error"] == "db down"
+
+        written = []
+        counter.flush(written.append)
+        assert written == [{1: 2}]
+        assert counter.stats()["last_flush_error"] is None
+
+    def test_max_pending_counts_lost_increments(self):
+        counter = ViewCounter(max_pending=1)
+        counter.record(1, "a")
+        assert counter.record(2, "a") is False
+        assert counter.discard_pending() == 1
+        assert counter.stats()["lost_increments"] == 2
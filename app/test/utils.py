@@ -7,6 +7,8 @@ from sqlalchemy.orm import sessionmaker, Session
 from app import crud, models, schemas
 from app.core.config import settings
 from app.controllers.deps import get_current_user
+from app.crud.review import review_detail_cache
+from app.crud.review_feed import review_count_cache, review_page_cache
 
 database_uri = f"mysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}@{settings.MYSQL_SERVER}:3306/{settings.MYSQL_DB}?charset=utf8mb4"
 
@@ -77,10 +79,15 @@ def delete_sample_review(db: Session, review_id: int):
     sample_review = crud.review.get_review(db, id=review_id)
     db.query(models.ReviewKeyword).filter(models.ReviewKeyword.review_id == review_id).delete()
     db.query(models.Comment).filter(models.Comment.review_id == review_id).delete()
+    db.query(models.ReviewFeed).filter(models.ReviewFeed.review_id == review_id).delete()
     db.delete(sample_review)
     db.delete(sample_review.survey)
     db.commit()
     db.close()
+    # 테스트 데이터를 직접 지웠으므로 목록 캐시도 비운다.
+    review_count_cache.clear()
+    review_page_cache.clear()
+    review_detail_cache.delete(review_id)
 
 
 def post_sameple_comment(client: TestClient, host: str, review_id: int, get_test_user_token: Dict[str, str]) -> int:
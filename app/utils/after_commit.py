@@ -0,0 +1,44 @@
+import logging
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger('ddakkm_logger')
+
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+def on_commit(db: Session, callback: Callable[..., Any], *args: Any) -> None:
+    """
+    세션의 트랜잭션이 커밋된 뒤에 반영할 메모리 상태 변경(캐시, 필터 인덱스, 인기 리뷰 점수, ETag 버전)을 등록한다. </br>
+    등록 순서대로 실행되고, 커밋 없이 트랜잭션이 끝나면(롤백, 세션 종료) 버려지므로 DB 에 반영되지 않은 쓰기가 메모리 상태에만 남지 않는다.
+    """
+    callbacks = db.info.get(_CALLBACKS_KEY)
+    if callbacks is None:
+        callbacks = db.info[_CALLBACKS_KEY] = []
+        event.listen(db, "after_commit", _run_callbacks)
+        event.listen(db, "after_transaction_end", _discard_callbacks)
+    callbacks.append((callback, args))
+
+
+def _pop_callbacks(session: Session) -> List[Tuple[Callable[..., Any], tuple]]:
+    callbacks = session.info.get(_CALLBACKS_KEY, [])
+    popped = list(callbacks)
+    callbacks.clear()
+    return popped
+
+
+def _run_callbacks(session: Session) -> None:
+    # 커밋은 이미 끝났으므로 하나가 실패해도 나머지는 반영한다.
+    for callback, args in _pop_callbacks(session):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.warning(f"커밋 후 작업 실패 {getattr(callback, '__qualname__', callback)} : {e}")
+
+
+def _discard_callbacks(session: Session, transaction: Any) -> None:
+    # 커밋된 경우에는 after_commit 에서 이미 실행하고 비웠다.
+    if transaction.parent is None:
+        _pop_callbacks(session)
@@ -1,50 +1,73 @@
 import datetime
-from typing import List
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional
 
-from sqlalchemy.orm import Session
-
-from app import crud
 from app.models.comments import Comment as CommentModel
-from app.db.session import SessionLocal
+from app.models.users import User as UserModel
 from app.schemas import Comment as CommentDto
 from app.schemas import NestedComment
+from app.utils.loader import EntityLoader
+
+# 서버에서 시간 변환을 수행한다. (최상위 댓글만, 대댓글은 기존 응답 그대로)
+CREATED_AT_OFFSET = datetime.timedelta(hours=9)
+
+
+def get_comment_content(comment: CommentModel, author: Optional[UserModel]) -> str:
+    # 삭제/탈퇴 문구는 ORM 객체를 고치지 않고 응답에만 넣는다. (세션이 커밋되어도 DB 에 써지지 않도록)
+    if author is None or author.is_active is False:
+        return "탈퇴한 작성자의 댓글입니다."
+    if comment.is_delete is True:
+        return "삭제된 댓글입니다."
+    return comment.content
 
 
-def comment_model_to_dto(
-        comment_models: List[CommentModel], comment_ids_like_by_user: List[int], current_user_id: int
+def build_comment_tree(
+        comment_models: List[CommentModel], comment_ids_like_by_user: Collection[int], current_user_id: int,
+        reply_limit: Optional[int] = None, loader: Optional[EntityLoader] = None
 ) -> List[CommentDto]:
+    """
+    댓글 목록을 parent_id 로 한번에 묶어 최상위 댓글 + 대댓글 트리로 만든다. (입력 순서 유지) </br>
+    reply_limit 이 있으면 댓글마다 앞에서부터 그 수만큼의 대댓글만 넣는다. 대댓글 수는 comment.reply_count 로 내려준다. </br>
+    loader 를 넘기면 작성자를 댓글마다 join 하지 않고 작성자 id 별로 한번씩, IN 쿼리 한번으로 불러온다. (없으면 comment.user 사용)
+    """
+    if not isinstance(comment_ids_like_by_user, (set, frozenset)):
+        comment_ids_like_by_user = set(comment_ids_like_by_user)
+    if loader is not None:
+        authors = {user.id: user for user in
+                   loader.load_many(UserModel, [comment.user_id for comment in comment_models])}
+    else:
+        authors = {comment.user_id: comment.user for comment in comment_models}
+    replies_by_parent_id: Dict[int, List[CommentModel]] = defaultdict(list)
+    for comment in comment_models:
+        if comment.parent_id is not None:
+            replies_by_parent_id[comment.parent_id].append(comment)
 
+    comment_dto = []
     for comment in comment_models:
-        if comment.is_delete is True:
-            comment.content = "삭제된 댓글입니다."
-        if comment.user.is_active is False:
-            comment.nickname = "탈퇴한 회원"
-            comment.content = "탈퇴한 작성자의 댓글입니다."
-    # 서버에서 시간 변환을 수행한다.
-    hours = 9
-    hours_added = datetime.timedelta(hours=hours)
-    comment_dto = [
-        CommentDto(
+        if comment.parent_id is not None:
+            continue
+        replies = replies_by_parent_id.get(comment.id, [])
+        author = authors.get(comment.user_id)
+        comment_dto.append(CommentDto(
             id=comment.id,
             user_id=comment.user_id,
-            nickname=comment.user.nickname,
-            content=comment.content,
-            created_at=comment.created_at + hours_added,
+            nickname=author.nickname if author else "",
+            content=get_comment_content(comment, author),
+            created_at=comment.created_at + CREATED_AT_OFFSET,
             like_count=comment.like_count,
             user_is_like=comment.id in comment_ids_like_by_user,
-            user_is_writer=comment.user.id == current_user_id,
+            user_is_writer=comment.user_id == current_user_id,
+            nested_comment_count=comment.reply_count or 0,
             nested_comment=[NestedComment(
                 id=nested_comment.id,
                 user_id=nested_comment.user_id,
-                nickname=nested_comment.user.nickname,
-                content=nested_comment.content,
+                nickname=authors[nested_comment.user_id].nickname if nested_comment.user_id in authors else "",
+                content=get_comment_content(nested_comment, authors.get(nested_comment.user_id)),
                 created_at=nested_comment.created_at,
                 like_count=nested_comment.like_count,
                 user_is_like=nested_comment.id in comment_ids_like_by_user,
-                user_is_writer=nested_comment.user.id == current_user_id,
-            )
-                for nested_comment in comment_models if nested_comment.parent_id == comment.id])
-        for comment in comment_models if comment.parent_id is None
-    ]
-
+                user_is_writer=nested_comment.user_id == current_user_id,
+            ) for nested_comment in (replies if reply_limit is None else replies[:reply_limit])]
+        ))
     return comment_dto
+
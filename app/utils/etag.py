@@ -0,0 +1,70 @@
+import hashlib
+import itertools
+import threading
+import time
+from typing import Any, Dict, Hashable
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class VersionStamps:
+    """
+    엔티티 id 별 버전 번호 -> 응답에 영향을 주는 쓰기 경로에서 bump 하면 그 엔티티 응답의 ETag 가 바뀝니다. </br>
+    버전은 프로세스 메모리에만 있으므로 세대(서버 시작/bump_all 마다 새로 발급)를 함께 붙여 재시작 전의 ETag 와 겹치지 않게 합니다.
+    """
+    _generations = itertools.count()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[Hashable, int] = {}
+        self._generation = self._new_generation()
+
+    @classmethod
+    def _new_generation(cls) -> str:
+        return f"{time.time_ns():x}.{next(cls._generations)}"
+
+    def get(self, key: Hashable) -> str:
+        with self._lock:
+            return f"{self._generation}.{self._versions.get(key, 0)}"
+
+    def bump(self, key: Hashable) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def bump_all(self) -> None:
+        # 어떤 엔티티가 바뀌었는지 특정하기 어려울 때 (회원 탈퇴 등) 전체 ETag 를 바꾼다.
+        with self._lock:
+            self._versions = {}
+            self._generation = self._new_generation()
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:24] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match 는 약한 비교를 하므로 W/ 접두어는 무시한다.
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+# 리뷰 상세 (review_id) / 리뷰의 댓글 목록 (review_id) / 회원 프로필 (user_id)
+review_versions = VersionStamps()
+comment_list_versions = VersionStamps()
+user_profile_versions = VersionStamps()
+
+
+def bump_all_versions() -> None:
+    # 회원 탈퇴처럼 여러 리뷰/댓글/프로필에 영향을 주는 변경
+    for versions in (review_versions, comment_list_versions, user_profile_versions):
+        versions.bump_all()
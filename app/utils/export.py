@@ -0,0 +1,61 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# 데이터 추출 파일의 컬럼 순서 (crud.review.iter_export_rows 의 label 과 같음)
+EXPORT_COLUMNS = (
+    "review_id", "created_at", "updated_at", "content", "like_count", "comment_count", "view_count",
+    "user_id", "gender", "birth_year",
+    "vaccine_type", "vaccine_round", "is_crossed", "is_pregnant", "is_underlying_disease", "date_from",
+    "survey_data",
+)
+
+# 응답으로 한번에 흘려보내는 row 수 (row 마다 write 하면 청크가 너무 잘게 쪼개짐)
+EXPORT_CHUNK_ROWS = 200
+
+
+def export_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows: Iterable[Any]) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: export_value(getattr(row, column)) for column in EXPORT_COLUMNS},
+                                ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(rows: Iterable[Any]) -> Iterator[str]:
+    # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙이고, 설문 응답(json)은 문자열 그대로 한 칸에 넣는다.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        values = [export_value(getattr(row, column)) for column in EXPORT_COLUMNS]
+        values[-1] = json.dumps(values[-1], ensure_ascii=False) if values[-1] is not None else ""
+        writer.writerow(values)
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm.util import identity_key
+
+_LOADER_KEY = "entity_loader"
+
+
+class EntityLoader:
+    """
+    요청 하나(세션 하나) 동안 (모델, id) 로 엔티티를 불러오는 로더 </br>
+    같은 요청에서 이미 불러온 엔티티와 없는 id 는 다시 조회하지 않고, 여러 id 는 IN 쿼리 한번으로 가져옵니다. </br>
+    관계(lazy="joined" 설문 등)는 함께 join 하지 않습니다. 필요하면 접근할 때 불러오고, 다대일 관계는 세션에 올라온 엔티티를 그대로 씁니다.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        # identity map 은 약한 참조라서 요청이 끝날 때까지 불러온 엔티티를 따로 들고 있는다.
+        self._loaded: Dict[Tuple[type, Any], Any] = {}
+        self._missing: Set[Tuple[type, Any]] = set()
+        self.query_count = 0
+
+    def clear(self) -> None:
+        # 커밋/롤백 이후에는 다른 세션의 쓰기가 보일 수 있으므로 기억해둔 결과를 버린다.
+        self._loaded.clear()
+        self._missing.clear()
+
+    def _cached(self, model: type, id: Any) -> Optional[Any]:
+        obj = self._loaded.get((model, id))
+        if obj is None:
+            obj = self.db.identity_map.get(identity_key(model, id))
+        if obj is None:
+            return None
+        # 만료된 엔티티는 그 사이 바뀌었을 수 있으므로 다시 조회하고, 세션에서 지워진 엔티티는 돌려주지 않는다.
+        state = inspect(obj)
+        if state.expired or state.deleted or state.detached:
+            self._loaded.pop((model, id), None)
+            return None
+        self._loaded[(model, id)] = obj
+        return obj
+
+    def load(self, model: Type, id: Any) -> Optional[Any]:
+        if id is None:
+            return None
+        loaded = self.load_many(model, [id])
+        return loaded[0] if loaded else None
+
+    def load_many(self, model: Type, ids: Iterable[Any]) -> List[Any]:
+        # ids 순서대로 (중복 제거) 반환하고, 없는 id 는 결과에서 빠진다.
+        ids = [id for id in dict.fromkeys(ids) if id is not None]
+        wanted = [id for id in ids if (model, id) not in self._missing and self._cached(model, id) is None]
+        if wanted:
+            column = inspect(model).primary_key[0]
+            for obj in self.db.query(model).options(lazyload("*")).filter(column.in_(wanted)).all():
+                self._loaded[(model, getattr(obj, column.key))] = obj
+            self.query_count += 1
+            self._missing.update((model, id) for id in wanted if (model, id) not in self._loaded)
+        return [obj for obj in (self._cached(model, id) for id in ids) if obj is not None]
+
+
+def get_loader(db: Session) -> EntityLoader:
+    # 세션이 요청마다 새로 만들어지므로(deps.get_db) 로더를 세션에 붙여두면 핸들러와 crud 가 요청 단위로 같은 로더를 쓴다.
+    loader = db.info.get(_LOADER_KEY)
+    if loader is None:
+        loader = db.info[_LOADER_KEY] = EntityLoader(db)
+        event.listen(db, "after_commit", lambda session: loader.clear())
+        event.listen(db, "after_soft_rollback", lambda session, previous_transaction: loader.clear())
+    return loader
@@ -1,36 +1,67 @@
 import random
+import time
+from typing import Any, List, Optional
 
 from fastapi import HTTPException
 
 from app import schemas
-from app.schemas.survey import SurveyAData
 from app.models.reviews import Review
+from app.utils.user import calculate_birth_year_from_age, get_age_group
 
 
-# def symtom_randomizer(symptom: dict) -> dict:
-#     candidate_list = ["q1", "q2", "q3", "q4", "q5"]
-#     random.shuffle(candidate_list)
-#     return {candidate_list[0]: symptom.get(candidate_list[0]), candidate_list[1]: symptom.get(candidate_list[1])}
+# 목록 증상 미리보기는 하루 단위로 바뀐다.
+SYMPTOM_ROTATION_SECONDS = 60 * 60 * 24
 
-def symtom_randomizer(symtom: dict) -> dict:
-    candidates = dict(SurveyAData(q1=symtom.get("q1"),
-                                  q2=symtom.get("q2"),
-                                  q2_1=symtom.get("q2_1"),
-                                  q3=symtom.get("q3"),
-                                  q4=symtom.get("q4"),
-                                  q5=symtom.get("q5")))
-    # q2_1 은 랜덤 증상에 포함되지 않는다.
-    del(candidates["q2_1"])
+# 증상 미리보기에 쓰는 설문 항목 (q2_1 은 발열 지속기간이라 포함하지 않음)
+SYMPTOM_QUESTIONS = ("q1", "q2", "q3", "q4", "q5")
 
-    # 복수 선택 가능한 항목 중 문자열 답변만 있는 경우 랜덤 증상에 포함되지 않는다.
-    for candidate in list(candidates.items()):
-        if isinstance(candidate[1], list) and len(candidate[1]) == 1 and isinstance(candidate[1][0], str):
-            del(candidates[candidate[0]])
 
-    # 랜덤 선택을 위해 리스트로 만들고 셔플링
-    candidates_list = list(candidates.items())
-    random.shuffle(candidates_list)
-    return dict((tuple(candidates_list[0]), tuple(candidates_list[1])))
+def get_symptom_candidates(symptom: dict) -> List[list]:
+    """
+    증상 미리보기 후보를 [[질문, 답변], ...] 형태로 만든다. 리뷰(설문)가 저장될 때 한번 계산해서 review_feed 에 보관한다. </br>
+    설문 내용은 저장할 때 SurveyAData 로 검증되었으므로 다시 검증하지 않는다.
+    """
+    candidates = []
+    for question in SYMPTOM_QUESTIONS:
+        answer = (symptom or {}).get(question)
+        if answer is None:
+            continue
+        # 복수 선택 가능한 항목 중 문자열 답변만 있는 경우 랜덤 증상에 포함되지 않는다.
+        if isinstance(answer, list) and len(answer) == 1 and isinstance(answer[0], str):
+            continue
+        candidates.append([question, answer])
+    return candidates
+
+
+def symptom_sampler(candidates: List[list], review_id: int, epoch: Optional[int] = None, k: int = 2) -> dict:
+    """
+    증상 미리보기 후보 중 k 개를 고른다. </br>
+    (review id, 회전 주기) 로 시드를 고정하기 때문에 같은 주기 안에서는 항상 같은 결과가 나온다. -> 목록 응답 캐싱 가능
+    """
+    if epoch is None:
+        epoch = int(time.time() // SYMPTOM_ROTATION_SECONDS)
+    candidates = candidates or []
+    sampler = random.Random(f"{review_id}:{epoch}")
+    return dict((question, answer) for question, answer in sampler.sample(candidates, min(k, len(candidates))))
+
+
+def review_model_to_dto(review: Review, current_user_id: int, user_is_like: bool) -> schemas.Review:
+    # review.user / review.survey / review.keywords 가 미리 로딩되어 있어야 한다. 댓글 수는 review.comment_count 사용
+    return schemas.Review(
+        id=review.id,
+        content=review.content,
+        images=review.images,
+        user_id=review.user_id,
+        user_gender=review.user.gender,
+        user_age_group=get_age_group(calculate_birth_year_from_age(review.user.age)),
+        survey=review.survey,
+        is_writer=review.user_id == current_user_id,
+        nickname=review.user.nickname,
+        keywords=[review_keyword.keyword for review_keyword in review.keywords],
+        like_count=review.like_count,
+        comment_count=review.comment_count,
+        user_is_like=user_is_like,
+    )
 
 
 def check_is_deleted(review: Review):
@@ -38,12 +69,29 @@ def check_is_deleted(review: Review):
         raise HTTPException(400, "이미 삭제된 리뷰입니다.")
 
 
+def profile_post_to_dto(row: Any) -> schemas.UserProfilePostResponse:
+    # crud.review.profile_posts_query 의 row -> 프로필 글 목록 항목 (가입 설문이 아니므로 join_survey_code 는 항상 null)
+    return schemas.UserProfilePostResponse(
+        id=row.id,
+        nickname=row.nickname,
+        like_count=row.like_count,
+        comment_count=row.comment_count,
+        created_at=row.created_at,
+        vaccine_status=schemas.VaccineStatus(join_survey_code=None,
+                                             details={"vaccine_round": row.vaccine_round,
+                                                      "vaccine_type": row.vaccine_type,
+                                                      "is_crossed": row.is_crossed}),
+    )
+
+
 if __name__ == "__main__":
     symptom = {
-        "q1": "asd",
-        "q2": "asdassadfasfd",
-        "q3": "asdadgfasd",
-        "q4": "asdsgd",
-        "q5": "asdasd"
+        "q1": [1, 2],
+        "q2": [3],
+        "q2_1": [1],
+        "q3": ["머리가 아파요"],
+        "q4": [2],
+        "q5": [1]
     }
-    print(symtom_randomizer(symptom))
+    print(symptom_sampler(get_symptom_candidates(symptom), review_id=1))
+
@@ -0,0 +1,134 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.schemas.review import ReviewParams
+from app.utils.user import calculate_birth_year_from_age, get_age_group
+
+# 인덱스에 올리는 review_feed 컬럼 (모두 값의 종류가 적은 컬럼)
+FILTER_FIELDS = ("gender", "birth_year", "vaccine_type", "vaccine_round",
+                 "is_crossed", "is_pregnant", "is_underlying_disease")
+
+# 필터 파라미터(ReviewParams) 이름 -> review_feed 컬럼 (나이는 min_age/max_age 범위라 따로 처리)
+FACET_FIELDS = {
+    "gender": "gender",
+    "vaccine_type": "vaccine_type",
+    "round": "vaccine_round",
+    "is_crossed": "is_crossed",
+    "is_pregnant": "is_pregnant",
+    "is_underlying_disease": "is_underlying_disease",
+}
+
+
+def count_bits(bits: int) -> int:
+    # python 3.8 에는 int.bit_count 가 없음
+    return bin(bits).count("1")
+
+
+def iter_ids_desc(bits: int, before: Optional[int] = None, offset: int = 0, limit: Optional[int] = None) -> List[int]:
+    """
+    비트셋에서 id 를 큰 값부터 꺼낸다. </br>
+    before 가 있으면 그보다 작은 id 부터, offset 만큼 건너뛰고 limit 개까지 반환한다.
+    """
+    if before is not None:
+        # before 는 클라이언트 커서에서 오므로 비트셋 길이로 잘라서 큰 값이 와도 메모리를 쓰지 않게 한다.
+        bits &= (1 << min(max(before, 0), bits.bit_length())) - 1
+    ids = []
+    while bits and (limit is None or len(ids) < limit):
+        top = bits.bit_length() - 1
+        bits ^= 1 << top
+        if offset > 0:
+            offset -= 1
+            continue
+        ids.append(top)
+    return ids
+
+
+class ReviewFilterIndex:
+    """
+    목록에 노출되는 리뷰(review_feed)의 필터 컬럼 값별로 review id 비트셋(int)을 메모리에 들고 있는 인덱스 </br>
+    ReviewParams 의 필터 조합은 비트셋 AND/OR 로 계산하고, DB 에서는 최종 페이지의 row 만 가져온다.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bitmaps: Dict[str, Dict[Any, int]] = {field: {} for field in FILTER_FIELDS}
+        self._values: Dict[int, tuple] = {}
+        self._all = 0
+        self.loaded = False
+
+    def load(self, rows: Iterable[Any]) -> None:
+        with self._lock:
+            self._bitmaps = {field: {} for field in FILTER_FIELDS}
+            self._values = {}
+            self._all = 0
+            for row in rows:
+                self._add(row)
+            self.loaded = True
+
+    def upsert(self, row: Any) -> None:
+        with self._lock:
+            self._remove(row.review_id)
+            self._add(row)
+
+    def remove(self, review_id: int) -> None:
+        with self._lock:
+            self._remove(review_id)
+
+    def _add(self, row: Any) -> None:
+        bit = 1 << row.review_id
+        values = tuple(getattr(row, field) for field in FILTER_FIELDS)
+        for field, value in zip(FILTER_FIELDS, values):
+            bitmap = self._bitmaps[field]
+            bitmap[value] = bitmap.get(value, 0) | bit
+        self._values[row.review_id] = values
+        self._all |= bit
+
+    def _remove(self, review_id: int) -> None:
+        values = self._values.pop(review_id, None)
+        if values is None:
+            return
+        mask = ~(1 << review_id)
+        for field, value in zip(FILTER_FIELDS, values):
+            self._bitmaps[field][value] &= mask
+        self._all &= mask
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def resolve(self, filters: ReviewParams, exclude: Tuple[str, ...] = ()) -> int:
+        # 검색어(q)는 FULLTEXT 인덱스를 써야 하므로 여기서는 다루지 않는다.
+        # exclude 에 있는 필터 파라미터는 적용하지 않는다. (facet 별 수를 셀 때 사용, 나이는 "age")
+        with self._lock:
+            bits = self._all
+            if filters.min_age and filters.max_age and "age" not in exclude:
+                min_birth_year = calculate_birth_year_from_age(filters.min_age)
+                max_birth_year = calculate_birth_year_from_age(filters.max_age)
+                age_bits = 0
+                for birth_year, bitmap in self._bitmaps["birth_year"].items():
+                    if birth_year is not None and max_birth_year <= birth_year <= min_birth_year:
+                        age_bits |= bitmap
+                bits &= age_bits
+            for param, field in FACET_FIELDS.items():
+                value = getattr(filters, param)
+                if value is not None and param not in exclude:
+                    bits &= self._bitmaps[field].get(value, 0)
+            return bits
+
+    def facet_counts(self, filters: ReviewParams) -> Dict[str, Any]:
+        counts = {"total": count_bits(self.resolve(filters))}
+        for param, field in FACET_FIELDS.items():
+            bits = self.resolve(filters, exclude=(param,))
+            with self._lock:
+                counts[param] = {value: count_bits(bits & bitmap) for value, bitmap in self._bitmaps[field].items()}
+
+        bits = self.resolve(filters, exclude=("age",))
+        age_counts = defaultdict(int)
+        with self._lock:
+            for birth_year, bitmap in self._bitmaps["birth_year"].items():
+                if birth_year is not None:
+                    age_counts[get_age_group(calculate_birth_year_from_age(birth_year))] += count_bits(bits & bitmap)
+        counts["age_group"] = dict(age_counts)
+        return counts
+
+
+review_filter_index = ReviewFilterIndex()
@@ -0,0 +1,132 @@
+import bisect
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 점수가 반으로 줄어드는 시간 (초) -> 하루 전의 좋아요는 지금 좋아요의 절반만큼 반영
+TRENDING_HALF_LIFE_SECONDS = 60 * 60 * 24
+
+# 재계산(reconcile)할 때 점수에 넣는 이벤트 기간 (일) -> 반감기 7번이 지나면 1% 미만이라 버린다.
+TRENDING_WINDOW_DAYS = 7
+
+# 이 값(현재 시각 기준 점수)보다 작아진 조회 점수는 재계산할 때 버린다.
+MIN_VIEW_SCORE = 1e-3
+
+# 이벤트 종류별 가중치
+TRENDING_WEIGHTS = {
+    "like": 3.0,
+    "comment": 2.0,
+    "view": 0.1,
+}
+
+
+class TrendingScores:
+    """
+    리뷰별 시간 감쇠 점수(좋아요/댓글/조회)를 메모리에 정렬된 상태로 들고 있는 랭킹 </br>
+    이벤트 점수를 시간이 지날수록 줄이는 대신 epoch 기준으로 나중 이벤트에 2^(경과시간/반감기) 만큼 큰 가중치를 주어,
+    이벤트가 없는 리뷰의 점수를 매번 다시 계산하지 않아도 순서가 유지됩니다. </br>
+    가중치가 계속 커지므로 reconcile(load) 때마다 epoch 를 현재 시각으로 옮깁니다. </br>
+    조회는 DB 에 시각별 기록이 없으므로 record 로 더해온 조회 점수를 따로 들고 있다가 load 때 그대로 이어서 더합니다. </br>
+    begin_reload 로 DB 를 읽기 시작한 뒤 load 전까지 들어온 좋아요/댓글/삭제는 따로 모아뒀다가 load 한 점수 위에 다시 반영합니다.
+    """
+    def __init__(self, half_life: float = TRENDING_HALF_LIFE_SECONDS):
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._epoch = time.time()
+        self._scores: Dict[int, float] = {}
+        self._view_scores: Dict[int, float] = {}
+        # (-점수, -review_id) 오름차순 = 점수 높은 순, 같으면 최신 리뷰 먼저
+        self._ranking: List[Tuple[float, int]] = []
+        # 재계산 중(begin_reload ~ load)에 들어온 (review_id, 이벤트 종류, 양, 발생 시각), 삭제는 이벤트 종류가 None
+        self._pending: Optional[List[Tuple[int, Optional[str], float, float]]] = None
+        self.loaded_at: Optional[datetime] = None
+
+    def _weight(self, at: float) -> float:
+        return 2 ** ((at - self._epoch) / self.half_life)
+
+    def record(self, review_id: int, event: str, amount: float = 1, at: Optional[float] = None) -> None:
+        # 좋아요 취소/댓글 삭제는 amount 를 음수로, at 을 원래 좋아요/댓글 시각으로 넘긴다. (더했던 가중치 그대로 빠지도록)
+        with self._lock:
+            if at is None:
+                at = time.time()
+            # 조회 점수는 load 때 현재 값을 그대로 이어가므로 따로 모아둘 필요가 없다.
+            if self._pending is not None and event != "view":
+                self._pending.append((review_id, event, amount, at))
+            delta = TRENDING_WEIGHTS[event] * amount * self._weight(at)
+            if event == "view":
+                self._view_scores[review_id] = self._view_scores.get(review_id, 0.0) + delta
+            self._set(review_id, self._scores.get(review_id, 0.0) + delta)
+
+    def remove(self, review_ids: Iterable[int]) -> None:
+        with self._lock:
+            for review_id in review_ids:
+                if self._pending is not None:
+                    self._pending.append((review_id, None, 0, 0))
+                self._view_scores.pop(review_id, None)
+                self._set(review_id, None)
+
+    def begin_reload(self) -> None:
+        # load 할 이벤트를 DB 에서 읽기 직전에 부른다. 이후 들어오는 이벤트는 읽은 결과에 없을 수 있으므로 모아둔다.
+        with self._lock:
+            self._pending = []
+
+    def cancel_reload(self) -> None:
+        # DB 를 읽다가 실패해서 load 하지 않는 경우 모아두던 이벤트를 버린다. (점수에는 이미 반영되어 있음)
+        with self._lock:
+            self._pending = None
+
+    def load(self, events: Iterable[Tuple[int, str, float, datetime]]) -> None:
+        """
+        (review_id, 이벤트 종류, 양, 발생 시각) 목록으로 점수를 처음부터 다시 계산합니다. </br>
+        그동안 record 로 더해온 조회 점수는 새 epoch 기준으로 옮겨서 유지하고, 목록의 조회 이벤트는 그 위에 더합니다. </br>
+        begin_reload 이후 들어온 이벤트는 읽어온 목록에 빠져있을 수 있으므로 다시 반영합니다.
+        (DB 를 읽기 직전에 커밋된 이벤트는 양쪽에 들어가 조금 더 세어질 수 있지만 다음 재계산 때 맞춰짐)
+        """
+        epoch = time.time()
+        scores: Dict[int, float] = {}
+        view_scores: Dict[int, float] = {}
+        for review_id, event, amount, at in events:
+            weight = 2 ** ((at.timestamp() - epoch) / self.half_life)
+            target = view_scores if event == "view" else scores
+            target[review_id] = target.get(review_id, 0.0) + TRENDING_WEIGHTS[event] * amount * weight
+        with self._lock:
+            rebase = 2 ** ((self._epoch - epoch) / self.half_life)
+            for review_id, score in self._view_scores.items():
+                view_scores[review_id] = view_scores.get(review_id, 0.0) + score * rebase
+            self._view_scores = {review_id: score for review_id, score in view_scores.items() if score >= MIN_VIEW_SCORE}
+            for review_id, score in self._view_scores.items():
+                scores[review_id] = scores.get(review_id, 0.0) + score
+            for review_id, event, amount, at in self._pending or []:
+                if event is None:
+                    scores.pop(review_id, None)
+                    self._view_scores.pop(review_id, None)
+                else:
+                    scores[review_id] = scores.get(review_id, 0.0) + \
+                        TRENDING_WEIGHTS[event] * amount * 2 ** ((at - epoch) / self.half_life)
+            self._pending = None
+            self._epoch = epoch
+            self._scores = {review_id: score for review_id, score in scores.items() if score > 0}
+            self._ranking = sorted((-score, -review_id) for review_id, score in self._scores.items())
+            self.loaded_at = datetime.now()
+
+    def _set(self, review_id: int, score: Optional[float]) -> None:
+        old_score = self._scores.pop(review_id, None)
+        if old_score is not None:
+            del self._ranking[bisect.bisect_left(self._ranking, (-old_score, -review_id))]
+        if score is not None and score > 0:
+            self._scores[review_id] = score
+            bisect.insort(self._ranking, (-score, -review_id))
+
+    def top(self, limit: int, offset: int = 0) -> List[Tuple[int, float]]:
+        # 현재 시각 기준으로 환산한 (review_id, 점수) 를 점수 높은 순으로 반환
+        with self._lock:
+            now_weight = self._weight(time.time())
+            return [(-review_id, round(-score / now_weight, 4))
+                    for score, review_id in self._ranking[offset:offset + limit]]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+review_trending = TrendingScores()
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Optional
+
+from starlette.requests import Request
+
+from app.utils.cache import TTLCache
+
+
+class ViewCounter:
+    """
+    리뷰 조회수를 메모리에 모아두었다가 주기적으로 한번에 DB 에 반영하는 카운터 (write-behind) </br>
+    같은 조회자(회원 id 혹은 IP)의 같은 리뷰 조회는 dedup_window 초 동안 한번만 셉니다.
+    """
+    def __init__(self, dedup_window: float = 60 * 30, dedup_maxsize: int = 100000, max_pending: int = 10000):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._seen = TTLCache(ttl=dedup_window, maxsize=dedup_maxsize)
+        self._pending: Dict[int, int] = {}
+        self._oldest_pending_at: Optional[float] = None
+        self.deduplicated = 0
+        self.flushed_increments = 0
+        self.lost_increments = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_flush_error: Optional[str] = None
+
+    def record(self, review_id: int, viewer_key: Hashable) -> bool:
+        with self._lock:
+            if self._seen.get((review_id, viewer_key)):
+                self.deduplicated += 1
+                return False
+            self._seen.set((review_id, viewer_key), True)
+            # 반영 대기중인 리뷰가 너무 많으면 (DB 반영이 계속 실패하는 경우) 새 리뷰의 조회수는 버린다.
+            if review_id not in self._pending and len(self._pending) >= self.max_pending:
+                self.lost_increments += 1
+                return False
+            self._pending[review_id] = self._pending.get(review_id, 0) + 1
+            if self._oldest_pending_at is None:
+                self._oldest_pending_at = time.monotonic()
+            return True
+
+    def flush(self, writer: Callable[[Dict[int, int]], None]) -> int:
+        """
+        모아둔 {review_id: 증가량} 을 writer 로 넘겨 DB 에 반영하고, 반영한 조회수 합을 반환합니다. </br>
+        writer 에서 에러가 나면 다음 flush 때 다시 반영하도록 되돌려 놓고 에러를 그대로 올립니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            oldest_pending_at, self._oldest_pending_at = self._oldest_pending_at, None
+        if not pending:
+            return 0
+
+        try:
+            writer(pending)
+        except Exception as e:
+            with self._lock:
+                for review_id, count in pending.items():
+                    if review_id in self._pending or len(self._pending) < self.max_pending:
+                        self._pending[review_id] = self._pending.get(review_id, 0) + count
+                    else:
+                        self.lost_increments += count
+                if self._oldest_pending_at is None or oldest_pending_at < self._oldest_pending_at:
+                    self._oldest_pending_at = oldest_pending_at
+                self.last_flush_error = str(e)
+            raise
+
+        flushed = sum(pending.values())
+        with self._lock:
+            self.flushed_increments += flushed
+            self.last_flush_at = datetime.now()
+            self.last_flush_error = None
+        return flushed
+
+    def discard_pending(self) -> int:
+        # 서버 종료시 반영하지 못한 조회수를 유실로 기록한다.
+        with self._lock:
+            lost = sum(self._pending.values())
+            self.lost_increments += lost
+            self._pending = {}
+            self._oldest_pending_at = None
+            return lost
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_reviews": len(self._pending),
+                "pending_increments": sum(self._pending.values()),
+                # 가장 오래 기다린 조회수가 DB 에 반영되지 못하고 있는 시간 (초)
+                "flush_lag_seconds": 0 if self._oldest_pending_at is None
+                else round(time.monotonic() - self._oldest_pending_at, 3),
+                "flushed_increments": self.flushed_increments,
+                "deduplicated": self.deduplicated,
+                "lost_increments": self.lost_increments,
+                "last_flush_at": self.last_flush_at,
+                "last_flush_error": self.last_flush_error,
+            }
+
+
+def get_client_ip(request: Request) -> str:
+    # nginx 가 넘겨주는 실제 IP (main.log_real_ip 와 같은 헤더)
+    return request.headers.get("x-real-ip") or (request.client.host if request.client else "")
+
+
+review_view_counter = ViewCounter()
@@ -0,0 +1,26 @@
+"""add fulltext index to review content
+
+Revision ID: 3c1f9a7d2b64
+Revises: 95118021d944
+Create Date: 2026-10-18 10:12:41.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a7d2b64'
+down_revision = '95118021d944'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 한국어 검색을 위해 ngram parser 를 사용 (MySQL ngram_token_size 기본값 2)
+    op.create_index('ft_review_content', 'review', ['content'], unique=False,
+                    mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+
+
+def downgrade():
+    op.drop_index('ft_review_content', table_name='review')
@@ -0,0 +1,66 @@
+"""add review_feed table
+
+Revision ID: 5a7c3e9d1f42
+Revises: 8d2e4b6f1a90
+Create Date: 2026-10-18 13:21:45.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c3e9d1f42'
+down_revision = '8d2e4b6f1a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_feed',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('review_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('nickname', sa.String(length=30), nullable=False),
+    sa.Column('gender', sa.Enum('ETC', 'MALE', 'FEMALE', name='gender'), nullable=True),
+    sa.Column('birth_year', sa.Integer(), nullable=True),
+    sa.Column('vaccine_type', sa.Enum('PFIZER', 'MODERNA', 'AZ', 'JANSSEN', 'ETC', name='vaccinetype'), nullable=True),
+    sa.Column('vaccine_round', sa.Enum('FIRST', 'SECOND', 'THIRD', name='vaccineround'), nullable=True),
+    sa.Column('is_crossed', sa.Boolean(), nullable=True),
+    sa.Column('is_pregnant', sa.Boolean(), nullable=True),
+    sa.Column('is_underlying_disease', sa.Boolean(), nullable=True),
+    sa.Column('survey_data', mysql.JSON(), nullable=True),
+    sa.Column('content_preview', sa.String(length=300), nullable=True),
+    sa.Column('like_count', sa.Integer(), nullable=False),
+    sa.Column('comment_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('review_id')
+    )
+    op.create_index('ix_review_feed_vaccine_type_round', 'review_feed', ['vaccine_type', 'vaccine_round', 'review_id'])
+    op.create_index('ix_review_feed_vaccine_round', 'review_feed', ['vaccine_round', 'review_id'])
+    op.create_index('ix_review_feed_gender_birth_year', 'review_feed', ['gender', 'birth_year', 'review_id'])
+    op.create_index('ix_review_feed_birth_year', 'review_feed', ['birth_year', 'review_id'])
+    op.create_index('ix_review_feed_user_id', 'review_feed', ['user_id', 'review_id'])
+    # 목록에 노출되는 기존 리뷰 채우기
+    op.execute(
+        "INSERT INTO review_feed (review_id, user_id, nickname, gender, birth_year, vaccine_type, vaccine_round, "
+        "is_crossed, is_pregnant, is_underlying_disease, survey_data, content_preview, like_count, comment_count, "
+        "created_at, updated_at) "
+        "SELECT review.id, review.user_id, user.nickname, user.gender, user.age, survey_a.vaccine_type, "
+        "survey_a.vaccine_round, survey_a.is_crossed, survey_a.is_pregnant, survey_a.is_underlying_disease, "
+        "survey_a.data, LEFT(review.content, 300), review.like_count, review.comment_count, NOW(), NOW() "
+        "FROM review "
+        "LEFT JOIN survey_a ON survey_a.id = review.survey_id "
+        "JOIN user ON user.id = review.user_id "
+        "WHERE review.is_delete = false AND user.is_active = true"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_review_feed_user_id', table_name='review_feed')
+    op.drop_index('ix_review_feed_birth_year', table_name='review_feed')
+    op.drop_index('ix_review_feed_gender_birth_year', table_name='review_feed')
+    op.drop_index('ix_review_feed_vaccine_round', table_name='review_feed')
+    op.drop_index('ix_review_feed_vaccine_type_round', table_name='review_feed')
+    op.drop_table('review_feed')
@@ -0,0 +1,30 @@
+"""add comment_count to review
+
+Revision ID: 8d2e4b6f1a90
+Revises: 3c1f9a7d2b64
+Create Date: 2026-10-18 11:03:27.502914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b6f1a90'
+down_revision = '3c1f9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('review', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    # 기존 리뷰의 삭제되지 않은 댓글(대댓글 포함) 수 채우기
+    op.execute(
+        "UPDATE review SET comment_count = ("
+        "SELECT COUNT(*) FROM comment WHERE comment.review_id = review.id AND comment.is_delete = false"
+        ")"
+    )
+
+
+def downgrade():
+    op.drop_column('review', 'comment_count')
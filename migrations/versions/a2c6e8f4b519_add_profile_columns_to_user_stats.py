@@ -0,0 +1,64 @@
+"""add profile columns to user_stats
+
+Revision ID: a2c6e8f4b519
+Revises: f7b1d3e8a925
+Create Date: 2026-10-19 10:42:27.551093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c6e8f4b519'
+down_revision = 'f7b1d3e8a925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user_stats', sa.Column('nickname', sa.String(length=30), nullable=True))
+    op.add_column('user_stats', sa.Column('character_image', sa.String(length=100), nullable=True))
+    op.add_column('user_stats', sa.Column('join_survey_code', sa.Enum('NONE', 'A', 'B', 'C', name='joinsurveycode'), nullable=True))
+    op.add_column('user_stats', sa.Column('is_active', sa.Boolean(), nullable=True))
+    op.add_column('user_stats', sa.Column('vaccine_type', sa.Enum('PFIZER', 'MODERNA', 'AZ', 'JANSSEN', 'ETC', name='vaccinetype'), nullable=True))
+    op.add_column('user_stats', sa.Column('vaccine_round', sa.Enum('FIRST', 'SECOND', 'THIRD', name='vaccineround'), nullable=True))
+    op.add_column('user_stats', sa.Column('is_crossed', sa.Boolean(), nullable=True))
+    # 모든 회원의 프로필 정보 채우기 (crud.user_stats.reconcile 과 같은 집계, 그 사이 가입한 회원의 row 도 함께 만든다)
+    op.execute(
+        "INSERT INTO user_stats (user_id, post_count, comment_count, like_count, latest_review_id, nickname, "
+        "character_image, join_survey_code, is_active, vaccine_type, vaccine_round, is_crossed, created_at, updated_at) "
+        "SELECT user.id, COALESCE(post.post_count, 0), COALESCE(comment.comment_count, 0), "
+        "COALESCE(user_like.like_count, 0), latest_review.id, user.nickname, user.character_image, "
+        "user.join_survey_code, user.is_active, "
+        "IF(user.join_survey_code = 'A', join_survey.vaccine_type, latest_survey.vaccine_type), "
+        "IF(user.join_survey_code = 'A', join_survey.vaccine_round, latest_survey.vaccine_round), "
+        "IF(user.join_survey_code = 'A', join_survey.is_crossed, latest_survey.is_crossed), NOW(), NOW() "
+        "FROM user "
+        "LEFT JOIN review AS latest_review ON latest_review.id = "
+        "(SELECT MAX(id) FROM review WHERE review.user_id = user.id AND review.is_delete = false) "
+        "LEFT JOIN survey_a AS latest_survey ON latest_survey.id = latest_review.survey_id "
+        "LEFT JOIN survey_a AS join_survey ON join_survey.id = "
+        "(SELECT MAX(id) FROM survey_a WHERE survey_a.user_id = user.id AND survey_a.is_join_survey = true) "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS post_count FROM review "
+        "WHERE is_delete = false GROUP BY user_id) AS post ON post.user_id = user.id "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS comment_count FROM comment "
+        "WHERE is_delete = false GROUP BY user_id) AS comment ON comment.user_id = user.id "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS like_count FROM user_like GROUP BY user_id) AS user_like "
+        "ON user_like.user_id = user.id "
+        "ON DUPLICATE KEY UPDATE post_count = VALUES(post_count), comment_count = VALUES(comment_count), "
+        "like_count = VALUES(like_count), latest_review_id = VALUES(latest_review_id), nickname = VALUES(nickname), "
+        "character_image = VALUES(character_image), join_survey_code = VALUES(join_survey_code), "
+        "is_active = VALUES(is_active), vaccine_type = VALUES(vaccine_type), vaccine_round = VALUES(vaccine_round), "
+        "is_crossed = VALUES(is_crossed)"
+    )
+
+
+def downgrade():
+    op.drop_column('user_stats', 'is_crossed')
+    op.drop_column('user_stats', 'vaccine_round')
+    op.drop_column('user_stats', 'vaccine_type')
+    op.drop_column('user_stats', 'is_active')
+    op.drop_column('user_stats', 'join_survey_code')
+    op.drop_column('user_stats', 'character_image')
+    op.drop_column('user_stats', 'nickname')
@@ -0,0 +1,58 @@
+"""add symptom_candidates to review_feed
+
+Revision ID: b41e6d2c9a17
+Revises: 5a7c3e9d1f42
+Create Date: 2026-10-18 15:02:11.604417
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41e6d2c9a17'
+down_revision = '5a7c3e9d1f42'
+branch_labels = None
+depends_on = None
+
+
+def get_symptom_candidates(symptom: dict) -> list:
+    # 마이그레이션 시점의 app.utils.review.get_symptom_candidates 와 동일
+    candidates = []
+    for question in ("q1", "q2", "q3", "q4", "q5"):
+        answer = (symptom or {}).get(question)
+        if answer is None:
+            continue
+        if isinstance(answer, list) and len(answer) == 1 and isinstance(answer[0], str):
+            continue
+        candidates.append([question, answer])
+    return candidates
+
+
+def upgrade():
+    op.add_column('review_feed', sa.Column('symptom_candidates', mysql.JSON(), nullable=True))
+    # 기존 row 의 증상 미리보기 후보 채우기
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT review_id, survey_data FROM review_feed")).fetchall()
+    for review_id, survey_data in rows:
+        if isinstance(survey_data, str):
+            survey_data = json.loads(survey_data)
+        conn.execute(
+            sa.text("UPDATE review_feed SET symptom_candidates = :candidates WHERE review_id = :review_id"),
+            {"candidates": json.dumps(get_symptom_candidates(survey_data), ensure_ascii=False), "review_id": review_id}
+        )
+    op.drop_column('review_feed', 'survey_data')
+
+
+def downgrade():
+    op.add_column('review_feed', sa.Column('survey_data', mysql.JSON(), nullable=True))
+    op.execute(
+        "UPDATE review_feed "
+        "JOIN review ON review.id = review_feed.review_id "
+        "LEFT JOIN survey_a ON survey_a.id = review.survey_id "
+        "SET review_feed.survey_data = survey_a.data"
+    )
+    op.drop_column('review_feed', 'symptom_candidates')
@@ -0,0 +1,79 @@
+"""add symptom_stat tables
+
+Revision ID: c7e2a1f5d803
+Revises: b41e6d2c9a17
+Create Date: 2026-10-18 19:40:27.215630
+
+"""
+import json
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a1f5d803'
+down_revision = 'b41e6d2c9a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('symptom_stat',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('vaccine_type', sa.Enum('PFIZER', 'MODERNA', 'AZ', 'JANSSEN', 'ETC', name='vaccinetype'), nullable=False),
+    sa.Column('vaccine_round', sa.Enum('FIRST', 'SECOND', 'THIRD', name='vaccineround'), nullable=False),
+    sa.Column('gender', sa.Enum('ETC', 'MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('birth_year', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('question', sa.String(length=10), nullable=False),
+    sa.Column('answer', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('vaccine_type', 'vaccine_round', 'gender', 'birth_year', 'question', 'answer')
+    )
+    op.create_table('symptom_stat_total',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('vaccine_type', sa.Enum('PFIZER', 'MODERNA', 'AZ', 'JANSSEN', 'ETC', name='vaccinetype'), nullable=False),
+    sa.Column('vaccine_round', sa.Enum('FIRST', 'SECOND', 'THIRD', name='vaccineround'), nullable=False),
+    sa.Column('gender', sa.Enum('ETC', 'MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('birth_year', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('vaccine_type', 'vaccine_round', 'gender', 'birth_year')
+    )
+    # 기존 review_feed 로 집계 채우기 (마이그레이션 시점의 crud.symptom_stat.count_symptom_stats 와 동일)
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT vaccine_type, vaccine_round, gender, birth_year, symptom_candidates FROM review_feed "
+        "WHERE vaccine_type IS NOT NULL AND vaccine_round IS NOT NULL AND gender IS NOT NULL AND birth_year IS NOT NULL"
+    )).fetchall()
+    stats, totals = Counter(), Counter()
+    for vaccine_type, vaccine_round, gender, birth_year, candidates in rows:
+        if isinstance(candidates, str):
+            candidates = json.loads(candidates)
+        dimensions = (vaccine_type, vaccine_round, gender, birth_year)
+        totals[dimensions] += 1
+        for question, answers in candidates or []:
+            for answer in set(answers if isinstance(answers, list) else [answers]):
+                if isinstance(answer, int) and not isinstance(answer, bool):
+                    stats[dimensions + (question, answer)] += 1
+    if stats:
+        conn.execute(sa.text(
+            "INSERT INTO symptom_stat (vaccine_type, vaccine_round, gender, birth_year, question, answer, "
+            "review_count, created_at, updated_at) "
+            "VALUES (:vaccine_type, :vaccine_round, :gender, :birth_year, :question, :answer, :review_count, NOW(), NOW())"
+        ), [dict(zip(('vaccine_type', 'vaccine_round', 'gender', 'birth_year', 'question', 'answer'), key),
+                 review_count=count) for key, count in stats.items()])
+    if totals:
+        conn.execute(sa.text(
+            "INSERT INTO symptom_stat_total (vaccine_type, vaccine_round, gender, birth_year, review_count, "
+            "created_at, updated_at) "
+            "VALUES (:vaccine_type, :vaccine_round, :gender, :birth_year, :review_count, NOW(), NOW())"
+        ), [dict(zip(('vaccine_type', 'vaccine_round', 'gender', 'birth_year'), key),
+                 review_count=count) for key, count in totals.items()])
+
+
+def downgrade():
+    op.drop_table('symptom_stat_total')
+    op.drop_table('symptom_stat')
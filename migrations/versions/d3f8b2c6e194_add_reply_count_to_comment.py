@@ -0,0 +1,35 @@
+"""add reply_count to comment
+
+Revision ID: d3f8b2c6e194
+Revises: c7e2a1f5d803
+Create Date: 2026-10-18 20:31:05.417228
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f8b2c6e194'
+down_revision = 'c7e2a1f5d803'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('comment', sa.Column('reply_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('comment', sa.Column('last_reply_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_comment_review_id_parent_id_id', 'comment', ['review_id', 'parent_id', 'id'], unique=False)
+    # 기존 댓글의 대댓글 수/마지막 대댓글 시각 채우기
+    op.execute(
+        "UPDATE comment "
+        "JOIN (SELECT parent_id, SUM(is_delete = false) AS reply_count, MAX(created_at) AS last_reply_at "
+        "FROM comment WHERE parent_id IS NOT NULL GROUP BY parent_id) AS reply ON reply.parent_id = comment.id "
+        "SET comment.reply_count = reply.reply_count, comment.last_reply_at = reply.last_reply_at"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_comment_review_id_parent_id_id', table_name='comment')
+    op.drop_column('comment', 'last_reply_at')
+    op.drop_column('comment', 'reply_count')
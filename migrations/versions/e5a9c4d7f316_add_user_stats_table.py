@@ -0,0 +1,46 @@
+"""add user_stats table
+
+Revision ID: e5a9c4d7f316
+Revises: d3f8b2c6e194
+Create Date: 2026-10-18 21:12:48.903561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c4d7f316'
+down_revision = 'd3f8b2c6e194'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.Column('comment_count', sa.Integer(), nullable=False),
+    sa.Column('like_count', sa.Integer(), nullable=False),
+    sa.Column('latest_review_id', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # 기존 회원의 활동 수 채우기
+    op.execute(
+        "INSERT INTO user_stats (user_id, post_count, comment_count, like_count, latest_review_id, created_at, updated_at) "
+        "SELECT user.id, COALESCE(post.post_count, 0), COALESCE(comment.comment_count, 0), "
+        "COALESCE(user_like.like_count, 0), post.latest_review_id, NOW(), NOW() "
+        "FROM user "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS post_count, MAX(id) AS latest_review_id FROM review "
+        "WHERE is_delete = false GROUP BY user_id) AS post ON post.user_id = user.id "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS comment_count FROM comment "
+        "WHERE is_delete = false GROUP BY user_id) AS comment ON comment.user_id = user.id "
+        "LEFT JOIN (SELECT user_id, COUNT(*) AS like_count FROM user_like GROUP BY user_id) AS user_like "
+        "ON user_like.user_id = user.id"
+    )
+
+
+def downgrade():
+    op.drop_table('user_stats')
@@ -0,0 +1,57 @@
+"""add review_facet_count table
+
+Revision ID: f7b1d3e8a925
+Revises: e5a9c4d7f316
+Create Date: 2026-10-18 23:05:14.318402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b1d3e8a925'
+down_revision = 'e5a9c4d7f316'
+branch_labels = None
+depends_on = None
+
+FILTER_FIELDS = ('gender', 'birth_year', 'vaccine_type', 'vaccine_round',
+                 'is_crossed', 'is_pregnant', 'is_underlying_disease')
+
+
+def upgrade():
+    op.create_table('review_facet_count',
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('facet_key', sa.String(length=100), nullable=False),
+    sa.Column('gender', sa.Enum('ETC', 'MALE', 'FEMALE', name='gender'), nullable=True),
+    sa.Column('birth_year', sa.Integer(), nullable=True),
+    sa.Column('vaccine_type', sa.Enum('PFIZER', 'MODERNA', 'AZ', 'JANSSEN', 'ETC', name='vaccinetype'), nullable=True),
+    sa.Column('vaccine_round', sa.Enum('FIRST', 'SECOND', 'THIRD', name='vaccineround'), nullable=True),
+    sa.Column('is_crossed', sa.Boolean(), nullable=True),
+    sa.Column('is_pregnant', sa.Boolean(), nullable=True),
+    sa.Column('is_underlying_disease', sa.Boolean(), nullable=True),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet_key')
+    )
+    # 기존 review_feed 로 집계 채우기 (facet_key 는 마이그레이션 시점의 crud.review_facet_count.facet_key 와 동일)
+    conn = op.get_bind()
+    columns = ', '.join(FILTER_FIELDS)
+    rows = conn.execute(sa.text(
+        f"SELECT {columns}, COUNT(*) FROM review_feed GROUP BY {columns}"
+    )).fetchall()
+    values = []
+    for row in rows:
+        key = tuple(row[:-1])
+        values.append(dict(zip(FILTER_FIELDS, key), review_count=row[-1],
+                           facet_key='|'.join('' if value is None else str(int(value) if isinstance(value, bool) else value)
+                                              for value in key)))
+    if values:
+        conn.execute(sa.text(
+            f"INSERT INTO review_facet_count (facet_key, {columns}, review_count, created_at, updated_at) "
+            f"VALUES (:facet_key, {', '.join(':' + field for field in FILTER_FIELDS)}, :review_count, NOW(), NOW())"
+        ), values)
+
+
+def downgrade():
+    op.drop_table('review_facet_count')